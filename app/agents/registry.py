@@ -0,0 +1,187 @@
+import importlib
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class AgentRegistry:
+    """
+    Agents, their tools and the orchestrator Team, built on first use.
+
+    Components are registered as "module:factory" paths, so neither the agent module
+    nor what it sets up (SQL engines, Postgres storage and memory, model clients) is
+    loaded until the component is needed. Build times are kept per component, summed
+    over its instances; a component's time excludes the components it builds through
+    the registry.
+
+    A component registered with a `pool_size` holds per-run state: each run leases
+    one of up to `pool_size` instances, so concurrent runs never share one.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, str] = {}
+        self._pool_sizes: Dict[str, int] = {}
+        self._instances: Dict[str, Any] = {}
+        self._pools: Dict[str, "queue.LifoQueue[Any]"] = {}
+        self._reserved: Dict[str, int] = {}
+        self._built: Dict[str, int] = {}
+        self._timings: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+        # Re-entrant: building the orchestrator builds its members
+        self._lock = threading.RLock()
+        # Per thread, since pooled instances may be built concurrently
+        self._local = threading.local()
+
+    def register(self, name: str, factory: str, pool_size: int = 0) -> None:
+        self._factories[name] = factory
+        if pool_size > 0:
+            self._pool_sizes[name] = pool_size
+            self._pools[name] = queue.LifoQueue()
+            self._reserved[name] = 0
+
+    def record(self, name: str, seconds: float) -> None:
+        """Time of a startup phase outside the registry, e.g. importing the app"""
+        self._timings[name] = seconds
+
+    def is_built(self, name: str) -> bool:
+        return self._built.get(name, 0) > 0
+
+    def build(self, name: str) -> Any:
+        """A new instance of `name`, e.g. a member for each pooled Team"""
+        module_name, _, attribute = self._factories[name].partition(":")
+        child_time: List[float] = self._local.__dict__.setdefault("child_time", [])
+        child_time.append(0.0)
+        started = time.perf_counter()
+        try:
+            instance = getattr(importlib.import_module(module_name), attribute)()
+        except Exception as e:
+            self._errors[name] = str(e)
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            children = child_time.pop()
+            if child_time:
+                child_time[-1] += elapsed
+        with self._lock:
+            self._timings[name] = self._timings.get(name, 0.0) + elapsed - children
+            self._built[name] = self._built.get(name, 0) + 1
+            self._errors.pop(name, None)
+        logger.info(f"Built {name} in {(elapsed - children) * 1000:.0f}ms")
+        return instance
+
+    def get(self, name: str) -> Any:
+        """The shared instance of an unpooled component"""
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            if name not in self._instances:
+                self._instances[name] = self.build(name)
+            return self._instances[name]
+
+    @contextmanager
+    def lease(self, name: str, timeout: Optional[float] = None) -> Iterator[Any]:
+        """
+        An instance of a pooled component for one run, built if the pool has room.
+        Raises TimeoutError if none is free within `timeout` seconds.
+        """
+        instance = self._take(name, timeout)
+        try:
+            yield instance
+        finally:
+            self._pools[name].put(instance)
+
+    def _take(self, name: str, timeout: Optional[float]) -> Any:
+        pool = self._pools[name]
+        try:
+            return pool.get_nowait()
+        except queue.Empty:
+            pass
+        instance = self._grow(name)
+        if instance is not None:
+            return instance
+        try:
+            return pool.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No free {name} within {timeout or 0:.1f}s")
+
+    def _grow(self, name: str) -> Any:
+        """A new instance for the pool of `name`, or None if it is full"""
+        with self._lock:
+            if self._reserved[name] >= self._pool_sizes[name]:
+                return None
+            self._reserved[name] += 1
+        try:
+            return self.build(name)
+        except Exception:
+            with self._lock:
+                self._reserved[name] -= 1
+            raise
+
+    def warm(self, names: Optional[List[str]] = None) -> Dict[str, float]:
+        """
+        Build `names` now instead of on first use; pooled components are built to
+        their full pool size. Defaults to every pooled component.
+        """
+        for name in names or list(self._pools):
+            if name not in self._pools:
+                self.get(name)
+                continue
+            instance = self._grow(name)
+            while instance is not None:
+                self._pools[name].put(instance)
+                instance = self._grow(name)
+        return self.stats()["startup_ms"]
+
+    def stats(self) -> Dict[str, Any]:
+        timings = dict(self._timings)
+        return {
+            "built": dict(self._built),
+            "pools": {
+                name: {
+                    "size": size,
+                    "built": self._reserved[name],
+                    "idle": self._pools[name].qsize(),
+                }
+                for name, size in self._pool_sizes.items()
+            },
+            "startup_ms": {
+                name: round(seconds * 1000, 1) for name, seconds in timings.items()
+            },
+            "total_ms": round(sum(timings.values()) * 1000, 1),
+            "errors": dict(self._errors),
+        }
+
+
+registry = AgentRegistry()
+registry.register("sql-agent", "app.agents.sales_assistants.sql_agent:create_sql_agent")
+registry.register(
+    "product-agent", "app.agents.sales_assistants.product_agent:create_product_agent"
+)
+registry.register(
+    "email-agent", "app.agents.sales_assistants.emailer_agent:create_emailer_agent"
+)
+registry.register(
+    "team-storage", "app.agents.sales_assistants.orchestrator_agent:create_team_storage"
+)
+registry.register(
+    "team-memory-db",
+    "app.agents.sales_assistants.orchestrator_agent:create_team_memory_db",
+)
+registry.register(
+    "team-history",
+    "app.agents.sales_assistants.orchestrator_agent:create_history_compactor",
+)
+# One Team per admission slot, so every admitted run has its own
+registry.register(
+    "orchestrator",
+    "app.agents.sales_assistants.orchestrator_agent:create_orchestrator_team",
+    pool_size=config.ADMISSION_MAX_IN_FLIGHT,
+)
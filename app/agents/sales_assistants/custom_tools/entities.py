@@ -0,0 +1,45 @@
+import json
+from app.services.entity_cache import entity_cache
+
+
+def lookup_person(name: str) -> str:
+    """
+    Look up persons by name (cached, case/width/space-insensitive partial match)
+    Args:
+        name: Person name or part of it
+    Returns:
+        JSON list of matching persons with id, title, organization and summary
+    """
+    try:
+        matches = entity_cache.find_persons(name)
+    except Exception as e:
+        return f"Error looking up person: {str(e)}"
+    if not matches:
+        return f"No persons found matching '{name}'"
+    return json.dumps(
+        [{"id": person_id, **person.model_dump()} for person_id, person in matches],
+        ensure_ascii=False,
+    )
+
+
+def lookup_organization(name: str) -> str:
+    """
+    Look up organizations by name (cached, case/width/space-insensitive partial match)
+    Args:
+        name: Organization name or part of it
+    Returns:
+        JSON list of matching organizations with id and summary
+    """
+    try:
+        matches = entity_cache.find_organizations(name)
+    except Exception as e:
+        return f"Error looking up organization: {str(e)}"
+    if not matches:
+        return f"No organizations found matching '{name}'"
+    return json.dumps(
+        [
+            {"id": organization_id, **organization.model_dump(exclude_none=True)}
+            for organization_id, organization in matches
+        ],
+        ensure_ascii=False,
+    )
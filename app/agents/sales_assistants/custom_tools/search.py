@@ -1,4 +1,21 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from typing import Any, Dict, List, Optional
+from weaviate.classes.query import Sort
 from app.config import config
+from app.common.local_vector_index import LocalVectorIndex, tenant_index
+from app.common.vector_database import batching_embedder, get_weaviate_client
+from app.common.product_attributes import SPECS, AttributeQuery
+from app.services.speculation import take_speculative_result
+from app.services.coalescing import normalize_text, search_flight
+from app.services.deadlines import current_deadline
+from app.services.tenants import current_tenant, tenant_catalogs
+from app.services.tracing import span
+
+# Searches run here so a tool call can stop waiting once its budget is spent
+_executor = ThreadPoolExecutor(
+    max_workers=config.SEARCH_WORKERS, thread_name_prefix="product-search"
+)
 
 
 def search_knowledge_base(query: str) -> str:
@@ -9,80 +26,254 @@ def search_knowledge_base(query: str) -> str:
     Returns:
         Formatted search results with product information and links
     """
+    # The route may already have searched the raw user query for this request
+    speculative_result = take_speculative_result(query)
+    if speculative_result is not None:
+        return speculative_result
+
+    deadline = current_deadline()
+    if deadline is None:
+        return search_products(query)
+    deadline.check("search_knowledge_base")
+    timeout = deadline.budget(config.SEARCH_TIMEOUT_SECONDS)
+    try:
+        # The copied context keeps the search inside the request's trace
+        return _executor.submit(
+            contextvars.copy_context().run, search_products, query
+        ).result(timeout=timeout)
+    except TimeoutError:
+        return f"Error searching products: no result within {timeout:.1f}s"
+
+
+def search_products(query: str) -> str:
+    """Product search; identical concurrent queries share one Weaviate round trip"""
+    return search_flight.do(
+        (current_tenant(), normalize_text(query)), lambda: _search_products(query)
+    )
+
 
-    client = config.weaviate_client
+def _search_local(query: str, index: LocalVectorIndex) -> str:
+    """Product search against the in-process snapshot (PRODUCT_SEARCH_BACKEND=local)"""
     try:
-        collection = client.collections.get("Product_collection_demo")
+        with span("embedding.query"):
+            vector = batching_embedder.get_embedding(query)
+        with span("local_index.near_vector", epoch=index.epoch):
+            objects = index.near_vector(vector, limit=5)
+        return _format_results(query, objects)
+    except Exception as e:
+        return f"Error searching products: {str(e)}"
+
+
+def _search_products(query: str) -> str:
+    """Run the product search against the current tenant's catalog and format the results"""
+    tenant = current_tenant()
+    if config.PRODUCT_SEARCH_BACKEND == "local":
+        index = tenant_index(tenant).get()
+        if index is not None:
+            return _search_local(query, index)
+        # No snapshot published yet; Weaviate still answers
+
+    try:
+        with span("weaviate.tenant", tenant=tenant):
+            collection = tenant_catalogs.collection(get_weaviate_client(), tenant)
+        return_properties = [
+            "content",
+            "source",
+            "section",
+            "website",
+            "pdf_urls",
+            "image_urls",
+            "youtube_urls",
+        ]
         # Perform semantic search
-        response = collection.query.near_text(
-            query=query,
-            limit=5,
-            return_properties=["content", "source", "image_urls", "youtube_urls"],
-            return_metadata=["score"],
-        )
+        if config.QUERY_EMBEDDING_BATCHING:
+            # Embed client-side so concurrent queries share one embeddings call
+            with span("embedding.query"):
+                vector = batching_embedder.get_embedding(query)
+            with span("weaviate.near_vector", collection=collection.name):
+                response = collection.query.near_vector(
+                    near_vector=vector,
+                    limit=5,
+                    return_properties=return_properties,
+                    return_metadata=["score"],
+                )
+        else:
+            with span("weaviate.near_text", collection=collection.name):
+                response = collection.query.near_text(
+                    query=query,
+                    limit=5,
+                    return_properties=return_properties,
+                    return_metadata=["score"],
+                )
+
+        return _format_results(query, response.objects)
 
-        if not response.objects:
-            return f"No products found matching '{query}'"
+    except Exception as e:
+        return f"Error searching products: {str(e)}"
 
-        results = []
-        seen_sources = set()  # Avoid duplicates
 
-        for obj in response.objects:
-            source = obj.properties.get("source", "Unknown Product")
+def find_products(
+    category: Optional[str] = None,
+    feature: Optional[str] = None,
+    names: Optional[List[str]] = None,
+    spec: Optional[str] = None,
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None,
+    descending: bool = False,
+    limit: int = 10,
+) -> str:
+    """
+    Find products by their structured attributes with one filtered query
+    Args:
+        category: One of kitchen, lighting, peripherals, power, air_quality, 3d_printing, vr, other
+        feature: Words that must appear in the product's feature names, e.g. "voice control"
+        names: Products to put side by side for a comparison, e.g. ["mouse", "LED strip"]
+        spec: Numeric spec to filter and sort on: power_watts, battery_hours, max_dpi,
+            resolution_k, field_of_view_degrees, display_inches, layer_resolution_microns
+        min_value: Smallest allowed value of the spec
+        max_value: Largest allowed value of the spec
+        descending: Sort the spec from highest to lowest
+        limit: Maximum number of products
+    Returns:
+        One line per product with its category, specs, features and links
+    """
+    try:
+        criteria = AttributeQuery(category, feature, names, spec, min_value, max_value)
+    except ValueError as e:
+        return f"Error finding products: {e}"
+    if criteria.empty:
+        return "Error finding products: give a category, feature, names or spec"
 
-            # Skip duplicates
-            if source in seen_sources:
-                continue
-            seen_sources.add(source)
+    try:
+        if config.PRODUCT_SEARCH_BACKEND == "local":
+            index = tenant_index(current_tenant()).get()
+            if index is not None:
+                with span("local_index.filter", epoch=index.epoch):
+                    rows = [row for row in index.records() if criteria.matches(row)]
+                return _format_attributes(criteria, rows, descending, limit)
 
-            content = obj.properties.get("content", "")
-            image_urls = (
-                obj.properties.get("image_urls", "").split("\n")
-                if obj.properties.get("image_urls")
-                else []
-            )
-            youtube_urls = (
-                obj.properties.get("youtube_urls", "").split("\n")
-                if obj.properties.get("youtube_urls")
-                else []
+        collection = tenant_catalogs.collection(get_weaviate_client())
+        with span("weaviate.fetch_objects", collection=collection.name):
+            response = collection.query.fetch_objects(
+                filters=criteria.weaviate_filter(),
+                sort=Sort.by_property(spec, ascending=not descending) if spec else None,
+                # Products have several chunks; enough rows to fill `limit` products
+                limit=limit * 4,
             )
+        # Filters match chunk rows; the same check drops products missing the spec
+        rows = [
+            obj.properties
+            for obj in response.objects
+            if criteria.matches(obj.properties)
+        ]
+        return _format_attributes(criteria, rows, descending, limit)
+    except Exception as e:
+        return f"Error finding products: {str(e)}"
 
-            # Clean up URLs by removing any whitespace
-            image_urls = [url.strip() for url in image_urls if url.strip()]
-            youtube_urls = [url.strip() for url in youtube_urls if url.strip()]
 
-            result_text = f"Product: {source}\n\n"
+def _format_attributes(
+    criteria: AttributeQuery, rows: List[Dict[str, Any]], descending: bool, limit: int
+) -> str:
+    products: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        products.setdefault(row.get("product_id") or row.get("source"), row)
+    found = list(products.values())
+    if criteria.spec:
+        found.sort(key=lambda row: row[criteria.spec], reverse=descending)
+    found = found[:limit]
+    if not found:
+        return "No products match these attributes"
 
-            # Add content (limit for readability)
-            if len(content) > 500:
-                result_text += f"{content[:500]}...\n\n"
-            else:
-                result_text += f"{content}\n\n"
+    lines = []
+    for row in found:
+        specs = ", ".join(
+            f"{name}={row[name]:g} {spec.unit}"
+            for name, spec in SPECS.items()
+            if row.get(name) is not None
+        )
+        parts = [
+            f"Product: {row.get('source', 'Unknown Product')} [{row.get('category', 'other')}]"
+        ]
+        if specs:
+            parts.append(f"Specs: {specs}")
+        if row.get("features"):
+            parts.append(f"Features: {', '.join(row['features'])}")
+        website = (row.get("website") or "").split("\n")[0].strip()
+        if website:
+            parts.append(f"Product Page: {website}")
+        lines.append("\n".join(parts))
+    return f"Found {len(found)} products\n\n" + "\n\n".join(lines)
 
-            # Add resources
-            resources = []
-            if source.startswith(("http://", "https://")):
-                resources.append(f"Product Page: {source}")
 
-            if youtube_urls:
-                for url in youtube_urls[:2]:  # Limit to 2 videos
-                    resources.append(f"Video: {url}")
+def _format_results(query: str, objects) -> str:
+    if not objects:
+        return f"No products found matching '{query}'"
 
-            if image_urls:
-                for url in image_urls[:3]:  # Limit to 3 images
-                    resources.append(f"Image: {url}")
+    results = []
+    seen_sources = set()  # Avoid duplicates
 
-            if resources:
-                result_text += "Available Resources:\n" + "\n".join(
-                    f"- {r}" for r in resources
-                )
+    for obj in objects:
+        source = obj.properties.get("source", "Unknown Product")
 
-            results.append(result_text)
+        # Skip duplicates
+        if source in seen_sources:
+            continue
+        seen_sources.add(source)
 
-        return "\n\n" + ("\n" + "=" * 50 + "\n\n").join(results)
+        content = obj.properties.get("content", "")
+        image_urls = (
+            obj.properties.get("image_urls", "").split("\n")
+            if obj.properties.get("image_urls")
+            else []
+        )
+        youtube_urls = (
+            obj.properties.get("youtube_urls", "").split("\n")
+            if obj.properties.get("youtube_urls")
+            else []
+        )
+        pdf_urls = (
+            obj.properties.get("pdf_urls", "").split("\n")
+            if obj.properties.get("pdf_urls")
+            else []
+        )
+        website = (obj.properties.get("website") or "").split("\n")[0].strip()
 
-    except Exception as e:
-        return f"Error searching products: {str(e)}"
+        # Clean up URLs by removing any whitespace
+        image_urls = [url.strip() for url in image_urls if url.strip()]
+        youtube_urls = [url.strip() for url in youtube_urls if url.strip()]
+        pdf_urls = [url.strip() for url in pdf_urls if url.strip()]
+
+        result_text = f"Product: {source}\n\n"
+
+        # Add content (limit for readability)
+        if len(content) > 500:
+            result_text += f"{content[:500]}...\n\n"
+        else:
+            result_text += f"{content}\n\n"
+
+        # Add resources
+        resources = []
+        if website:
+            resources.append(f"Product Page: {website}")
+        elif source.startswith(("http://", "https://")):
+            resources.append(f"Product Page: {source}")
+
+        for url in pdf_urls[:2]:  # Limit to 2 documents
+            resources.append(f"PDF: {url}")
+
+        if youtube_urls:
+            for url in youtube_urls[:2]:  # Limit to 2 videos
+                resources.append(f"Video: {url}")
+
+        if image_urls:
+            for url in image_urls[:3]:  # Limit to 3 images
+                resources.append(f"Image: {url}")
+
+        if resources:
+            result_text += "Available Resources:\n" + "\n".join(
+                f"- {r}" for r in resources
+            )
+
+        results.append(result_text)
 
-    finally:
-        client.close()
+    return "\n\n" + ("\n" + "=" * 50 + "\n\n").join(results)
@@ -0,0 +1,46 @@
+from typing import List, Optional
+from agno.tools.sql import SQLTools
+from sqlalchemy import text
+from app.common.database import get_engine, set_statement_timeout
+from app.services.coalescing import normalize_text, sql_flight
+from app.services.deadlines import check_deadline
+from app.services.tracing import span
+
+
+class CoalescingSQLTools(SQLTools):
+    """SQLTools on the shared engine; identical concurrent queries run once"""
+
+    def __init__(self, **kwargs):
+        super().__init__(db_engine=get_engine(), **kwargs)
+
+    def run_sql_query(self, query: str, limit: Optional[int] = 10) -> str:
+        """Use this function to run a SQL query and return the result.
+
+        Args:
+            query (str): The query to run.
+            limit (int, optional): The number of rows to return. Defaults to 10. Use `None` to show all results.
+        Returns:
+            str: Result of the SQL query.
+        Notes:
+            - The result may be empty if the query does not return any data.
+        """
+        check_deadline("run_sql_query")
+        return sql_flight.do(
+            ("query", normalize_text(query), limit),
+            lambda: super(CoalescingSQLTools, self).run_sql_query(query, limit),
+        )
+
+    def run_sql(self, sql: str, limit: Optional[int] = None) -> List[dict]:
+        """Same as SQLTools.run_sql, but bounded by the request's SQL budget"""
+        with (
+            self.Session() as sess,
+            sess.begin(),
+            span("postgres.query", statement=sql[:500]),
+        ):
+            set_statement_timeout(sess)
+            result = sess.execute(text(sql))
+            try:
+                rows = result.fetchmany(limit) if limit else result.fetchall()
+                return [row._asdict() for row in rows]
+            except Exception:
+                return []
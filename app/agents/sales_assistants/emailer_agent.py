@@ -1,9 +1,16 @@
 from agno.agent import Agent
-from agno.tools.sql import SQLTools
 from app.common.llm_models import get_gpt4o_mini_model
+from app.config import config
+from app.common.prompts import static_system_message
+from app.agents.sales_assistants.custom_tools.sql import CoalescingSQLTools
 from app.agents.sales_assistants.custom_tools.search import search_knowledge_base
+from app.agents.sales_assistants.custom_tools.entities import (
+    lookup_organization,
+    lookup_person,
+)
 from app.schemas.agents.sales_assistants.agent_response import EmailAgentResponse
-from app.config import config
+from app.services.deadlines import enforce_deadline
+from app.services.metrics import record_tool_metrics
 
 DESCRIPTION = """
     Fetches product information from vector database then drafts a promotional email.
@@ -23,24 +30,47 @@ INSTRUCTIONS = """
 
     Follow these steps in order:
         - Step 1: Search the vector database using search_knowledge_base for detailed information about the given product.
-        - Step 2: Query the relational SQL database to retrieve the recipient’s details from the 'persons' table.
-        - Step 3: If available, also identify the recipient’s organization from the 'organizations' table.
-        - Step 4: Analyze information from 'persons' table and 'organizations' table, take these information into account when drafting email.
+        - Step 2: Retrieve the recipient’s summary with lookup_person (or from the 'person_digests' table: person_name, title, organization_id, organization_name, digest).
+        - Step 3: If available, also read the recipient’s organization summary with lookup_organization (or from the 'organization_digests' table: organization_name, digest).
+        - Step 4: Analyze the person and organization digests, take these information into account when drafting email. Only query full columns of 'persons'/'organizations' if a digest lacks something you need.
         - Step 5: Draft a promotional email in response model format
 """
 
+CAMPAIGN_INSTRUCTIONS = """
+    Your task is to draft one promotional email for a campaign.
+    The message contains the product information and the recipient's details, already retrieved.
+    Do not look anything up; use only the information given.
+    Tailor the email to the recipient's title, activities and organization, and draft it in response model format.
+"""
 
-model = get_gpt4o_mini_model()
 
+def create_emailer_agent():
+    """Factory for the team's email agent, which looks up products and recipients itself"""
+    return Agent(
+        name="email-agent",
+        model=get_gpt4o_mini_model(),
+        response_model=EmailAgentResponse,
+        tools=[
+            CoalescingSQLTools(),
+            search_knowledge_base,
+            lookup_person,
+            lookup_organization,
+        ],
+        tool_hooks=[enforce_deadline, record_tool_metrics],
+        stream_intermediate_steps=True,
+        description=DESCRIPTION,
+        system_message=static_system_message(SYSTEM_MESSAGE, INSTRUCTIONS),
+        monitoring=config.AGNO_MONITORING,
+    )
 
-emailer_agent = Agent(
-    name="email-agent",
-    model=model,
-    response_model=EmailAgentResponse,
-    tools=[SQLTools(db_url=config.database_url), search_knowledge_base],
-    stream_intermediate_steps=True,
-    description=DESCRIPTION,
-    system_message=SYSTEM_MESSAGE,
-    instructions=INSTRUCTIONS,
-    monitoring=True,
-)
+
+def create_campaign_emailer_agent():
+    """Factory for a tool-less email drafter; campaigns pass product and recipient data in the message"""
+    return Agent(
+        name="email-agent",
+        model=get_gpt4o_mini_model(),
+        response_model=EmailAgentResponse,
+        description=DESCRIPTION,
+        system_message=static_system_message(SYSTEM_MESSAGE, CAMPAIGN_INSTRUCTIONS),
+        monitoring=False,
+    )
@@ -1,15 +1,16 @@
-from agno.team.team import Team
-from app.agents.sales_assistants.sql_agent import sql_agent
-from app.agents.sales_assistants.emailer_agent import emailer_agent
-from app.agents.sales_assistants.product_agent import product_agent
 from agno.storage.postgres import PostgresStorage
 from agno.memory.v2.db.postgres import PostgresMemoryDb
 from agno.memory.v2.memory import Memory
 from app.common.llm_models import get_gpt4o_mini_model
+from app.common.prompts import static_system_message
+from app.common.team import OrchestratorTeam
+from app.services.history_compactor import HistoryCompactor
+from app.services.deadlines import enforce_deadline
+from app.services.metrics import record_tool_metrics
 from app.schemas.agents.sales_assistants.agent_response import OrchestratorResponse
+from app.agents.registry import registry
 from app.config import config
 
-
 SYSTEM_MESSAGE = """
 You are the OrchestratorAgent coordinating three specialized agents. Your role is to understand user requests and delegate to the appropriate agent(s) based on the task.
 # AVAILABLE AGENTS:
@@ -46,38 +47,59 @@ SUCCESS_CRITERIA = """
  """
 
 
+def create_team_storage():
+    return PostgresStorage(table_name="team_sessions", db_url=config.database_url)
+
+
+def create_team_memory_db():
+    return PostgresMemoryDb(table_name="team_memories", db_url=config.database_url)
+
+
+def create_history_compactor():
+    return HistoryCompactor(
+        token_budget=config.HISTORY_TOKEN_BUDGET,
+        digest_chars=config.HISTORY_DIGEST_CHARS,
+    )
+
+
 def create_orchestrator_team():
-    """Factory function to create orchestrator team configuration"""
+    """
+    Factory function to create orchestrator team configuration. Each Team gets its
+    own members; storage, the memory db and the history compactor are shared.
+    """
     model = get_gpt4o_mini_model()
-    memory_db = PostgresMemoryDb(table_name="team_memories", db_url=config.database_url)
-    memory = Memory(model=model, db=memory_db)
-    storage = PostgresStorage(table_name="team_sessions", db_url=config.database_url)
+    memory = Memory(model=model, db=registry.get("team-memory-db"))
 
-    return Team(
+    return OrchestratorTeam(
         name="orchestrator_agent",
         mode="coordinate",
         memory=memory,
-        storage=storage,
-        members=[sql_agent, product_agent, emailer_agent],
+        storage=registry.get("team-storage"),
+        members=[
+            registry.build("sql-agent"),
+            registry.build("product-agent"),
+            registry.build("email-agent"),
+        ],
+        tool_hooks=[
+            enforce_deadline,  # Stops delegating once the request deadline passes; per-member budgets
+            record_tool_metrics,  # Tool and member run-time histograms for /metrics
+        ],
         model=model,
         user_id="default",  # Will be updated dynamically
         session_id="default",  # Will be updated dynamically
         response_model=OrchestratorResponse,
         enable_agentic_memory=True,  # agent itself manage memories
         enable_user_memories=False,  # At the end of a run, the agent creates/updates user-specific memories
-        add_history_to_messages=True,  # Includes chat history messages in the context sent to the model
-        num_history_runs=3,  # How many past interactions to include when add_history_to_messages=True
+        add_history_to_messages=False,  # Full replay disabled, history_compactor sends a bounded digest instead
+        history_compactor=registry.get(
+            "team-history"
+        ),  # Rolling summary + digests of earlier runs, capped by HISTORY_TOKEN_BUDGET
         read_team_history=False,  # Loads previous team runs’ history from storage and makes it available for reasoning
         enable_agentic_context=True,  # Allows the team agent to update shared context and automatically push it to members
         show_tool_calls=False,
         debug_mode=False,
-        system_message=SYSTEM_MESSAGE,
-        instructions=INSTRUCTIONS,
+        system_message=static_system_message(SYSTEM_MESSAGE, INSTRUCTIONS),
         markdown=True,
         add_datetime_to_instructions=False,
-        monitoring=True,
+        monitoring=config.AGNO_MONITORING,
     )
-
-
-# Create the orchestrator instance
-orchestrator_agent = create_orchestrator_team()
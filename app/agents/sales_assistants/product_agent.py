@@ -1,6 +1,12 @@
 from agno.agent import Agent, RunResponse
 from app.common.llm_models import get_gpt4o_mini_model, get_gpt4o_model
-from app.agents.sales_assistants.custom_tools.search import search_knowledge_base
+from app.common.prompts import static_system_message
+from app.agents.sales_assistants.custom_tools.search import (
+    find_products,
+    search_knowledge_base,
+)
+from app.services.deadlines import enforce_deadline
+from app.services.metrics import record_tool_metrics
 from app.schemas.agents.sales_assistants.agent_response import ProductAgentResponse
 
 DESCRIPTION = """
@@ -11,7 +17,9 @@ SYSTEM_MESSAGE = """
     You are a helpful product information assistant with access to a product database.
 
     When users ask about products:
-        1. Use the search_knowledge_base function with relevant keywords from their query
+        1. Use find_products for questions about categories, features or numeric specs
+           ("which products use under 600W", "compare the mouse and the LED strip"),
+           otherwise use the search_knowledge_base function with relevant keywords from their query
         2. Present the returned results clearly and helpfully
         3. The search results will include product descriptions and available resources
         4. If no matches are found, tell clearly that data was not found
@@ -22,28 +30,28 @@ SYSTEM_MESSAGE = """
 
 INSTRUCTIONS = """
     For any product-related query:
-        1. Extract the main keywords from the user's question
-        2. Use the search_knowledge_base function with those keywords
+        1. Extract the main keywords, or the category, feature, spec limits and product names, from the user's question
+        2. Use find_products for those structured criteria, or the search_knowledge_base function with the keywords
         3. Present the search results in a friendly, conversational manner
         4. Include all available resources (websites, PDFs, videos, images)
         5. If no results are found, suggest related search terms
-        6. Only respond with results from search_knowledge_base, DO NOT RESPOND WITH INTERNAL KNOWLEDGE
+        6. Only respond with results from search_knowledge_base or find_products, DO NOT RESPOND WITH INTERNAL KNOWLEDGE
 
     The search function will return formatted results - present them clearly to help the user.
 """
-# Create the model
-model = get_gpt4o_mini_model()
-
-# Create agent with the function as a tool
-product_agent = Agent(
-    name="product-agent",
-    model=model,
-    tools=[search_knowledge_base],
-    response_model=ProductAgentResponse,
-    stream_intermediate_steps=True,
-    show_tool_calls=True,
-    description=DESCRIPTION,
-    system_message=SYSTEM_MESSAGE,
-    instructions=INSTRUCTIONS,
-    monitoring=False,
-)
+
+
+def create_product_agent():
+    """Factory for the product agent with the search functions as tools"""
+    return Agent(
+        name="product-agent",
+        model=get_gpt4o_mini_model(),
+        tools=[search_knowledge_base, find_products],
+        tool_hooks=[enforce_deadline, record_tool_metrics],
+        response_model=ProductAgentResponse,
+        stream_intermediate_steps=True,
+        show_tool_calls=True,
+        description=DESCRIPTION,
+        system_message=static_system_message(SYSTEM_MESSAGE, INSTRUCTIONS),
+        monitoring=False,
+    )
@@ -1,8 +1,15 @@
 from agno.agent import Agent
-from agno.tools.sql import SQLTools
 from app.common.llm_models import get_gpt4o_mini_model
-from app.schemas.agents.sales_assistants.agent_response import SQLAgentResponse
 from app.config import config
+from app.common.prompts import static_system_message
+from app.agents.sales_assistants.custom_tools.sql import CoalescingSQLTools
+from app.agents.sales_assistants.custom_tools.entities import (
+    lookup_organization,
+    lookup_person,
+)
+from app.schemas.agents.sales_assistants.agent_response import SQLAgentResponse
+from app.services.deadlines import enforce_deadline
+from app.services.metrics import record_tool_metrics
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -28,18 +35,28 @@ Then you should query the schema of the most relevant tables.
 """
 
 INSTRUCTIONS = """
-    Your task is to respond to queries about persons or organizations and retrieve ALL available data.
+    Your task is to respond to queries about persons or organizations with compact, relevant data.
 
     DATABASE SCHEMA:
+        - person_digests table: person_id, person_name, title, organization_id, organization_name, digest
+        - organization_digests table: organization_id, organization_name, digest
         - persons table: id, person_name, title, career_history, current_activities, publications, organization_id
         - organizations table: id, organization_name, company_overview, business_activities, history, group_companies, major_business_partners, sales_trends, president_message, interview_articles, past_transactions
 
+    The *_digests tables hold a short precomputed summary of every person and organization.
+    Read the digest tables by default. Only select full columns from persons/organizations when the
+    question explicitly asks about that topic (e.g. history, sales trends, past transactions), and then
+    select only those columns.
+
+    The lookup_person and lookup_organization tools return the same digest rows from a cache.
+    Always try them first; they are much faster than writing SQL.
+
     STEPS:
         1. Determine if input is a person name or organization name
-        2. Query appropriate table using ILIKE for case-insensitive search
-        3. If querying person table and organization_id is found, make a second query to get organization details
+        2. Call lookup_person or lookup_organization with the name (fall back to querying the digest tables with ILIKE)
+        3. If the question asks for specific details, query only those full columns by id
         4. Set data_type to "person", "organization", or "none"
-        5. Fill person_data or organization_data with ALL available fields from results
+        5. Put the digest into summary and fill any full fields you selected into person_data or organization_data
         6. Include the SQL query used for transparency
         7. Set success=true if data found, false otherwise
 
@@ -47,32 +64,37 @@ INSTRUCTIONS = """
         - Use only SELECT statements (READ-ONLY)
         - Use ILIKE '%search_term%' for case-insensitive matching
         - Always use LIMIT 10 to avoid excessive results
-        - Select ALL columns for complete information
+        - Never select all long text columns at once
         - Handle Japanese text properly
-        - For person queries, if organization_id exists, join with organization table to get organization_name
-
-    IMPROVED QUERY EXAMPLES:
-        - For person with organization lookup: 
-            SELECT p.id, p.person_name, p.title, p.career_history, p.current_activities, p.publications, p.organization_id, o.organization_name 
-            FROM persons p 
-            LEFT JOIN organizations o ON p.organization_id = o.id 
-            WHERE p.person_name ILIKE '%福沢 博志%' LIMIT 10;
-
-        - For organization: 
-            SELECT id, organization_name, company_overview, business_activities, history, group_companies, major_business_partners, sales_trends, president_message, interview_articles, past_transactions 
-            FROM organizations 
+
+    QUERY EXAMPLES:
+        - For person (default):
+            SELECT person_id, person_name, title, organization_name, digest
+            FROM person_digests
+            WHERE person_name ILIKE '%福沢 博志%' LIMIT 10;
+
+        - For organization (default):
+            SELECT organization_id, organization_name, digest
+            FROM organization_digests
             WHERE organization_name ILIKE '%OptoComb%' LIMIT 10;
 
+        - For a specific detail on demand:
+            SELECT organization_name, past_transactions
+            FROM organizations
+            WHERE id = 42;
+
 """
 
-model = get_gpt4o_mini_model()
 
-sql_agent = Agent(
-    name="sql-agent",
-    model=model,
-    tools=[SQLTools(db_url=config.database_url)],
-    response_model=SQLAgentResponse,
-    description=DESCRIPTION,
-    system_message=SYSTEM_MESSAGE,
-    monitoring=True,
-)
+def create_sql_agent():
+    """Factory for the SQL agent; its tools open the shared SQL engine"""
+    return Agent(
+        name="sql-agent",
+        model=get_gpt4o_mini_model(),
+        tools=[CoalescingSQLTools(), lookup_person, lookup_organization],
+        tool_hooks=[enforce_deadline, record_tool_metrics],
+        response_model=SQLAgentResponse,
+        description=DESCRIPTION,
+        system_message=static_system_message(SYSTEM_MESSAGE, INSTRUCTIONS),
+        monitoring=config.AGNO_MONITORING,
+    )
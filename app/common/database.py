@@ -0,0 +1,22 @@
+from functools import lru_cache
+from typing import Union
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from app.config import config
+from app.services.deadlines import stage_timeout
+
+
+@lru_cache
+def get_engine() -> Engine:
+    """Shared SQLAlchemy engine (and connection pool) for app-side queries"""
+    return create_engine(config.database_url, pool_pre_ping=True)
+
+
+def set_statement_timeout(connection: Union[Connection, Session]) -> None:
+    """Limit statements in the current transaction to the request's SQL budget"""
+    timeout_ms = max(1, int(stage_timeout(config.SQL_TIMEOUT_SECONDS) * 1000))
+    connection.execute(
+        text("SELECT set_config('statement_timeout', :timeout, true)"),
+        {"timeout": str(timeout_ms)},
+    )
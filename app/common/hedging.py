@@ -0,0 +1,248 @@
+import asyncio
+import contextvars
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+from agno.exceptions import ModelProviderError
+from openai import APIConnectionError, InternalServerError, RateLimitError
+
+from app.config import config
+from app.services.deadlines import check_deadline, current_deadline
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# APITimeoutError is a subclass of APIConnectionError
+RETRYABLE_ERRORS = (APIConnectionError, RateLimitError, InternalServerError)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Transient provider errors; agno wraps the SDK error in ModelProviderError"""
+    if isinstance(error, ModelProviderError):
+        error = error.__cause__ or error
+    return isinstance(error, RETRYABLE_ERRORS)
+
+
+class LatencyTracker:
+    """Rolling window of completed call latencies for one agent and model"""
+
+    def __init__(self, window: int):
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def threshold(self) -> float:
+        """Hedge delay: the configured latency percentile, or a fixed delay until enough samples exist"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < config.HEDGE_MIN_SAMPLES:
+            return config.HEDGE_INITIAL_DELAY_SECONDS
+        index = min(len(samples) - 1, int(config.HEDGE_PERCENTILE * len(samples)))
+        return max(config.HEDGE_MIN_DELAY_SECONDS, samples[index])
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+class LLMCallPolicy:
+    """
+    Retries and request hedging for model calls.
+
+    Retryable errors are retried with full-jitter exponential backoff, never sleeping
+    past the request deadline. With hedging enabled, a call that has not returned
+    within the learned latency percentile of its key (agent/model) gets one duplicate; whichever
+    succeeds first wins. At most `max_hedges` duplicates are in flight process-wide.
+    Calls are non-streaming, so the first token arrives with the whole completion.
+    """
+
+    def __init__(self, max_hedges: int):
+        self.max_hedges = max_hedges
+        self._hedges_in_flight = 0
+        self._trackers: Dict[str, LatencyTracker] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.OPENAI_MAX_CONNECTIONS, thread_name_prefix="llm-call"
+        )
+        self.calls = 0
+        self.retries = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.hedges_skipped = 0
+
+    def _tracker(self, key: str) -> LatencyTracker:
+        with self._lock:
+            tracker = self._trackers.get(key)
+            if tracker is None:
+                tracker = self._trackers[key] = LatencyTracker(config.HEDGE_WINDOW)
+            return tracker
+
+    def _try_start_hedge(self) -> bool:
+        with self._lock:
+            if self._hedges_in_flight >= self.max_hedges:
+                self.hedges_skipped += 1
+                return False
+            self._hedges_in_flight += 1
+            self.hedged += 1
+            return True
+
+    def _end_hedge(self, *_: Any) -> None:
+        with self._lock:
+            self._hedges_in_flight -= 1
+
+    def _backoff(self, attempt: int) -> float:
+        delay = random.uniform(
+            0, min(config.LLM_RETRY_MAX_DELAY, config.LLM_RETRY_BASE_DELAY * 2**attempt)
+        )
+        deadline = current_deadline()
+        if deadline is not None and delay >= deadline.remaining():
+            return -1.0
+        return delay
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def call(self, key: str, fn: Callable[[], T]) -> T:
+        self._count("calls")
+        for attempt in range(config.LLM_MAX_ATTEMPTS):
+            try:
+                if config.LLM_HEDGING:
+                    return self._hedged(key, fn)
+                # Latencies are learned even while hedging is off
+                started = time.monotonic()
+                result = fn()
+                self._tracker(key).observe(time.monotonic() - started)
+                return result
+            except Exception as e:
+                delay = self._backoff(attempt)
+                if (
+                    not is_retryable(e)
+                    or attempt + 1 >= config.LLM_MAX_ATTEMPTS
+                    or delay < 0
+                ):
+                    raise
+                self._count("retries")
+                logger.warning(f"Retrying {key} in {delay:.2f}s after: {e}")
+                time.sleep(delay)
+                check_deadline("model call retry")
+        raise RuntimeError("unreachable")
+
+    async def acall(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        self._count("calls")
+        for attempt in range(config.LLM_MAX_ATTEMPTS):
+            try:
+                if config.LLM_HEDGING:
+                    return await self._ahedged(key, fn)
+                started = time.monotonic()
+                result = await fn()
+                self._tracker(key).observe(time.monotonic() - started)
+                return result
+            except Exception as e:
+                delay = self._backoff(attempt)
+                if (
+                    not is_retryable(e)
+                    or attempt + 1 >= config.LLM_MAX_ATTEMPTS
+                    or delay < 0
+                ):
+                    raise
+                self._count("retries")
+                logger.warning(f"Retrying {key} in {delay:.2f}s after: {e}")
+                await asyncio.sleep(delay)
+                check_deadline("model call retry")
+        raise RuntimeError("unreachable")
+
+    def _hedged(self, key: str, fn: Callable[[], T]) -> T:
+        tracker = self._tracker(key)
+
+        def timed() -> T:
+            started = time.monotonic()
+            result = fn()
+            tracker.observe(time.monotonic() - started)
+            return result
+
+        # Each attempt runs in its own copy of the caller's context (deadline, speculation)
+        primary = self._executor.submit(contextvars.copy_context().run, timed)
+        done, _ = wait([primary], timeout=tracker.threshold())
+        if done or not self._try_start_hedge():
+            return primary.result()
+
+        backup = self._executor.submit(contextvars.copy_context().run, timed)
+        # A sync request cannot be aborted; the loser finishes in the background
+        backup.add_done_callback(self._end_hedge)
+        return self._first_success(primary, backup)
+
+    def _first_success(self, primary: Future, backup: Future) -> Any:
+        pending = {primary, backup}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is backup:
+                        self._count("hedge_wins")
+                    return future.result()
+        return primary.result()
+
+    async def _ahedged(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        tracker = self._tracker(key)
+
+        async def timed() -> T:
+            started = time.monotonic()
+            result = await fn()
+            tracker.observe(time.monotonic() - started)
+            return result
+
+        primary = asyncio.ensure_future(timed())
+        done, _ = await asyncio.wait({primary}, timeout=tracker.threshold())
+        if done or not self._try_start_hedge():
+            return await primary
+
+        backup = asyncio.ensure_future(timed())
+        backup.add_done_callback(self._end_hedge)
+        pending = {primary, backup}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if not task.cancelled() and task.exception() is None:
+                        if task is backup:
+                            self._count("hedge_wins")
+                        return task.result()
+            return primary.result()
+        finally:
+            # Async losers can be cancelled, which closes their connection
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            thresholds = {
+                key: {
+                    "samples": len(tracker),
+                    "hedge_after": round(tracker.threshold(), 3),
+                }
+                for key, tracker in self._trackers.items()
+            }
+            return {
+                "hedging": config.LLM_HEDGING,
+                "calls": self.calls,
+                "retries": self.retries,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "hedges_skipped": self.hedges_skipped,
+                "hedges_in_flight": self._hedges_in_flight,
+                "trackers": thresholds,
+            }
+
+
+llm_calls = LLMCallPolicy(max_hedges=config.HEDGE_MAX_IN_FLIGHT)
@@ -0,0 +1,131 @@
+import importlib.util
+import threading
+from functools import lru_cache
+from typing import Any, Dict
+
+import httpx
+from app.config import config
+from app.services.metrics import mark_first_byte
+
+
+class ConnectionStats:
+    """Counts requests and newly opened TCP connections of the shared clients"""
+
+    def __init__(self):
+        self.requests = 0
+        self.connections_opened = 0
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def record_trace(self, event_name: str) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self.connections_opened += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        reused = max(self.requests - self.connections_opened, 0)
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "reused_requests": reused,
+            "reuse_ratio": round(reused / self.requests, 4) if self.requests else 0.0,
+        }
+
+
+sync_stats = ConnectionStats()
+async_stats = ConnectionStats()
+
+
+def _sync_trace(event_name: str, info: Dict) -> None:
+    sync_stats.record_trace(event_name)
+
+
+async def _async_trace(event_name: str, info: Dict) -> None:
+    async_stats.record_trace(event_name)
+
+
+def _sync_request_hook(request: httpx.Request) -> None:
+    sync_stats.record_request()
+    request.extensions["trace"] = _sync_trace
+
+
+async def _async_request_hook(request: httpx.Request) -> None:
+    async_stats.record_request()
+    request.extensions["trace"] = _async_trace
+
+
+def _sync_response_hook(response: httpx.Response) -> None:
+    mark_first_byte()
+
+
+async def _async_response_hook(response: httpx.Response) -> None:
+    mark_first_byte()
+
+
+def http2_enabled() -> bool:
+    # httpx only speaks HTTP/2 when the optional h2 package is installed
+    return config.OPENAI_HTTP2 and importlib.util.find_spec("h2") is not None
+
+
+def get_timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        config.OPENAI_READ_TIMEOUT,
+        connect=config.OPENAI_CONNECT_TIMEOUT,
+        pool=config.OPENAI_CONNECT_TIMEOUT,
+    )
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=config.OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=config.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=config.OPENAI_KEEPALIVE_EXPIRY,
+    )
+
+
+@lru_cache
+def get_sync_http_client() -> httpx.Client:
+    """Process-wide keep-alive client shared by every sync OpenAI model and embedder"""
+    return httpx.Client(
+        http2=http2_enabled(),
+        limits=_limits(),
+        timeout=get_timeout(),
+        event_hooks={
+            "request": [_sync_request_hook],
+            "response": [_sync_response_hook],
+        },
+    )
+
+
+@lru_cache
+def get_async_http_client() -> httpx.AsyncClient:
+    """Process-wide keep-alive client shared by every async OpenAI model call"""
+    return httpx.AsyncClient(
+        http2=http2_enabled(),
+        limits=_limits(),
+        timeout=get_timeout(),
+        event_hooks={
+            "request": [_async_request_hook],
+            "response": [_async_response_hook],
+        },
+    )
+
+
+def connection_stats() -> Dict[str, Any]:
+    return {
+        "http2": http2_enabled(),
+        "sync": sync_stats.snapshot(),
+        "async": async_stats.snapshot(),
+    }
+
+
+async def close_http_clients() -> None:
+    if get_async_http_client.cache_info().currsize:
+        await get_async_http_client().aclose()
+        get_async_http_client.cache_clear()
+    if get_sync_http_client.cache_info().currsize:
+        get_sync_http_client().close()
+        get_sync_http_client.cache_clear()
@@ -1,16 +1,115 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from agno.exceptions import ModelProviderError
 from agno.models.openai import OpenAIChat
+from openai import AsyncOpenAI, OpenAI
+from app.common.http_clients import (
+    get_async_http_client,
+    get_sync_http_client,
+    get_timeout,
+)
 from app.config import config
+from app.common.hedging import llm_calls
+from app.services.deadlines import check_deadline, current_deadline
+from app.services.metrics import current_agent, record_tokens, time_model_call
+
+
+@dataclass
+class SharedClientOpenAIChat(OpenAIChat):
+    """OpenAIChat that reuses the process-wide keep-alive HTTP clients instead of opening its own"""
+
+    _sync_client: Optional[OpenAI] = None
+    _async_client: Optional[AsyncOpenAI] = None
+
+    def _get_client_params(self) -> Dict[str, Any]:
+        client_params = super()._get_client_params()
+        client_params.setdefault("timeout", get_timeout())
+        # Retries are done by llm_calls, with jitter and within the request deadline
+        client_params.setdefault("max_retries", 0)
+        return client_params
+
+    def get_client(self) -> OpenAI:
+        if self._sync_client is None:
+            self._sync_client = OpenAI(
+                **self._get_client_params(), http_client=get_sync_http_client()
+            )
+        return self._sync_client
+
+    def get_async_client(self) -> AsyncOpenAI:
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(
+                **self._get_client_params(), http_client=get_async_http_client()
+            )
+        return self._async_client
+
+    def get_request_params(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        request_params = super().get_request_params(*args, **kwargs)
+        deadline = current_deadline()
+        if deadline is not None:
+            # Each call gets its own budget, never past the request deadline
+            request_params["timeout"] = deadline.budget(
+                config.MODEL_CALL_TIMEOUT_SECONDS
+            )
+        return request_params
+
+    def invoke(self, *args: Any, **kwargs: Any) -> Any:
+        check_deadline("model call")
+        try:
+            with time_model_call(self.id):
+                # Retries and hedging happen below agno, so its own retry loop rarely kicks in
+                # Latency is learned per agent and model: routing and drafting calls differ a lot
+                completion = llm_calls.call(
+                    f"{current_agent()}/{self.id}",
+                    lambda: super(SharedClientOpenAIChat, self).invoke(*args, **kwargs),
+                )
+                record_tokens(self.id, getattr(completion, "usage", None))
+            return completion
+        except ModelProviderError:
+            # A timeout caused by the deadline must not be retried by the agent
+            check_deadline("model call")
+            raise
+
+    async def ainvoke(self, *args: Any, **kwargs: Any) -> Any:
+        check_deadline("model call")
+        try:
+            with time_model_call(self.id):
+                completion = await llm_calls.acall(
+                    f"{current_agent()}/{self.id}",
+                    lambda: super(SharedClientOpenAIChat, self).ainvoke(
+                        *args, **kwargs
+                    ),
+                )
+                record_tokens(self.id, getattr(completion, "usage", None))
+            return completion
+        except ModelProviderError:
+            check_deadline("model call")
+            raise
+
+
+def get_openai_client() -> OpenAI:
+    """Sync OpenAI SDK client on the shared HTTP client (embeddings, scripts)"""
+    return OpenAI(
+        api_key=config.OPENAI_API_KEY,
+        base_url=config.OPENAI_BASE_URL,
+        http_client=get_sync_http_client(),
+        timeout=get_timeout(),
+    )
 
 
 def get_gpt4o_model(temperature=0.1):
-    return OpenAIChat(
-        id="gpt-4o", api_key=config.OPENAI_API_KEY, temperature=temperature
+    return SharedClientOpenAIChat(
+        id="gpt-4o",
+        api_key=config.OPENAI_API_KEY,
+        base_url=config.OPENAI_BASE_URL,
+        temperature=temperature,
     )
 
 
 def get_gpt4o_mini_model(temperature=0.1):
-    return OpenAIChat(
+    return SharedClientOpenAIChat(
         id="gpt-4o-mini",
         api_key=config.OPENAI_API_KEY,
+        base_url=config.OPENAI_BASE_URL,
         temperature=temperature,
     )
@@ -0,0 +1,233 @@
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+CURRENT_FILE = "CURRENT"
+KEEP_EPOCHS = 2
+
+
+class LocalHit:
+    """Shaped like a Weaviate query object, so search formatting works on either backend"""
+
+    __slots__ = ("properties", "metadata")
+
+    def __init__(self, properties: Dict[str, Any], score: float):
+        self.properties = properties
+        self.metadata = SimpleNamespace(score=score, distance=1.0 - score)
+
+
+class LocalVectorIndex:
+    """
+    Exact cosine search over one product snapshot.
+
+    Vectors are unit-normalized float32 in a .npy file opened with mmap, so every
+    worker process maps the same page-cache pages instead of holding its own copy.
+    The catalog is small enough that a brute-force matrix-vector product beats an
+    approximate index and is always exact.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(
+            os.path.join(path, "manifest.json"), "r", encoding="utf-8"
+        ) as manifest_file:
+            manifest = json.load(manifest_file)
+        self.epoch: int = manifest["epoch"]
+        self._vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r")
+        with open(
+            os.path.join(path, "properties.jsonl"), "r", encoding="utf-8"
+        ) as properties_file:
+            self._properties = [
+                json.loads(line) for line in properties_file if line.strip()
+            ]
+        if len(self._properties) != len(self._vectors):
+            raise ValueError(
+                f"Snapshot {path} has {len(self._vectors)} vectors but {len(self._properties)} rows"
+            )
+
+    def near_vector(self, vector: List[float], limit: int = 5) -> List[LocalHit]:
+        if not len(self._vectors):
+            return []
+        query = np.asarray(vector, dtype=np.float32)
+        query /= np.linalg.norm(query) or 1.0
+        scores = self._vectors @ query
+        if limit < len(scores):
+            top = np.argpartition(-scores, limit)[:limit]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top])]
+        return [
+            LocalHit(self._properties[position], float(scores[position]))
+            for position in top
+        ]
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Properties of every chunk, in index order"""
+        return self._properties
+
+    @property
+    def dimensions(self) -> int:
+        return self._vectors.shape[1] if self._vectors.ndim == 2 else 0
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+
+def write_snapshot(
+    directory: str, records: Iterable[Dict[str, Any]], epoch: Optional[int] = None
+) -> str:
+    """
+    Publish records (collection properties plus a "vector") as a new snapshot epoch.
+
+    The epoch is written to its own directory first and then made current by
+    atomically replacing the CURRENT pointer, so readers never see a partial snapshot.
+    """
+    epoch = epoch or time.time_ns()
+    name = f"epoch-{epoch}"
+    target = os.path.join(directory, name)
+    os.makedirs(target)
+
+    vectors, count = [], 0
+    with open(
+        os.path.join(target, "properties.jsonl"), "w", encoding="utf-8"
+    ) as properties_file:
+        for record in records:
+            record = dict(record)
+            vectors.append(record.pop("vector"))
+            properties_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    # An empty catalog still gets a (0, 0) matrix, which near_vector answers with no hits
+    matrix = (
+        np.asarray(vectors, dtype=np.float32).reshape(count, -1)
+        if count
+        else np.zeros((0, 0), np.float32)
+    )
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.save(
+        os.path.join(target, "vectors.npy"), matrix / np.where(norms == 0, 1.0, norms)
+    )
+    with open(
+        os.path.join(target, "manifest.json"), "w", encoding="utf-8"
+    ) as manifest_file:
+        json.dump(
+            {
+                "epoch": epoch,
+                "count": count,
+                "dimensions": matrix.shape[1],
+                "created_at": int(time.time()),
+            },
+            manifest_file,
+        )
+
+    pointer = os.path.join(directory, CURRENT_FILE)
+    with open(pointer + ".tmp", "w", encoding="utf-8") as pointer_file:
+        pointer_file.write(name)
+    os.replace(pointer + ".tmp", pointer)
+    _prune(directory, keep=name)
+    return target
+
+
+def _prune(directory: str, keep: str) -> None:
+    # Workers still mapping an older epoch keep their pages after the unlink
+    epochs = sorted(
+        entry for entry in os.listdir(directory) if entry.startswith("epoch-")
+    )
+    for entry in epochs[:-KEEP_EPOCHS]:
+        if entry != keep:
+            shutil.rmtree(os.path.join(directory, entry), ignore_errors=True)
+
+
+class SnapshotIndex:
+    """The current snapshot in a directory, swapped in when a new ingest epoch is published"""
+
+    def __init__(self, directory: str, check_interval: float):
+        self.directory = directory
+        self.check_interval = check_interval
+        self._index: Optional[LocalVectorIndex] = None
+        self._loaded: Optional[str] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self._warned_missing = False
+        self.reloads = 0
+
+    def get(self) -> Optional[LocalVectorIndex]:
+        """Current index, or None while no snapshot has been published"""
+        if time.monotonic() < self._next_check:
+            return self._index
+        with self._lock:
+            if time.monotonic() >= self._next_check:
+                self._next_check = time.monotonic() + self.check_interval
+                self._refresh()
+            return self._index
+
+    def _refresh(self) -> None:
+        try:
+            with open(
+                os.path.join(self.directory, CURRENT_FILE), "r", encoding="utf-8"
+            ) as pointer_file:
+                name = pointer_file.read().strip()
+        except FileNotFoundError:
+            if not self._warned_missing:
+                logger.warning(
+                    f"No product snapshot in {self.directory}; searching Weaviate"
+                )
+                self._warned_missing = True
+            return
+        if name == self._loaded:
+            return
+        try:
+            index = LocalVectorIndex(os.path.join(self.directory, name))
+        except Exception as e:
+            logger.warning(f"Could not load product snapshot {name}: {e}")
+            return
+        self._index, self._loaded = index, name
+        self.reloads += 1
+        logger.info(
+            f"Loaded product snapshot {name} ({len(index)} chunks, {index.dimensions} dims)"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        index = self._index
+        return {
+            "backend": config.PRODUCT_SEARCH_BACKEND,
+            "epoch": index.epoch if index else None,
+            "chunks": len(index) if index else 0,
+            "dimensions": index.dimensions if index else 0,
+            "reloads": self.reloads,
+        }
+
+
+def snapshot_directory(tenant: Optional[str] = None) -> str:
+    """Where a tenant's snapshots are published: DEFAULT_TENANT at LOCAL_INDEX_PATH, others below it"""
+    if not tenant or tenant == config.DEFAULT_TENANT:
+        return config.LOCAL_INDEX_PATH
+    return os.path.join(config.LOCAL_INDEX_PATH, "tenants", tenant)
+
+
+local_index = SnapshotIndex(config.LOCAL_INDEX_PATH, config.LOCAL_INDEX_RELOAD_SECONDS)
+
+_tenant_indexes: Dict[str, SnapshotIndex] = {}
+_tenant_indexes_lock = threading.Lock()
+
+
+def tenant_index(tenant: Optional[str] = None) -> SnapshotIndex:
+    """Snapshot of one tenant's catalog; mapped on first use, so idle tenants cost no memory"""
+    if not tenant or tenant == config.DEFAULT_TENANT:
+        return local_index
+    with _tenant_indexes_lock:
+        if tenant not in _tenant_indexes:
+            _tenant_indexes[tenant] = SnapshotIndex(
+                snapshot_directory(tenant), config.LOCAL_INDEX_RELOAD_SECONDS
+            )
+        return _tenant_indexes[tenant]
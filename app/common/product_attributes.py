@@ -0,0 +1,205 @@
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import weaviate.classes.config as wc
+from weaviate.classes.query import Filter
+
+
+class Spec(NamedTuple):
+    unit: str
+    pattern: "re.Pattern[str]"
+    # The line must also mention this, e.g. "battery" for hour figures
+    context: Optional["re.Pattern[str]"] = None
+    scale: Optional[Dict[str, float]] = None
+
+
+NUMBER = r"(\d[\d,]*(?:\.\d+)?)"
+
+# Numeric specs pulled from product text at ingest; the largest figure on a line wins
+SPECS: Dict[str, Spec] = {
+    "power_watts": Spec("W", re.compile(NUMBER + r"\s*(k?)W\b"), scale={"k": 1000.0}),
+    "battery_hours": Spec(
+        "h",
+        re.compile(NUMBER + r"\s*(?:hours?|hrs?)\b", re.I),
+        context=re.compile(r"batter", re.I),
+    ),
+    "max_dpi": Spec("DPI", re.compile(NUMBER + r"\s*DPI\b")),
+    "resolution_k": Spec("K", re.compile(r"\b(\d+)K\b")),
+    "field_of_view_degrees": Spec("°", re.compile(NUMBER + r"\s*°")),
+    "display_inches": Spec("in", re.compile(NUMBER + r"[- ]?inch", re.I)),
+    "layer_resolution_microns": Spec("µm", re.compile(NUMBER + r"\s*microns?\b", re.I)),
+}
+
+# First match wins; the title is checked before the description
+CATEGORIES: List[Tuple[str, List[str]]] = [
+    ("3d_printing", ["3d printer", "printer", "cnc"]),
+    ("vr", ["vr", "headset", "virtual reality"]),
+    ("kitchen", ["coffee", "brew", "kitchen", "blender", "kettle"]),
+    ("lighting", ["led", "lamp", "bulb", "lighting"]),
+    ("peripherals", ["mouse", "keyboard", "gaming", "controller"]),
+    ("power", ["solar", "charger", "power bank", "battery pack"]),
+    ("air_quality", ["purifier", "air quality", "humidifier"]),
+]
+
+
+def _number(text: str) -> float:
+    return float(text.replace(",", ""))
+
+
+def extract_specs(text: str) -> Dict[str, float]:
+    specs: Dict[str, float] = {}
+    for line in text.split("\n"):
+        for name, spec in SPECS.items():
+            if spec.context is not None and not spec.context.search(line):
+                continue
+            for match in spec.pattern.finditer(line):
+                value = _number(match.group(1))
+                if spec.scale and match.lastindex and match.lastindex > 1:
+                    value *= spec.scale.get(match.group(2), 1.0)
+                specs[name] = max(value, specs.get(name, value))
+    return specs
+
+
+def extract_features(features_text: str) -> List[str]:
+    """Feature names from a "- Name: explanation" list"""
+    names = []
+    for line in features_text.split("\n"):
+        line = line.strip().lstrip("-•* ").strip()
+        if line:
+            names.append(line.split(":", 1)[0].strip())
+    return names
+
+
+def categorize(title: str, description: str) -> str:
+    for text in (title, description):
+        lowered = text.lower()
+        for category, keywords in CATEGORIES:
+            if any(
+                re.search(rf"\b{re.escape(keyword)}\b", lowered) for keyword in keywords
+            ):
+                return category
+    return "other"
+
+
+def extract_attributes(title: str, sections: List[Tuple[str, str]]) -> Dict[str, Any]:
+    """Typed, filterable attributes of one product from its (heading, body) sections"""
+    by_heading = {heading.lower(): body for heading, body in sections}
+    return {
+        "category": categorize(title, by_heading.get("description", "")),
+        "features": extract_features(by_heading.get("features", "")),
+        **extract_specs("\n".join(body for _, body in sections)),
+    }
+
+
+def attribute_properties() -> List[wc.Property]:
+    """Collection properties for the attributes; none of them are embedded"""
+    return [
+        wc.Property(
+            name="category",
+            data_type=wc.DataType.TEXT,
+            tokenization=wc.Tokenization.FIELD,
+            skip_vectorization=True,
+        ),
+        wc.Property(
+            name="features", data_type=wc.DataType.TEXT_ARRAY, skip_vectorization=True
+        ),
+    ] + [
+        wc.Property(name=name, data_type=wc.DataType.NUMBER, index_range_filters=True)
+        for name in SPECS
+    ]
+
+
+ATTRIBUTE_NAMES = ["category", "features"] + list(SPECS)
+
+
+def _words(text: str) -> List[str]:
+    return re.findall(r"\w+", text.lower())
+
+
+class AttributeQuery:
+    """
+    Structured product criteria, evaluated by Weaviate filters or, for the local
+    snapshot, in Python with the same meaning: every word of `feature` appears in
+    some feature name, and any of `names` has all its words in the product title.
+    """
+
+    def __init__(
+        self,
+        category: Optional[str] = None,
+        feature: Optional[str] = None,
+        names: Optional[List[str]] = None,
+        spec: Optional[str] = None,
+        min_value: Optional[float] = None,
+        max_value: Optional[float] = None,
+    ):
+        if category is not None and category not in {name for name, _ in CATEGORIES} | {
+            "other"
+        }:
+            raise ValueError(f"Unknown category '{category}'")
+        if spec is not None and spec not in SPECS:
+            raise ValueError(f"Unknown spec '{spec}'; use one of {', '.join(SPECS)}")
+        if spec is None and (min_value is not None or max_value is not None):
+            raise ValueError("min_value and max_value need a spec")
+        self.category = category
+        self.feature_words = _words(feature or "")
+        self.names = [_words(name) for name in names or [] if _words(name)]
+        self.spec = spec
+        self.min_value = min_value
+        self.max_value = max_value
+
+    @property
+    def empty(self) -> bool:
+        return not (self.category or self.feature_words or self.names or self.spec)
+
+    def weaviate_filter(self):
+        filters = []
+        if self.category:
+            filters.append(Filter.by_property("category").equal(self.category))
+        filters.extend(
+            Filter.by_property("features").like(f"*{word}*")
+            for word in self.feature_words
+        )
+        if self.names:
+            filters.append(
+                Filter.any_of(
+                    [
+                        Filter.all_of(
+                            [
+                                Filter.by_property("source").like(f"*{word}*")
+                                for word in words
+                            ]
+                        )
+                        for words in self.names
+                    ]
+                )
+            )
+        if self.min_value is not None:
+            filters.append(
+                Filter.by_property(self.spec).greater_or_equal(self.min_value)
+            )
+        if self.max_value is not None:
+            filters.append(Filter.by_property(self.spec).less_or_equal(self.max_value))
+        if not filters:
+            return None
+        return filters[0] if len(filters) == 1 else Filter.all_of(filters)
+
+    def matches(self, properties: Dict[str, Any]) -> bool:
+        if self.category and properties.get("category") != self.category:
+            return False
+        features = " ".join(properties.get("features") or []).lower()
+        if any(word not in features for word in self.feature_words):
+            return False
+        title = (properties.get("source") or "").lower()
+        if self.names and not any(
+            all(word in title for word in words) for words in self.names
+        ):
+            return False
+        if self.spec:
+            value = properties.get(self.spec)
+            if value is None:
+                return False
+            if self.min_value is not None and value < self.min_value:
+                return False
+            if self.max_value is not None and value > self.max_value:
+                return False
+        return True
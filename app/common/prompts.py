@@ -0,0 +1,16 @@
+from inspect import cleandoc
+from agno.models.message import Message
+
+
+def static_system_message(*sections: str) -> Message:
+    """
+    Build a byte-stable system message from static prompt sections.
+
+    agno sends a `Message` system prompt unchanged (no state formatting, no
+    datetime or memories), so every request starts with the same bytes followed
+    by the tool and response schemas, which is what the provider's automatic
+    prompt caching keys on. Request-specific content (compacted history, team
+    context, the user message) always comes after it.
+    """
+    content = "\n\n".join(cleandoc(section) for section in sections if section.strip())
+    return Message(role="system", content=content)
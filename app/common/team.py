@@ -0,0 +1,43 @@
+from typing import Any, Optional
+
+from agno.models.message import Message
+from agno.run.messages import RunMessages
+from agno.run.team import TeamRunResponse
+from agno.team.team import Team
+from app.services.history_compactor import HistoryCompactor
+
+
+class OrchestratorTeam(Team):
+    """
+    Team that sends a compacted digest of earlier runs instead of replaying them in full.
+
+    Message layout is static system prompt first, then the compacted history, then
+    the user message, so the cacheable prefix never shifts between requests.
+    """
+
+    def __init__(
+        self, *args: Any, history_compactor: Optional[HistoryCompactor] = None, **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.history_compactor = history_compactor
+
+    def get_run_messages(self, *, session_id: str, **kwargs: Any) -> RunMessages:
+        run_messages = super().get_run_messages(session_id=session_id, **kwargs)
+        if self.history_compactor is None or self.memory is None:
+            return run_messages
+
+        # Every team run of the session, whichever pooled Team or process wrote it
+        runs = [
+            run
+            for run in self.memory.get_runs(session_id)
+            if isinstance(run, TeamRunResponse)
+        ]
+        compacted = self.history_compactor.compact(session_id, runs)
+        if compacted:
+            history_message = Message(role="user", content=compacted, from_history=True)
+            # History goes right before the current user message
+            position = len(run_messages.messages)
+            if run_messages.user_message is not None:
+                position = run_messages.messages.index(run_messages.user_message)
+            run_messages.messages.insert(position, history_message)
+        return run_messages
@@ -1,32 +1,237 @@
+import dataclasses
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
 import weaviate
+import weaviate.classes.config as wc
+from agno.embedder.base import Embedder
 from agno.vectordb.weaviate import Weaviate, Distance, VectorIndex
 from agno.vectordb.search import SearchType
 from agno.agent import AgentKnowledge
 from app.config import config
 from app.common.constants import HeaderType
 from agno.embedder.openai import OpenAIEmbedder
+from app.common.llm_models import get_openai_client
 
 embedder = OpenAIEmbedder(
     id="text-embedding-3-small",  # note: model_name, not model
     api_key=config.OPENAI_API_KEY,
+    openai_client=get_openai_client(),  # shared keep-alive HTTP client
+    dimensions=config.EMBEDDING_DIMENSIONS,  # must match the product collection
+)
+
+# Bytes of the original vector per PQ segment; 1536 dims -> 384 one-byte codes
+PQ_DIMENSIONS_PER_SEGMENT = 4
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatchingEmbedder(Embedder):
+    """
+    Coalesces concurrent embedding requests into batched OpenAI calls.
+
+    Callers block on get_embedding() while a worker thread collects requests for
+    up to `max_wait_ms` (or until `max_batch_size` inputs are queued) and sends
+    them as one embeddings call. Identical texts within a batch are embedded once.
+    Up to `max_in_flight` batches are sent at once, each limited to `timeout`
+    seconds, so one slow call does not hold up every other query embedding.
+    """
+
+    def __init__(
+        self,
+        embedder: OpenAIEmbedder,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        max_in_flight: int = 4,
+        timeout: Optional[float] = None,
+    ):
+        super().__init__(dimensions=embedder.dimensions)
+        if timeout:
+            embedder = dataclasses.replace(
+                embedder,
+                request_params={**(embedder.request_params or {}), "timeout": timeout},
+            )
+        self.embedder = embedder
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        # Taken before a batch is sent; while every sender is busy the next batch keeps filling
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+        self._sender = ThreadPoolExecutor(
+            max_workers=max_in_flight, thread_name_prefix="embedding-batch"
+        )
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.calls = 0
+        self.inputs = 0
+        self.errors = 0
+        self.batch_sizes: Counter = Counter()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None:
+            with self._worker_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(
+                        target=self._run, name="embedding-batcher", daemon=True
+                    )
+                    self._worker.start()
+
+    def submit(self, text: str) -> Future:
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def get_embedding(self, text: str) -> List[float]:
+        return self.submit(text).result()
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        # Usage is reported per batch, not per input
+        return self.get_embedding(text), None
+
+    def _collect(self) -> List[Tuple[str, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            self._in_flight.acquire()
+            self._sender.submit(self._send, self._collect())
+
+    def _send(self, batch: List[Tuple[str, Future]]) -> None:
+        unique_texts = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            response = self.embedder.response(text=unique_texts)
+            vectors = {
+                unique_texts[item.index]: item.embedding for item in response.data
+            }
+            for text, future in batch:
+                future.set_result(vectors[text])
+        except Exception as e:
+            logger.warning(f"Batched embedding call failed: {e}")
+            with self._stats_lock:
+                self.errors += 1
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._in_flight.release()
+        with self._stats_lock:
+            self.calls += 1
+            self.inputs += len(batch)
+            self.batch_sizes[len(batch)] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait_ms,
+                "max_in_flight": self.max_in_flight,
+                "calls": self.calls,
+                "inputs": self.inputs,
+                "errors": self.errors,
+                "mean_fan_in": (
+                    round(self.inputs / self.calls, 2) if self.calls else 0.0
+                ),
+                "max_fan_in": max(self.batch_sizes, default=0),
+                "fan_in_histogram": dict(sorted(self.batch_sizes.items())),
+            }
+
+
+batching_embedder = MicroBatchingEmbedder(
+    embedder,
+    max_batch_size=config.EMBED_BATCH_MAX_SIZE,
+    max_wait_ms=config.EMBED_BATCH_WAIT_MS,
+    max_in_flight=config.EMBED_BATCH_MAX_IN_FLIGHT,
+    timeout=config.EMBED_BATCH_TIMEOUT_SECONDS,
 )
 
 # Weaviate client (reused)
 _weaviate_client = None
+_weaviate_lock = threading.Lock()
 
 
 def get_weaviate_client():
+    """Process-wide Weaviate client, connected on first use and kept open until shutdown"""
     global _weaviate_client
     if _weaviate_client is None:
-        _weaviate_client = weaviate.connect_to_custom(
-            http_host=config.WEAVIATE_HTTP_HOST,
-            http_port=config.WEAVIATE_HTTP_PORT,
-            http_secure=False,
-            grpc_host=config.WEAVIATE_GRPC_HOST,
-            grpc_port=config.WEAVIATE_GRPC_PORT,
-            grpc_secure=False,
-            headers={HeaderType.X_OPEN_API_KEY.value: config.OPENAI_API_KEY},
+        with _weaviate_lock:
+            if _weaviate_client is None:
+                _weaviate_client = config.weaviate_client
+    return _weaviate_client
+
+
+def close_weaviate_client() -> None:
+    global _weaviate_client
+    with _weaviate_lock:
+        if _weaviate_client is not None:
+            _weaviate_client.close()
+            _weaviate_client = None
+
+
+def product_vectorizer_config(
+    dimensions: Optional[int] = None, base_url: Optional[str] = None
+):
+    return wc.Configure.Vectorizer.text2vec_openai(
+        model="text-embedding-3-small",
+        dimensions=dimensions or config.EMBEDDING_DIMENSIONS,
+        base_url=base_url,
+    )
+
+
+def product_vector_index_config(
+    dimensions: Optional[int] = None,
+    quantization: Optional[str] = None,
+    ef: Optional[int] = None,
+    ef_construction: Optional[int] = None,
+    max_connections: Optional[int] = None,
+    training_limit: Optional[int] = None,
+):
+    """HNSW settings for product collections; unset arguments come from the HNSW_*/VECTOR_* settings"""
+    dimensions = dimensions or config.EMBEDDING_DIMENSIONS
+    quantization = quantization or config.VECTOR_QUANTIZATION
+    training_limit = training_limit or config.QUANTIZATION_TRAINING_LIMIT
+    if quantization == "pq":
+        # PQ and SQ compress once `training_limit` objects exist; until then vectors stay uncompressed
+        quantizer = wc.Configure.VectorIndex.Quantizer.pq(
+            segments=max(1, dimensions // PQ_DIMENSIONS_PER_SEGMENT),
+            training_limit=training_limit,
         )
+    elif quantization == "sq":
+        quantizer = wc.Configure.VectorIndex.Quantizer.sq(training_limit=training_limit)
+    elif quantization == "bq":
+        quantizer = wc.Configure.VectorIndex.Quantizer.bq()
+    elif quantization == "none":
+        quantizer = None
+    else:
+        raise ValueError(
+            f"Unknown vector quantization '{quantization}' (none, pq, bq or sq)"
+        )
+
+    return wc.Configure.VectorIndex.hnsw(
+        distance_metric=wc.VectorDistances.COSINE,
+        ef=ef if ef is not None else config.HNSW_EF,
+        ef_construction=ef_construction or config.HNSW_EF_CONSTRUCTION,
+        max_connections=max_connections or config.HNSW_MAX_CONNECTIONS,
+        quantizer=quantizer,
+    )
 
 
 def create_vector_db(collection_name):
@@ -36,7 +241,7 @@ def create_vector_db(collection_name):
         vector_index=VectorIndex.HNSW,
         distance=Distance.COSINE,
         local=True,
-        embedder=embedder,
+        embedder=batching_embedder,
     )
 
 
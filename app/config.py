@@ -1,6 +1,6 @@
 import weaviate
 from functools import lru_cache
-from typing import ClassVar
+from typing import ClassVar, Optional
 from pathlib import Path
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -41,6 +41,241 @@ class Configs(BaseSettings):
 
     AGNO_API_KEY: str = Field(..., json_schema_extra={"env": "AGNO_API_KEY"})
 
+    HISTORY_TOKEN_BUDGET: int = Field(
+        default=1200, json_schema_extra={"env": "HISTORY_TOKEN_BUDGET"}
+    )
+    HISTORY_DIGEST_CHARS: int = Field(
+        default=400, json_schema_extra={"env": "HISTORY_DIGEST_CHARS"}
+    )
+
+    CAMPAIGN_CONCURRENCY: int = Field(
+        default=8, json_schema_extra={"env": "CAMPAIGN_CONCURRENCY"}
+    )
+    CAMPAIGN_MAX_ATTEMPTS: int = Field(
+        default=3, json_schema_extra={"env": "CAMPAIGN_MAX_ATTEMPTS"}
+    )
+    CAMPAIGN_MAX_RECIPIENTS: int = Field(
+        default=1000, json_schema_extra={"env": "CAMPAIGN_MAX_RECIPIENTS"}
+    )
+
+    ENTITY_CACHE_MAX_ENTRIES: int = Field(
+        default=2048, json_schema_extra={"env": "ENTITY_CACHE_MAX_ENTRIES"}
+    )
+
+    AGNO_MONITORING: bool = Field(
+        default=False, json_schema_extra={"env": "AGNO_MONITORING"}
+    )
+    OPENAI_BASE_URL: Optional[str] = Field(
+        default=None, json_schema_extra={"env": "OPENAI_BASE_URL"}
+    )
+    OPENAI_HTTP2: bool = Field(default=True, json_schema_extra={"env": "OPENAI_HTTP2"})
+    OPENAI_MAX_CONNECTIONS: int = Field(
+        default=100, json_schema_extra={"env": "OPENAI_MAX_CONNECTIONS"}
+    )
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = Field(
+        default=20, json_schema_extra={"env": "OPENAI_MAX_KEEPALIVE_CONNECTIONS"}
+    )
+    OPENAI_KEEPALIVE_EXPIRY: float = Field(
+        default=60.0, json_schema_extra={"env": "OPENAI_KEEPALIVE_EXPIRY"}
+    )
+    OPENAI_CONNECT_TIMEOUT: float = Field(
+        default=5.0, json_schema_extra={"env": "OPENAI_CONNECT_TIMEOUT"}
+    )
+    OPENAI_READ_TIMEOUT: float = Field(
+        default=120.0, json_schema_extra={"env": "OPENAI_READ_TIMEOUT"}
+    )
+
+    QUERY_EMBEDDING_BATCHING: bool = Field(
+        default=True, json_schema_extra={"env": "QUERY_EMBEDDING_BATCHING"}
+    )
+    EMBED_BATCH_MAX_SIZE: int = Field(
+        default=64, json_schema_extra={"env": "EMBED_BATCH_MAX_SIZE"}
+    )
+    EMBED_BATCH_WAIT_MS: float = Field(
+        default=5.0, json_schema_extra={"env": "EMBED_BATCH_WAIT_MS"}
+    )
+    EMBED_BATCH_MAX_IN_FLIGHT: int = Field(
+        default=4, json_schema_extra={"env": "EMBED_BATCH_MAX_IN_FLIGHT"}
+    )
+    EMBED_BATCH_TIMEOUT_SECONDS: float = Field(
+        default=10.0, json_schema_extra={"env": "EMBED_BATCH_TIMEOUT_SECONDS"}
+    )
+
+    SPECULATIVE_SEARCH: bool = Field(
+        default=True, json_schema_extra={"env": "SPECULATIVE_SEARCH"}
+    )
+    SPECULATION_MIN_SIMILARITY: float = Field(
+        default=0.6, json_schema_extra={"env": "SPECULATION_MIN_SIMILARITY"}
+    )
+    SPECULATION_WAIT_SECONDS: float = Field(
+        default=10.0, json_schema_extra={"env": "SPECULATION_WAIT_SECONDS"}
+    )
+    SPECULATION_WORKERS: int = Field(
+        default=8, json_schema_extra={"env": "SPECULATION_WORKERS"}
+    )
+
+    ADMISSION_MAX_IN_FLIGHT: int = Field(
+        default=4, json_schema_extra={"env": "ADMISSION_MAX_IN_FLIGHT"}
+    )
+    ADMISSION_PER_USER_LIMIT: int = Field(
+        default=2, json_schema_extra={"env": "ADMISSION_PER_USER_LIMIT"}
+    )
+    ADMISSION_MAX_QUEUE: int = Field(
+        default=64, json_schema_extra={"env": "ADMISSION_MAX_QUEUE"}
+    )
+    ADMISSION_PER_USER_QUEUE: int = Field(
+        default=4, json_schema_extra={"env": "ADMISSION_PER_USER_QUEUE"}
+    )
+    ADMISSION_QUEUE_TIMEOUT: float = Field(
+        default=30.0, json_schema_extra={"env": "ADMISSION_QUEUE_TIMEOUT"}
+    )
+    REQUEST_TIMEOUT_SECONDS: float = Field(
+        default=60.0, json_schema_extra={"env": "REQUEST_TIMEOUT_SECONDS"}
+    )
+    REQUEST_TIMEOUT_MAX_SECONDS: float = Field(
+        default=300.0, json_schema_extra={"env": "REQUEST_TIMEOUT_MAX_SECONDS"}
+    )
+    MODEL_CALL_TIMEOUT_SECONDS: float = Field(
+        default=30.0, json_schema_extra={"env": "MODEL_CALL_TIMEOUT_SECONDS"}
+    )
+    MEMBER_TIMEOUT_SECONDS: float = Field(
+        default=45.0, json_schema_extra={"env": "MEMBER_TIMEOUT_SECONDS"}
+    )
+    SEARCH_TIMEOUT_SECONDS: float = Field(
+        default=10.0, json_schema_extra={"env": "SEARCH_TIMEOUT_SECONDS"}
+    )
+    SEARCH_WORKERS: int = Field(default=8, json_schema_extra={"env": "SEARCH_WORKERS"})
+    SQL_TIMEOUT_SECONDS: float = Field(
+        default=10.0, json_schema_extra={"env": "SQL_TIMEOUT_SECONDS"}
+    )
+    DISCONNECT_POLL_SECONDS: float = Field(
+        default=0.5, json_schema_extra={"env": "DISCONNECT_POLL_SECONDS"}
+    )
+    LLM_MAX_ATTEMPTS: int = Field(
+        default=3, json_schema_extra={"env": "LLM_MAX_ATTEMPTS"}
+    )
+    LLM_RETRY_BASE_DELAY: float = Field(
+        default=0.5, json_schema_extra={"env": "LLM_RETRY_BASE_DELAY"}
+    )
+    LLM_RETRY_MAX_DELAY: float = Field(
+        default=8.0, json_schema_extra={"env": "LLM_RETRY_MAX_DELAY"}
+    )
+    LLM_HEDGING: bool = Field(default=False, json_schema_extra={"env": "LLM_HEDGING"})
+    HEDGE_PERCENTILE: float = Field(
+        default=0.95, json_schema_extra={"env": "HEDGE_PERCENTILE"}
+    )
+    HEDGE_WINDOW: int = Field(default=200, json_schema_extra={"env": "HEDGE_WINDOW"})
+    HEDGE_MIN_SAMPLES: int = Field(
+        default=20, json_schema_extra={"env": "HEDGE_MIN_SAMPLES"}
+    )
+    HEDGE_INITIAL_DELAY_SECONDS: float = Field(
+        default=8.0, json_schema_extra={"env": "HEDGE_INITIAL_DELAY_SECONDS"}
+    )
+    HEDGE_MIN_DELAY_SECONDS: float = Field(
+        default=1.0, json_schema_extra={"env": "HEDGE_MIN_DELAY_SECONDS"}
+    )
+    HEDGE_MAX_IN_FLIGHT: int = Field(
+        default=4, json_schema_extra={"env": "HEDGE_MAX_IN_FLIGHT"}
+    )
+    TRACE_EXPORT: str = Field(default="none", json_schema_extra={"env": "TRACE_EXPORT"})
+    TRACE_SAMPLE_RATE: float = Field(
+        default=1.0, json_schema_extra={"env": "TRACE_SAMPLE_RATE"}
+    )
+    TRACE_FILE: str = Field(
+        default="logs/traces.jsonl", json_schema_extra={"env": "TRACE_FILE"}
+    )
+    TRACE_OTLP_ENDPOINT: str = Field(
+        default="http://localhost:4318/v1/traces",
+        json_schema_extra={"env": "TRACE_OTLP_ENDPOINT"},
+    )
+    TRACE_SERVICE_NAME: str = Field(
+        default="sales-assistant", json_schema_extra={"env": "TRACE_SERVICE_NAME"}
+    )
+    PROFILING_ENABLED: bool = Field(
+        default=False, json_schema_extra={"env": "PROFILING_ENABLED"}
+    )
+    PROFILING_TOKEN: str = Field(
+        default="", json_schema_extra={"env": "PROFILING_TOKEN"}
+    )
+    PROFILE_DIR: str = Field(
+        default="logs/profiles", json_schema_extra={"env": "PROFILE_DIR"}
+    )
+    PROFILE_INTERVAL_MS: float = Field(
+        default=5.0, json_schema_extra={"env": "PROFILE_INTERVAL_MS"}
+    )
+    PRODUCT_SEARCH_BACKEND: str = Field(
+        default="weaviate", json_schema_extra={"env": "PRODUCT_SEARCH_BACKEND"}
+    )
+    LOCAL_INDEX_PATH: str = Field(
+        default="data/product_index", json_schema_extra={"env": "LOCAL_INDEX_PATH"}
+    )
+    LOCAL_INDEX_RELOAD_SECONDS: float = Field(
+        default=5.0, json_schema_extra={"env": "LOCAL_INDEX_RELOAD_SECONDS"}
+    )
+    EMBEDDING_DIMENSIONS: int = Field(
+        default=1536, json_schema_extra={"env": "EMBEDDING_DIMENSIONS"}
+    )
+    VECTOR_QUANTIZATION: str = Field(
+        default="none", json_schema_extra={"env": "VECTOR_QUANTIZATION"}
+    )
+    QUANTIZATION_TRAINING_LIMIT: int = Field(
+        default=100000, json_schema_extra={"env": "QUANTIZATION_TRAINING_LIMIT"}
+    )
+    HNSW_EF: int = Field(default=-1, json_schema_extra={"env": "HNSW_EF"})
+    HNSW_EF_CONSTRUCTION: int = Field(
+        default=128, json_schema_extra={"env": "HNSW_EF_CONSTRUCTION"}
+    )
+    HNSW_MAX_CONNECTIONS: int = Field(
+        default=32, json_schema_extra={"env": "HNSW_MAX_CONNECTIONS"}
+    )
+    PRODUCT_COLLECTION: str = Field(
+        default="Product_collection_demo",
+        json_schema_extra={"env": "PRODUCT_COLLECTION"},
+    )
+    DEFAULT_TENANT: str = Field(
+        default="default", json_schema_extra={"env": "DEFAULT_TENANT"}
+    )
+    TENANT_IDLE_SECONDS: float = Field(
+        default=900.0, json_schema_extra={"env": "TENANT_IDLE_SECONDS"}
+    )
+    TENANT_IDLE_STATUS: str = Field(
+        default="inactive", json_schema_extra={"env": "TENANT_IDLE_STATUS"}
+    )
+    TENANT_SWEEP_SECONDS: float = Field(
+        default=60.0, json_schema_extra={"env": "TENANT_SWEEP_SECONDS"}
+    )
+    TENANT_ACTIVATION_TIMEOUT_SECONDS: float = Field(
+        default=10.0, json_schema_extra={"env": "TENANT_ACTIVATION_TIMEOUT_SECONDS"}
+    )
+    LOOP_LAG_INTERVAL_MS: float = Field(
+        default=100.0, json_schema_extra={"env": "LOOP_LAG_INTERVAL_MS"}
+    )
+    AGENT_STARTUP: str = Field(
+        default="eager", json_schema_extra={"env": "AGENT_STARTUP"}
+    )
+    WARMUP_STEPS: str = Field(
+        default="database,openai,caches,retrieval",
+        json_schema_extra={"env": "WARMUP_STEPS"},
+    )
+    WARMUP_TIMEOUT_SECONDS: float = Field(
+        default=60.0, json_schema_extra={"env": "WARMUP_TIMEOUT_SECONDS"}
+    )
+    WARMUP_TOP_QUERIES: int = Field(
+        default=20, json_schema_extra={"env": "WARMUP_TOP_QUERIES"}
+    )
+    WARMUP_HISTORY_DAYS: float = Field(
+        default=3.0, json_schema_extra={"env": "WARMUP_HISTORY_DAYS"}
+    )
+    WARMUP_DB_CONNECTIONS: int = Field(
+        default=5, json_schema_extra={"env": "WARMUP_DB_CONNECTIONS"}
+    )
+    WARMUP_OPENAI_CONNECTIONS: int = Field(
+        default=4, json_schema_extra={"env": "WARMUP_OPENAI_CONNECTIONS"}
+    )
+    WARMUP_PROBE_QUERY: str = Field(
+        default="product features", json_schema_extra={"env": "WARMUP_PROBE_QUERY"}
+    )
+
     @property
     def database_url(self) -> str:
         return (
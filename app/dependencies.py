@@ -1,15 +1,14 @@
-from app.agents.sales_assistants.orchestrator_agent import orchestrator_agent
+import asyncio
 
-_orchestrator = None
+from app.agents.registry import registry
 
 
-def initialize_orchestrator():
-    global _orchestrator
-    _orchestrator = orchestrator_agent
-    return _orchestrator
+def _build_orchestrator() -> None:
+    with registry.lease("orchestrator"):
+        pass
 
 
-def get_orchestrator():
-    if _orchestrator is None:
-        raise Exception("Orchestrator not initialized")
-    return _orchestrator
+async def ensure_orchestrator() -> None:
+    """Build a first orchestrator Team, off the event loop, if there is none yet"""
+    if not registry.is_built("orchestrator"):
+        await asyncio.to_thread(_build_orchestrator)
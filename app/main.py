@@ -1,23 +1,64 @@
+import time
+
+_import_started = time.perf_counter()
+
 import logging
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from contextlib import asynccontextmanager
 from app.routes.query import query_router
-from app.dependencies import initialize_orchestrator
+from app.routes.campaign import campaign_router
+from app.agents.registry import registry
+from app.config import config
+from app.services.entity_cache import entity_cache, missing_triggers
+from app.common.http_clients import close_http_clients, connection_stats
+from app.common.vector_database import batching_embedder, close_weaviate_client
+from app.services.speculation import speculation_stats
+from app.services.coalescing import coalescing_stats
+from app.services.admission import admission
+from app.common.hedging import llm_calls
+from app.services.metrics import MetricsMiddleware, render_metrics
+from app.services.tracing import exporter
+from app.services.loop_monitor import loop_monitor
+from app.common.local_vector_index import local_index
+from app.services.tenants import tenant_catalogs
+from app.services.warmup import warmup
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+registry.record("imports", time.perf_counter() - _import_started)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     try:
         logger.info("initializing....")
-        initialize_orchestrator()
+        # Triggers are installed by scripts.install_entity_triggers; the cache stays off without them
+        try:
+            missing = missing_triggers()
+        except Exception as e:
+            missing = [f"unknown ({e})"]
+        if missing:
+            logger.error(
+                f"Entity cache disabled, NOTIFY triggers missing: {', '.join(missing)}"
+            )
+        else:
+            entity_cache.start()
+        loop_monitor.start()
+        tenant_catalogs.start()
+        # Builds the agents when AGENT_STARTUP=eager; /health is not ready until it is done
+        warmup.start()
         yield
     except Exception as e:
         logger.error(f"❌ Failed to initialize Sales Assistant: {e}")
         raise
     finally:
+        warmup.stop()
+        tenant_catalogs.stop()
+        close_weaviate_client()
+        await loop_monitor.stop()
+        entity_cache.stop()
+        await close_http_clients()
         logger.info("🔄 Shutting down Sales Assistant...")
 
 
@@ -28,7 +69,9 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+app.add_middleware(MetricsMiddleware)
 app.include_router(query_router)
+app.include_router(campaign_router)
 
 
 @app.get("/")
@@ -37,19 +80,40 @@ async def root():
     return {"message": "Sales Assistant API is running", "status": "healthy"}
 
 
-@app.get("/health")
-async def health():
-    """Detailed health check"""
-    from app.dependencies import get_orchestrator
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
 
-    try:
-        orchestrator = get_orchestrator()
-        return {
-            "status": "healthy",
-            "orchestrator_ready": True,
-        }
-    except Exception as e:
+
+@app.get("/health")
+async def health(response: Response):
+    """Detailed health check; 503 until warm-up is done, so load balancers skip cold workers"""
+    # Lazy workers build the orchestrator on the first query, so they are healthy before it
+    orchestrator_ready = registry.is_built("orchestrator")
+    if not warmup.ready or (not orchestrator_ready and config.AGENT_STARTUP == "eager"):
+        response.status_code = 503
         return {
-            "status": "unhealthy",
-            "orchestrator_ready": False,
+            "status": "warming_up" if not warmup.ready else "unhealthy",
+            "orchestrator_ready": orchestrator_ready,
+            "warmup": warmup.stats(),
+            "startup": registry.stats(),
         }
+    return {
+        "status": "healthy",
+        "orchestrator_ready": orchestrator_ready,
+        "warmup": warmup.stats(),
+        "startup": registry.stats(),
+        "entity_cache": entity_cache.stats(),
+        "openai_http": connection_stats(),
+        "embedding_batches": batching_embedder.stats(),
+        "speculative_search": speculation_stats.snapshot(),
+        "coalescing": coalescing_stats(),
+        "admission": admission.stats(),
+        "llm_calls": llm_calls.stats(),
+        "tracing": exporter.stats(),
+        "event_loop": loop_monitor.stats(),
+        "product_index": local_index.stats(),
+        "catalog_tenants": tenant_catalogs.stats(),
+    }
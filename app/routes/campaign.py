@@ -0,0 +1,78 @@
+import asyncio
+import logging
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from app.config import config
+from app.schemas.requests.campaign import CampaignRequest
+from app.services.admission import AdmissionRejected, Priority, Ticket, admission
+from app.services.campaign import (
+    ProductNotFound,
+    load_product,
+    load_recipients,
+    run_campaign,
+)
+
+logger = logging.getLogger(__name__)
+
+campaign_router = APIRouter()
+
+
+class TicketedStreamingResponse(StreamingResponse):
+    """
+    Hands the admission ticket back however the response ends. A generator's own
+    finally never runs if the client disconnects before the first chunk, and
+    Starlette skips background tasks on a disconnect.
+    """
+
+    def __init__(self, content, ticket: Ticket, **kwargs):
+        super().__init__(content, **kwargs)
+        self.ticket = ticket
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            admission.release(self.ticket)
+
+
+@campaign_router.post("/campaign")
+async def create_campaign(request: CampaignRequest):
+    """Draft one promotional email per recipient, streamed back as NDJSON"""
+    try:
+        # Product content and recipients are fetched once for the whole campaign
+        product_info, recipients = await asyncio.gather(
+            asyncio.to_thread(load_product, request.product),
+            asyncio.to_thread(
+                load_recipients,
+                request.person_ids,
+                request.organization_filter,
+                config.CAMPAIGN_MAX_RECIPIENTS,
+            ),
+        )
+    except ProductNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error preparing campaign: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail=f"Error preparing campaign: {str(e)}"
+        )
+
+    if not recipients:
+        raise HTTPException(status_code=404, detail="No recipients matched the request")
+
+    # A campaign holds one batch-priority slot until its stream ends
+    try:
+        ticket = await admission.acquire(request.user_id, Priority.BATCH)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.detail,
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+    return TicketedStreamingResponse(
+        run_campaign(request, product_info, recipients),
+        ticket,
+        media_type="application/x-ndjson",
+        headers={"X-Queue-Time-Ms": f"{ticket.queue_time * 1000:.0f}"},
+    )
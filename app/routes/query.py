@@ -1,9 +1,24 @@
 import logging
 import asyncio
-from fastapi import APIRouter, HTTPException
-from app.schemas.requests.query import QueryRequest, QueryResponse
-from app.dependencies import get_orchestrator
-
+import time
+from contextlib import ExitStack
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, Header, HTTPException, Request, Response
+from pydantic import BaseModel
+from app.config import config
+from app.schemas.requests.query import QueryRequest, QueryResponse, RequestTiming
+from app.agents.registry import registry
+from app.dependencies import ensure_orchestrator
+from app.services.usage import collect_usage
+from app.services.speculation import speculative_search
+from app.services.coalescing import normalize_text, query_flight
+from app.services.admission import AdmissionRejected, Priority, admission
+from app.services.deadlines import Deadline, DeadlineExceeded, deadline_scope
+from app.services.metrics import time_agent_run
+from app.services.profiling import profile_request, profiling_requested
+from app.services.tenants import tenant_scope
+from app.services.tracing import set_span_attributes, span, start_trace
+from app.agents.sales_assistants.custom_tools.search import search_products
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -11,26 +26,191 @@ logger = logging.getLogger(__name__)
 query_router = APIRouter()
 
 
+def run_team(
+    request: QueryRequest, deadline: Deadline, waits: Optional[Dict[str, float]] = None
+):
+    # Model calls, member delegations and tools below all check this deadline;
+    # product searches, including the speculative one, read the tenant's catalog
+    with deadline_scope(deadline), tenant_scope(request.tenant):
+        # Start the product search on the raw query while the coordinator decides
+        with speculative_search(request.query, search_products), ExitStack() as stack:
+            # A Team holds per-run state, so each run leases its own from the pool
+            lease_started = time.monotonic()
+            try:
+                orchestrator_agent = stack.enter_context(
+                    registry.lease("orchestrator", timeout=deadline.remaining())
+                )
+            except TimeoutError:
+                raise DeadlineExceeded(
+                    "team run", "No orchestrator Team free before the deadline"
+                )
+            finally:
+                if waits is not None:
+                    waits["team"] = time.monotonic() - lease_started
+            with time_agent_run(orchestrator_agent.name):
+                deadline.check("team run")
+                try:
+                    return orchestrator_agent.run(
+                        request.query,
+                        user_id=request.user_id,
+                        session_id=request.session_id,
+                    )
+                except DeadlineExceeded as e:
+                    # Keep what the finished members produced for a partial answer
+                    e.run_response = orchestrator_agent.run_response
+                    raise
+
+
+def _content_text(content: Any) -> str:
+    if isinstance(content, BaseModel):
+        return content.model_dump_json(indent=2)
+    return str(content).strip()
+
+
+def partial_response(request: QueryRequest, e: DeadlineExceeded) -> QueryResponse:
+    """Answer from the members that finished before the deadline, or 504 if none did"""
+    run_response = getattr(e, "run_response", None)
+    finished = [
+        member
+        for member in (getattr(run_response, "member_responses", None) or [])
+        if member.content
+    ]
+    if not finished:
+        raise HTTPException(status_code=504, detail=str(e))
+
+    names = [getattr(member, "agent_name", None) or "member" for member in finished]
+    sections = [
+        f"## {name}\n{_content_text(member.content)}"
+        for name, member in zip(names, finished)
+    ]
+    return QueryResponse(
+        success=True,
+        content="\n\n".join(sections),
+        user_id=request.user_id,
+        session_id=request.session_id,
+        error=str(e),
+        usage=collect_usage(run_response),
+        partial=True,
+        completed_members=names,
+    )
+
+
+async def wait_unless_disconnected(http_request: Request, task: asyncio.Future) -> Any:
+    """Await `task`, cancelling it if the client goes away first"""
+    while True:
+        done, _ = await asyncio.wait({task}, timeout=config.DISCONNECT_POLL_SECONDS)
+        if done:
+            return task.result()
+        if await http_request.is_disconnected():
+            task.cancel()
+            logger.info("Client disconnected, cancelling query")
+            raise HTTPException(status_code=499, detail="Client closed request")
+
+
 @query_router.post("/query", response_model=QueryResponse)
-async def process_query(request: QueryRequest):
+async def process_query(
+    request: QueryRequest,
+    http_request: Request,
+    response: Response,
+    x_request_priority: Optional[str] = Header(default=None),
+    x_request_timeout: Optional[str] = Header(default=None),
+    x_profile: Optional[str] = Header(default=None),
+):
+    # The deadline covers queueing as well as the run itself
+    deadline = Deadline.from_header(x_request_timeout)
     try:
-        orchestrator_agent = get_orchestrator()
+        await ensure_orchestrator()
     except Exception:
         raise HTTPException(status_code=503, detail="Sales Assistant not initialized")
 
+    priority = Priority.from_header(x_request_priority)
+    # Identical concurrent requests in the same user/session/tenant scope share one run
+    key = (
+        normalize_text(request.query),
+        request.user_id,
+        request.session_id,
+        request.tenant,
+    )
+    with start_trace(
+        "POST /query",
+        profiled=profiling_requested(x_profile),
+        **{
+            "user.id": request.user_id,
+            "session.id": request.session_id,
+            "tenant": request.tenant or config.DEFAULT_TENANT,
+        },
+    ) as root:
+        with profile_request(root) as profiler:
+            query_response = await wait_unless_disconnected(
+                http_request,
+                asyncio.ensure_future(
+                    query_flight.do(
+                        key,
+                        lambda: execute_query(request, priority, deadline),
+                    )
+                ),
+            )
+        if root is not None:
+            response.headers["X-Trace-Id"] = root.trace.trace_id
+        if profiler is not None and profiler.path:
+            response.headers["X-Profile-File"] = profiler.path
+    if query_response.timing is not None:
+        response.headers["X-Queue-Time-Ms"] = f"{query_response.timing.queue_ms:.0f}"
+        response.headers["X-Run-Time-Ms"] = f"{query_response.timing.run_ms:.0f}"
+    return query_response
+
+
+async def execute_query(
+    request: QueryRequest, priority: Priority, deadline: Deadline
+) -> QueryResponse:
+    """
+    Wait for an admission slot, then run the team; queue and run time are reported
+    separately. Waiting for (or building) a pooled Team counts as queue time.
+    """
+    waits: Dict[str, float] = {"team": 0.0}
     try:
-        team_response = orchestrator_agent.run(
-            request.query, user_id=request.user_id, session_id=request.session_id
+        async with admission.admit(
+            request.user_id, priority, timeout=deadline.remaining()
+        ) as ticket:
+            started = time.monotonic()
+            with span("query.execute", priority=priority.name.lower()):
+                query_response = await run_query(request, deadline, waits)
+                set_span_attributes(
+                    queue_ms=round(ticket.queue_time * 1000, 1),
+                    team_wait_ms=round(waits["team"] * 1000, 1),
+                )
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.detail,
+            headers={"Retry-After": str(e.retry_after)},
         )
 
+    query_response.timing = RequestTiming(
+        queue_ms=(ticket.queue_time + waits["team"]) * 1000,
+        run_ms=(time.monotonic() - started - waits["team"]) * 1000,
+    )
+    return query_response
+
+
+async def run_query(
+    request: QueryRequest, deadline: Deadline, waits: Optional[Dict[str, float]] = None
+) -> QueryResponse:
+    try:
+        try:
+            team_response = await asyncio.to_thread(run_team, request, deadline, waits)
+        except asyncio.CancelledError:
+            # The worker thread cannot be interrupted; it stops at its next checkpoint
+            deadline.cancel("Client disconnected")
+            raise
+        usage = collect_usage(team_response)
+
         # Extract the actual orchestrator response from the team response
         # The team response should contain your OrchestratorResponse in the content
         if hasattr(team_response, "content") and team_response.content:
             # If content is your OrchestratorResponse object
             orchestrator_response = team_response.content
-            print("=" * 50)
-            print(orchestrator_response)
-            print("=" * 50)
+            logger.debug(f"Orchestrator response: {orchestrator_response}")
 
             return QueryResponse(
                 success=True,
@@ -39,6 +219,7 @@ async def process_query(request: QueryRequest):
                 session_id=request.session_id,
                 error=None,
                 orchestrator_response=orchestrator_response,
+                usage=usage,
             )
         else:
             # Fallback: use the team response message as content
@@ -51,8 +232,12 @@ async def process_query(request: QueryRequest):
                 session_id=request.session_id,
                 error=None,
                 orchestrator_response=None,
+                usage=usage,
             )
 
+    except DeadlineExceeded as e:
+        logger.warning(f"Query stopped: {str(e)}")
+        return partial_response(request, e)
     except Exception as e:
         logger.error(f"Error processing query: {str(e)}")
         return QueryResponse(
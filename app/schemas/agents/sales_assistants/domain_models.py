@@ -8,6 +8,7 @@ class PersonData(BaseModel):
 
     person_name: str
     title: Optional[str] = None
+    summary: Optional[str] = None
     career_history: Optional[str] = None
     current_activities: Optional[str] = None
     publications: Optional[str] = None
@@ -18,6 +19,7 @@ class OrganizationData(BaseModel):
     """Organization data model matching database schema"""
 
     organization_name: str
+    summary: Optional[str] = None
     company_overview: Optional[str] = None
     business_activities: Optional[str] = None
     history: Optional[str] = None
@@ -42,3 +44,9 @@ class ProductInfo(BaseModel):
         default_factory=list, description="List of related YouTube video URLs"
     )
     relevance_score: Optional[float] = Field(None, description="Search relevance score")
+    category: Optional[str] = Field(None, description="Product category")
+    features: List[str] = Field(default_factory=list, description="Feature names")
+    specs: List[str] = Field(
+        default_factory=list,
+        description="Numeric specs with units, e.g. 'power_watts=600 W'",
+    )
@@ -0,0 +1,43 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional
+from app.schemas.agents.sales_assistants.agent_response import EmailAgentResponse
+
+
+class CampaignRequest(BaseModel):
+    product: str = Field(..., description="Product to promote")
+    person_ids: List[int] = Field(
+        default_factory=list, description="Recipient ids from the persons table"
+    )
+    organization_filter: Optional[str] = Field(
+        default=None,
+        description="Send to every person whose organization name matches (ILIKE)",
+    )
+    user_id: str
+
+    @model_validator(mode="after")
+    def check_recipients(self):
+        if not self.person_ids and not self.organization_filter:
+            raise ValueError("Either person_ids or organization_filter is required")
+        return self
+
+
+class CampaignEmailResult(BaseModel):
+    """One NDJSON line per recipient"""
+
+    type: str = "email"
+    person_id: int
+    person_name: str
+    success: bool
+    attempts: int
+    email: Optional[EmailAgentResponse] = None
+    error: Optional[str] = None
+
+
+class CampaignSummary(BaseModel):
+    """Last NDJSON line of a campaign stream"""
+
+    type: str = "summary"
+    product: str
+    recipients: int
+    succeeded: int
+    failed: int
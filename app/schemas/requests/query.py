@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from app.schemas.agents.sales_assistants.agent_response import OrchestratorResponse
 
 
@@ -7,6 +7,34 @@ class QueryRequest(BaseModel):
     query: str
     user_id: str
     session_id: str
+    tenant: Optional[str] = Field(
+        default=None,
+        pattern=r"^[A-Za-z0-9_-]{1,64}$",
+        description="Sales team whose product catalog is searched; DEFAULT_TENANT if omitted",
+    )
+
+
+class ModelCallUsage(BaseModel):
+    agent_name: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+
+
+class UsageReport(BaseModel):
+    calls: List[ModelCallUsage] = Field(default_factory=list)
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = Field(
+        default=0, description="Prompt tokens served from the provider prompt cache"
+    )
+
+
+class RequestTiming(BaseModel):
+    queue_ms: float = Field(
+        ..., description="Time spent waiting for admission and a free orchestrator Team"
+    )
+    run_ms: float = Field(..., description="Time spent running the team")
 
 
 class QueryResponse(BaseModel):
@@ -16,3 +44,10 @@ class QueryResponse(BaseModel):
     session_id: str
     error: Optional[str] = None
     orchestrator_response: Optional[OrchestratorResponse] = None
+    usage: Optional[UsageReport] = None
+    timing: Optional[RequestTiming] = None
+    partial: bool = Field(
+        default=False,
+        description="The deadline passed; content holds only the members that finished",
+    )
+    completed_members: List[str] = Field(default_factory=list)
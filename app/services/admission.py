@@ -0,0 +1,215 @@
+import asyncio
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.config import config
+from app.services.metrics import QUEUE_SECONDS
+
+
+class Priority(int, Enum):
+    INTERACTIVE = 0
+    BATCH = 1
+
+    @classmethod
+    def from_header(cls, value: Optional[str]) -> "Priority":
+        return (
+            cls.BATCH if (value or "").strip().lower() == "batch" else cls.INTERACTIVE
+        )
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+@dataclass
+class Ticket:
+    user_id: str
+    priority: Priority
+    enqueued_at: float
+    admitted_at: float = 0.0
+
+    @property
+    def queue_time(self) -> float:
+        return self.admitted_at - self.enqueued_at
+
+
+@dataclass
+class _Waiter:
+    priority: Priority
+    seq: int
+    ticket: Ticket
+    future: asyncio.Future = field(repr=False)
+
+
+class AdmissionController:
+    """
+    Global and per-user concurrency limits with a bounded, prioritized wait queue.
+
+    Requests over a limit wait in the queue (interactive before batch, FIFO within a
+    priority) until a slot frees up. A full queue, a user with too many waiting
+    requests, or a wait longer than `queue_timeout` is rejected immediately with a
+    Retry-After estimate, so overload turns into fast errors instead of timeouts.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        per_user_limit: int,
+        max_queue: int,
+        per_user_queue: int,
+        queue_timeout: float,
+    ):
+        self.max_in_flight = max_in_flight
+        self.per_user_limit = per_user_limit
+        self.max_queue = max_queue
+        self.per_user_queue = per_user_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._user_in_flight: Dict[str, int] = {}
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        # Exponentially weighted average run time, used for Retry-After
+        self._avg_run_time = 10.0
+        self.admitted = 0
+        self.rejected_user = 0
+        self.rejected_queue_full = 0
+        self.timed_out = 0
+
+    def _has_capacity(self, user_id: str) -> bool:
+        return (
+            self.in_flight < self.max_in_flight
+            and self._user_in_flight.get(user_id, 0) < self.per_user_limit
+        )
+
+    def _grant(self, ticket: Ticket) -> None:
+        self.in_flight += 1
+        self._user_in_flight[ticket.user_id] = (
+            self._user_in_flight.get(ticket.user_id, 0) + 1
+        )
+        ticket.admitted_at = time.monotonic()
+        self.admitted += 1
+        QUEUE_SECONDS.labels(ticket.priority.name.lower()).observe(ticket.queue_time)
+
+    def retry_after(self) -> int:
+        backlog = len(self._waiters) + 1
+        estimate = backlog * self._avg_run_time / max(self.max_in_flight, 1)
+        return max(1, min(60, math.ceil(estimate)))
+
+    async def acquire(
+        self, user_id: str, priority: Priority, timeout: Optional[float] = None
+    ) -> Ticket:
+        """Wait at most `queue_timeout` (or `timeout`, if shorter) for a slot"""
+        ticket = Ticket(
+            user_id=user_id, priority=priority, enqueued_at=time.monotonic()
+        )
+        # After every dispatch no waiter is admissible, so free capacity can be taken directly
+        if self._has_capacity(user_id):
+            self._grant(ticket)
+            return ticket
+
+        if len(self._waiters) >= self.max_queue:
+            self.rejected_queue_full += 1
+            raise AdmissionRejected(503, "Server is at capacity", self.retry_after())
+        if (
+            sum(w.ticket.user_id == user_id for w in self._waiters)
+            >= self.per_user_queue
+        ):
+            self.rejected_user += 1
+            raise AdmissionRejected(
+                429,
+                f"Too many concurrent requests for user '{user_id}'",
+                self.retry_after(),
+            )
+
+        waiter = _Waiter(
+            priority,
+            next(self._seq),
+            ticket,
+            asyncio.get_running_loop().create_future(),
+        )
+        self._waiters.append(waiter)
+        wait = (
+            self.queue_timeout if timeout is None else min(timeout, self.queue_timeout)
+        )
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), wait)
+        except asyncio.TimeoutError:
+            self._abandon(waiter)
+            self.timed_out += 1
+            raise AdmissionRejected(
+                503, "Timed out waiting for capacity", self.retry_after()
+            )
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        return ticket
+
+    def _abandon(self, waiter: _Waiter) -> None:
+        if waiter in self._waiters:
+            self._waiters.remove(waiter)
+            waiter.future.cancel()
+        elif waiter.future.done() and not waiter.future.cancelled():
+            # The slot was granted just as the wait ended: hand it back
+            self.release(waiter.ticket)
+
+    def release(self, ticket: Ticket) -> None:
+        run_time = time.monotonic() - ticket.admitted_at
+        self._avg_run_time = 0.8 * self._avg_run_time + 0.2 * run_time
+        self.in_flight -= 1
+        remaining = self._user_in_flight.get(ticket.user_id, 1) - 1
+        if remaining:
+            self._user_in_flight[ticket.user_id] = remaining
+        else:
+            self._user_in_flight.pop(ticket.user_id, None)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Admit the highest-priority waiters whose user is under its limit"""
+        for waiter in sorted(self._waiters, key=lambda w: (w.priority, w.seq)):
+            if self.in_flight >= self.max_in_flight:
+                break
+            if self._has_capacity(waiter.ticket.user_id) and not waiter.future.done():
+                self._waiters.remove(waiter)
+                self._grant(waiter.ticket)
+                waiter.future.set_result(None)
+
+    @asynccontextmanager
+    async def admit(
+        self, user_id: str, priority: Priority, timeout: Optional[float] = None
+    ) -> AsyncIterator[Ticket]:
+        ticket = await self.acquire(user_id, priority, timeout)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "queued": len(self._waiters),
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected_user": self.rejected_user,
+            "rejected_queue_full": self.rejected_queue_full,
+            "timed_out": self.timed_out,
+            "avg_run_time": round(self._avg_run_time, 3),
+        }
+
+
+admission = AdmissionController(
+    max_in_flight=config.ADMISSION_MAX_IN_FLIGHT,
+    per_user_limit=config.ADMISSION_PER_USER_LIMIT,
+    max_queue=config.ADMISSION_MAX_QUEUE,
+    per_user_queue=config.ADMISSION_PER_USER_QUEUE,
+    queue_timeout=config.ADMISSION_QUEUE_TIMEOUT,
+)
@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import random
+from typing import AsyncIterator, Dict, List, Optional
+
+from sqlalchemy import text
+
+from app.agents.sales_assistants.custom_tools.search import search_knowledge_base
+from app.agents.sales_assistants.emailer_agent import create_campaign_emailer_agent
+from app.common.database import get_engine
+from app.config import config
+from app.schemas.agents.sales_assistants.agent_response import EmailAgentResponse
+from app.schemas.requests.campaign import (
+    CampaignEmailResult,
+    CampaignRequest,
+    CampaignSummary,
+)
+from app.services.metrics import time_agent_run
+
+logger = logging.getLogger(__name__)
+
+# One set-based query for all recipients, digests included
+RECIPIENTS_QUERY = """
+SELECT p.id, p.person_name, p.title, p.organization_id, o.organization_name,
+       pd.digest AS person_digest, od.digest AS organization_digest
+FROM persons p
+LEFT JOIN organizations o ON o.id = p.organization_id
+LEFT JOIN person_digests pd ON pd.person_id = p.id
+LEFT JOIN organization_digests od ON od.organization_id = p.organization_id
+WHERE {where}
+ORDER BY p.id
+LIMIT :limit
+"""
+
+
+class ProductNotFound(Exception):
+    pass
+
+
+def load_recipients(
+    person_ids: List[int], organization_filter: Optional[str], limit: int
+) -> List[Dict]:
+    # The digest tables are created by scripts.refresh_digests, never on the request path
+    engine = get_engine()
+    conditions = []
+    params: Dict = {"limit": limit}
+    if person_ids:
+        conditions.append("p.id = ANY(:ids)")
+        params["ids"] = list(person_ids)
+    if organization_filter:
+        conditions.append("o.organization_name ILIKE :organization_filter")
+        params["organization_filter"] = f"%{organization_filter}%"
+
+    query = RECIPIENTS_QUERY.format(where=" OR ".join(conditions))
+    with engine.connect() as connection:
+        return [dict(row) for row in connection.execute(text(query), params).mappings()]
+
+
+def load_product(product: str) -> str:
+    product_info = search_knowledge_base(product)
+    if product_info.startswith(("No products found", "Error searching products")):
+        raise ProductNotFound(product_info)
+    return product_info
+
+
+def build_email_prompt(product: str, product_info: str, recipient: Dict) -> str:
+    lines = [
+        f"Product: {product}",
+        "",
+        "PRODUCT INFORMATION:",
+        product_info.strip(),
+        "",
+        "RECIPIENT:",
+        f"- Name: {recipient['person_name']}",
+    ]
+    if recipient.get("title"):
+        lines.append(f"- Title: {recipient['title']}")
+    if recipient.get("organization_name"):
+        lines.append(f"- Organization: {recipient['organization_name']}")
+    if recipient.get("person_digest"):
+        lines.append(f"- About the recipient:\n{recipient['person_digest']}")
+    if recipient.get("organization_digest"):
+        lines.append(f"- About the organization:\n{recipient['organization_digest']}")
+    return "\n".join(lines)
+
+
+async def draft_email(
+    prompt: str, recipient: Dict, semaphore: asyncio.Semaphore, max_attempts: int
+) -> CampaignEmailResult:
+    """Draft one email, retrying failures with jittered exponential backoff"""
+    error = None
+    for attempt in range(1, max_attempts + 1):
+        try:
+            async with semaphore:
+                # Agents keep per-run state, so each draft gets its own instance
+                agent = create_campaign_emailer_agent()
+                with time_agent_run(agent.name):
+                    response = await agent.arun(prompt)
+            if not isinstance(response.content, EmailAgentResponse):
+                raise ValueError("Model did not return an EmailAgentResponse")
+            return CampaignEmailResult(
+                person_id=recipient["id"],
+                person_name=recipient["person_name"],
+                success=True,
+                attempts=attempt,
+                email=response.content,
+            )
+        except Exception as e:
+            error = str(e)
+            logger.warning(
+                f"Campaign draft for person {recipient['id']} failed (attempt {attempt}): {e}"
+            )
+            if attempt < max_attempts:
+                await asyncio.sleep(
+                    min(8.0, 0.5 * 2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+                )
+
+    return CampaignEmailResult(
+        person_id=recipient["id"],
+        person_name=recipient["person_name"],
+        success=False,
+        attempts=max_attempts,
+        error=error,
+    )
+
+
+async def run_campaign(
+    request: CampaignRequest, product_info: str, recipients: List[Dict]
+) -> AsyncIterator[str]:
+    """Yield one NDJSON line per recipient as drafts complete, then a summary line"""
+    semaphore = asyncio.Semaphore(config.CAMPAIGN_CONCURRENCY)
+    tasks = [
+        asyncio.create_task(
+            draft_email(
+                build_email_prompt(request.product, product_info, recipient),
+                recipient,
+                semaphore,
+                config.CAMPAIGN_MAX_ATTEMPTS,
+            )
+        )
+        for recipient in recipients
+    ]
+
+    succeeded = 0
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            result = await next_result
+            succeeded += result.success
+            yield result.model_dump_json() + "\n"
+    finally:
+        # Client went away: stop drafting for the remaining recipients
+        for task in tasks:
+            task.cancel()
+
+    summary = CampaignSummary(
+        product=request.product,
+        recipients=len(recipients),
+        succeeded=succeeded,
+        failed=len(recipients) - succeeded,
+    )
+    yield summary.model_dump_json() + "\n"
@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import unicodedata
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+from app.services.deadlines import DeadlineExceeded, current_deadline
+
+T = TypeVar("T")
+
+
+def normalize_text(text: str) -> str:
+    """Width/case/whitespace-insensitive form used for coalescing keys"""
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+class CoalescingStats:
+    def __init__(self, name: str):
+        self.name = name
+        self.leaders = 0
+        self.followers = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        total = self.leaders + self.followers
+        return {
+            "executions": self.leaders,
+            "coalesced": self.followers,
+            "coalesced_ratio": round(self.followers / total, 4) if total else 0.0,
+        }
+
+
+class SingleFlight:
+    """
+    Thread-based single-flight: concurrent calls with the same key share one execution.
+
+    The first caller (leader) runs the function; callers arriving while it is in
+    flight wait for and receive the same result or exception, but no longer than
+    their own request deadline. Nothing is cached after the call completes.
+    """
+
+    def __init__(self, name: str):
+        self.stats = CoalescingStats(name)
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+                self.stats.leaders += 1
+            else:
+                self.stats.followers += 1
+
+        if not leader:
+            deadline = current_deadline()
+            if deadline is None:
+                return future.result()
+            try:
+                return future.result(timeout=deadline.remaining())
+            except TimeoutError:
+                if future.done():
+                    raise  # The leader's own TimeoutError
+                raise DeadlineExceeded(
+                    f"{self.stats.name} (coalesced)",
+                    "Request deadline exceeded waiting for a shared call",
+                )
+
+        try:
+            result = fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+
+class AsyncSingleFlight:
+    """
+    asyncio single-flight; the shared task survives individual callers being
+    cancelled and is itself cancelled once the last caller is gone.
+    """
+
+    def __init__(self, name: str):
+        self.stats = CoalescingStats(name)
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self._callers: Dict[Hashable, int] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            self.stats.leaders += 1
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.stats.followers += 1
+
+        self._callers[key] = self._callers.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._callers.get(key) == 1 and self._in_flight.get(key) is task:
+                task.cancel()
+            raise
+        finally:
+            remaining = self._callers.get(key, 1) - 1
+            if remaining:
+                self._callers[key] = remaining
+            else:
+                self._callers.pop(key, None)
+
+
+query_flight = AsyncSingleFlight("query")
+search_flight = SingleFlight("search_knowledge_base")
+sql_flight = SingleFlight("sql")
+
+
+def coalescing_stats() -> Dict[str, Any]:
+    return {
+        flight.stats.name: flight.stats.snapshot()
+        for flight in (query_flight, search_flight, sql_flight)
+    }
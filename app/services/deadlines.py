@@ -0,0 +1,139 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from inspect import isgenerator
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from app.config import config
+
+
+class DeadlineExceeded(Exception):
+    """Raised at a checkpoint once the request deadline has passed or the request was cancelled"""
+
+    def __init__(self, stage: str, reason: str):
+        super().__init__(f"{reason} during {stage}")
+        self.stage = stage
+        self.reason = reason
+
+
+class _Cancellation:
+    def __init__(self):
+        self.event = threading.Event()
+        self.reason: Optional[str] = None
+
+
+class Deadline:
+    """
+    Absolute per-request deadline shared by every stage of a run.
+
+    Stages check it at their boundaries and size their own timeouts with `budget()`.
+    A stage may narrow it with `child()`; children share the parent's cancellation,
+    so cancelling the request (e.g. on client disconnect) stops every stage.
+    """
+
+    def __init__(self, timeout: float, _cancellation: Optional[_Cancellation] = None):
+        self.expires_at = time.monotonic() + timeout
+        self._cancellation = _cancellation or _Cancellation()
+
+    @classmethod
+    def from_header(cls, value: Optional[str]) -> "Deadline":
+        """X-Request-Timeout in seconds, capped by REQUEST_TIMEOUT_MAX_SECONDS"""
+        timeout = config.REQUEST_TIMEOUT_SECONDS
+        if value:
+            try:
+                timeout = float(value)
+            except ValueError:
+                pass
+        return cls(max(0.0, min(timeout, config.REQUEST_TIMEOUT_MAX_SECONDS)))
+
+    def child(self, timeout: float) -> "Deadline":
+        child = Deadline(timeout, self._cancellation)
+        child.expires_at = min(child.expires_at, self.expires_at)
+        return child
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def budget(self, stage_seconds: float) -> float:
+        """Timeout for one stage: its own budget, never past the deadline"""
+        return min(stage_seconds, self.remaining())
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancellation.event.is_set()
+
+    @property
+    def expired(self) -> bool:
+        return self.cancelled or self.remaining() <= 0
+
+    def cancel(self, reason: str) -> None:
+        if not self.cancelled:
+            self._cancellation.reason = reason
+            self._cancellation.event.set()
+
+    def check(self, stage: str) -> None:
+        if self.cancelled:
+            raise DeadlineExceeded(
+                stage, self._cancellation.reason or "Request cancelled"
+            )
+        if self.remaining() <= 0:
+            raise DeadlineExceeded(stage, "Request deadline exceeded")
+
+
+_current: ContextVar[Optional[Deadline]] = ContextVar("request_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Deadline) -> Iterator[Deadline]:
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def check_deadline(stage: str) -> None:
+    deadline = _current.get()
+    if deadline is not None:
+        deadline.check(stage)
+
+
+def stage_timeout(stage_seconds: float) -> float:
+    """Timeout for a stage run under the current deadline, or its plain budget outside a request"""
+    deadline = _current.get()
+    return stage_seconds if deadline is None else deadline.budget(stage_seconds)
+
+
+def _run_member(request_deadline: Deadline, member_run: Iterator[Any]) -> Iterator[Any]:
+    # The member runs lazily while the model consumes this generator
+    with deadline_scope(request_deadline.child(config.MEMBER_TIMEOUT_SECONDS)):
+        try:
+            yield from member_run
+        except DeadlineExceeded as e:
+            if request_deadline.expired:
+                raise
+            # Only the member's budget ran out: report it and let the team carry on
+            yield f"The member did not finish in time ({e})."
+
+
+def enforce_deadline(
+    function_name: str, function_call: Callable, arguments: Dict[str, Any]
+) -> Any:
+    """
+    Tool hook for the team and its members: no tool starts after the deadline, and
+    each member delegation runs under its own MEMBER_TIMEOUT_SECONDS budget.
+    """
+    deadline = _current.get()
+    if deadline is None:
+        return function_call(**arguments)
+
+    deadline.check(f"tool {function_name}")
+    result = function_call(**arguments)
+    if function_name == "transfer_task_to_member" and isgenerator(result):
+        return _run_member(deadline, result)
+    return result
@@ -0,0 +1,185 @@
+import re
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.common.database import get_engine
+
+# Long free-text columns that are condensed into the digest, in display order
+ORGANIZATION_FIELDS = (
+    "company_overview",
+    "business_activities",
+    "history",
+    "group_companies",
+    "major_business_partners",
+    "sales_trends",
+    "president_message",
+    "interview_articles",
+    "past_transactions",
+)
+PERSON_FIELDS = ("career_history", "current_activities", "publications")
+
+ORGANIZATION_DIGEST_CHARS = 600
+PERSON_DIGEST_CHARS = 400
+FIELD_CHARS = 120
+
+CREATE_DIGEST_TABLES = """
+CREATE TABLE IF NOT EXISTS organization_digests (
+    organization_id INTEGER PRIMARY KEY REFERENCES organizations(id) ON DELETE CASCADE,
+    organization_name TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    source_hash TEXT NOT NULL,
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE TABLE IF NOT EXISTS person_digests (
+    person_id INTEGER PRIMARY KEY REFERENCES persons(id) ON DELETE CASCADE,
+    person_name TEXT NOT NULL,
+    title TEXT,
+    organization_id INTEGER,
+    organization_name TEXT,
+    digest TEXT NOT NULL,
+    source_hash TEXT NOT NULL,
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS organization_digests_name_idx ON organization_digests (organization_name);
+CREATE INDEX IF NOT EXISTS person_digests_name_idx ON person_digests (person_name);
+"""
+
+
+def _hash_expression(alias: str, columns: Iterable[str]) -> str:
+    return "md5(concat_ws('|', " + ", ".join(f"{alias}.{c}" for c in columns) + "))"
+
+
+ORGANIZATION_HASH = _hash_expression("o", ("organization_name",) + ORGANIZATION_FIELDS)
+PERSON_HASH = (
+    "md5(concat_ws('|', "
+    + ", ".join(
+        f"p.{c}" for c in ("person_name", "title", "organization_id") + PERSON_FIELDS
+    )
+    + ", o.organization_name))"
+)
+
+# Only rows whose content hash differs from the stored digest are selected
+CHANGED_ORGANIZATIONS = f"""
+SELECT o.id, o.organization_name, {", ".join("o." + c for c in ORGANIZATION_FIELDS)},
+       {ORGANIZATION_HASH} AS source_hash
+FROM organizations o
+LEFT JOIN organization_digests d ON d.organization_id = o.id
+WHERE d.source_hash IS DISTINCT FROM {ORGANIZATION_HASH}
+"""
+
+CHANGED_PERSONS = f"""
+SELECT p.id, p.person_name, p.title, p.organization_id, o.organization_name,
+       {", ".join("p." + c for c in PERSON_FIELDS)},
+       {PERSON_HASH} AS source_hash
+FROM persons p
+LEFT JOIN organizations o ON p.organization_id = o.id
+LEFT JOIN person_digests d ON d.person_id = p.id
+WHERE d.source_hash IS DISTINCT FROM {PERSON_HASH}
+"""
+
+UPSERT_ORGANIZATION = """
+INSERT INTO organization_digests (organization_id, organization_name, digest, source_hash, refreshed_at)
+VALUES (:id, :organization_name, :digest, :source_hash, now())
+ON CONFLICT (organization_id) DO UPDATE SET
+    organization_name = EXCLUDED.organization_name,
+    digest = EXCLUDED.digest,
+    source_hash = EXCLUDED.source_hash,
+    refreshed_at = now()
+"""
+
+UPSERT_PERSON = """
+INSERT INTO person_digests (person_id, person_name, title, organization_id, organization_name, digest, source_hash, refreshed_at)
+VALUES (:id, :person_name, :title, :organization_id, :organization_name, :digest, :source_hash, now())
+ON CONFLICT (person_id) DO UPDATE SET
+    person_name = EXCLUDED.person_name,
+    title = EXCLUDED.title,
+    organization_id = EXCLUDED.organization_id,
+    organization_name = EXCLUDED.organization_name,
+    digest = EXCLUDED.digest,
+    source_hash = EXCLUDED.source_hash,
+    refreshed_at = now()
+"""
+
+_SENTENCE_END = re.compile(r"(?<=[。．！？.!?])\s*")
+
+
+def _lead(value: Optional[str], max_chars: int) -> str:
+    """First sentence(s) of a field, cut at a sentence boundary where possible"""
+    if not value:
+        return ""
+    value = " ".join(str(value).split())
+    if len(value) <= max_chars:
+        return value
+    lead = ""
+    for sentence in _SENTENCE_END.split(value):
+        if not sentence:
+            continue
+        if len(lead) + len(sentence) + 1 > max_chars:
+            break
+        lead = f"{lead} {sentence}" if lead else sentence
+    return lead or value[: max_chars - 1] + "…"
+
+
+def summarize_row(row: Dict, fields: Tuple[str, ...], max_chars: int) -> str:
+    """Extractive digest: the lead of every non-empty field, capped at max_chars overall"""
+    parts = []
+    remaining = max_chars
+    for field in fields:
+        lead = _lead(row.get(field), min(FIELD_CHARS, remaining))
+        if not lead:
+            continue
+        part = f"{field}: {lead}"
+        if len(part) > remaining:
+            break
+        parts.append(part)
+        remaining -= len(part) + 1
+    return "\n".join(parts)
+
+
+def ensure_digest_tables(engine: Engine) -> None:
+    with engine.begin() as connection:
+        connection.exec_driver_sql(CREATE_DIGEST_TABLES)
+
+
+def refresh_digests(engine: Optional[Engine] = None) -> Dict[str, int]:
+    """Recompute digests for rows whose source content changed since the last refresh"""
+    engine = engine or get_engine()
+    ensure_digest_tables(engine)
+    refreshed = {"organizations": 0, "persons": 0}
+
+    with engine.begin() as connection:
+        organizations = connection.execute(text(CHANGED_ORGANIZATIONS)).mappings().all()
+        for row in organizations:
+            connection.execute(
+                text(UPSERT_ORGANIZATION),
+                {
+                    "id": row["id"],
+                    "organization_name": row["organization_name"],
+                    "digest": summarize_row(
+                        row, ORGANIZATION_FIELDS, ORGANIZATION_DIGEST_CHARS
+                    ),
+                    "source_hash": row["source_hash"],
+                },
+            )
+        refreshed["organizations"] = len(organizations)
+
+        # Persons are refreshed after organizations so organization renames propagate
+        persons = connection.execute(text(CHANGED_PERSONS)).mappings().all()
+        for row in persons:
+            connection.execute(
+                text(UPSERT_PERSON),
+                {
+                    "id": row["id"],
+                    "person_name": row["person_name"],
+                    "title": row["title"],
+                    "organization_id": row["organization_id"],
+                    "organization_name": row["organization_name"],
+                    "digest": summarize_row(row, PERSON_FIELDS, PERSON_DIGEST_CHARS),
+                    "source_hash": row["source_hash"],
+                },
+            )
+        refreshed["persons"] = len(persons)
+
+    return refreshed
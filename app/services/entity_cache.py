@@ -0,0 +1,339 @@
+import logging
+import select
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from sqlalchemy import text
+
+from app.common.database import get_engine, set_statement_timeout
+from app.config import config
+from app.schemas.agents.sales_assistants.domain_models import (
+    OrganizationData,
+    PersonData,
+)
+from app.services.digests import ensure_digest_tables
+from app.services.coalescing import sql_flight
+from app.services.tracing import span
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "entity_changes"
+
+# Every change to a source row or its digest sends "<entity>:<id>" on CHANNEL
+CREATE_NOTIFY_TRIGGERS = f"""
+CREATE OR REPLACE FUNCTION notify_entity_change() RETURNS trigger AS $$
+DECLARE
+    changed JSON;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed := row_to_json(OLD);
+    ELSE
+        changed := row_to_json(NEW);
+    END IF;
+    PERFORM pg_notify('{CHANNEL}', TG_ARGV[0] || ':' || (changed ->> TG_ARGV[1]));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS persons_notify_change ON persons;
+CREATE TRIGGER persons_notify_change AFTER INSERT OR UPDATE OR DELETE ON persons
+    FOR EACH ROW EXECUTE FUNCTION notify_entity_change('person', 'id');
+DROP TRIGGER IF EXISTS organizations_notify_change ON organizations;
+CREATE TRIGGER organizations_notify_change AFTER INSERT OR UPDATE OR DELETE ON organizations
+    FOR EACH ROW EXECUTE FUNCTION notify_entity_change('organization', 'id');
+DROP TRIGGER IF EXISTS person_digests_notify_change ON person_digests;
+CREATE TRIGGER person_digests_notify_change AFTER INSERT OR UPDATE OR DELETE ON person_digests
+    FOR EACH ROW EXECUTE FUNCTION notify_entity_change('person', 'person_id');
+DROP TRIGGER IF EXISTS organization_digests_notify_change ON organization_digests;
+CREATE TRIGGER organization_digests_notify_change AFTER INSERT OR UPDATE OR DELETE ON organization_digests
+    FOR EACH ROW EXECUTE FUNCTION notify_entity_change('organization', 'organization_id');
+"""
+
+TRIGGER_NAMES = (
+    "persons_notify_change",
+    "organizations_notify_change",
+    "person_digests_notify_change",
+    "organization_digests_notify_change",
+)
+
+PERSONS_QUERY = """
+SELECT p.id, p.person_name, p.title, p.organization_id, o.organization_name, pd.digest AS summary
+FROM persons p
+LEFT JOIN organizations o ON o.id = p.organization_id
+LEFT JOIN person_digests pd ON pd.person_id = p.id
+WHERE {where}
+ORDER BY p.id
+LIMIT 10
+"""
+
+ORGANIZATIONS_QUERY = """
+SELECT o.id, o.organization_name, od.digest AS summary
+FROM organizations o
+LEFT JOIN organization_digests od ON od.organization_id = o.id
+WHERE {where}
+ORDER BY o.id
+LIMIT 10
+"""
+
+# Matches normalize_name() on the database side
+NAME_MATCH = (
+    r"lower(regexp_replace(normalize({column}, NFKC), '\s', '', 'g')) LIKE :pattern"
+)
+NAME_COLUMNS = {"person": "p.person_name", "organization": "o.organization_name"}
+
+
+def normalize_name(name: str) -> str:
+    """Width/case-insensitive, whitespace-free form so '福沢 博志' and '福沢博志' share a key"""
+    return "".join(unicodedata.normalize("NFKC", name).casefold().split())
+
+
+class EntityCache:
+    """
+    In-process LRU cache of person/organization lookups keyed by id and normalized name.
+
+    Entries are invalidated by Postgres NOTIFY messages from row triggers. The
+    cache only serves hits while the LISTEN connection is up; it is cleared on
+    every (re)connect, so a missed notification can never leave a stale entry.
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[Tuple[str, Any], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation; results read before a bump are not cached
+        self._generation = 0
+        self._listening = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # Cache primitives
+
+    def _get(self, key: Tuple[str, Any]) -> Any:
+        with self._lock:
+            if self._listening and key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            return None
+
+    def _put(self, key: Tuple[str, Any], value: Any, generation: int) -> None:
+        with self._lock:
+            if not self._listening or generation != self._generation:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, entity: str, entity_id: Optional[int]) -> None:
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            # Name lookups may now match a different set of rows
+            name_key = f"{entity}_name"
+            for key in [k for k in self._entries if k[0] == name_key]:
+                del self._entries[key]
+            self._entries.pop((entity, entity_id), None)
+            if entity == "organization":
+                # Person entries embed their organization's name
+                for key, value in list(self._entries.items()):
+                    if key[0] == "person" and value.get("organization_id") == entity_id:
+                        del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def wait_listening(self, timeout: float) -> bool:
+        """Wait for the LISTEN connection; nothing is cached before it is up"""
+        deadline = time.monotonic() + timeout
+        while not self._listening:
+            if (
+                self._thread is None
+                or self._stop.is_set()
+                or time.monotonic() >= deadline
+            ):
+                return False
+            time.sleep(0.1)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "listening": self._listening,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    # Lookups
+
+    def _lookup(
+        self, entity: str, name: str, query: str, to_model: Callable[[Dict], Any]
+    ) -> List[Tuple[int, Any]]:
+        name_key = (f"{entity}_name", normalize_name(name))
+        ids = self._get(name_key)
+        if ids is not None:
+            cached = [self._get((entity, entity_id)) for entity_id in ids]
+            if all(row is not None for row in cached):
+                with self._lock:
+                    self.hits += 1
+                return [(row["id"], to_model(row)) for row in cached]
+
+        with self._lock:
+            self.misses += 1
+        # Concurrent misses for the same name share one query
+        return sql_flight.do(
+            name_key, lambda: self._load(entity, name_key, query, to_model)
+        )
+
+    def _load(
+        self,
+        entity: str,
+        name_key: Tuple[str, str],
+        query: str,
+        to_model: Callable[[Dict], Any],
+    ) -> List[Tuple[int, Any]]:
+        generation = self._generation
+        with (
+            get_engine().connect() as connection,
+            span("postgres.query", entity=entity),
+        ):
+            set_statement_timeout(connection)
+            rows = [
+                dict(row)
+                for row in connection.execute(
+                    text(
+                        query.format(
+                            where=NAME_MATCH.format(column=NAME_COLUMNS[entity])
+                        )
+                    ),
+                    {"pattern": f"%{name_key[1]}%"},
+                ).mappings()
+            ]
+        for row in rows:
+            self._put((entity, row["id"]), row, generation)
+        self._put(name_key, [row["id"] for row in rows], generation)
+        return [(row["id"], to_model(row)) for row in rows]
+
+    def find_persons(self, name: str) -> List[Tuple[int, PersonData]]:
+        return self._lookup(
+            "person",
+            name,
+            PERSONS_QUERY,
+            lambda row: PersonData(
+                person_name=row["person_name"],
+                title=row["title"],
+                summary=row["summary"],
+                organization_name=row["organization_name"],
+            ),
+        )
+
+    def find_organizations(self, name: str) -> List[Tuple[int, OrganizationData]]:
+        return self._lookup(
+            "organization",
+            name,
+            ORGANIZATIONS_QUERY,
+            lambda row: OrganizationData(
+                organization_name=row["organization_name"], summary=row["summary"]
+            ),
+        )
+
+    # LISTEN/NOTIFY
+
+    def _handle_notification(self, payload: str) -> None:
+        entity, _, entity_id = payload.partition(":")
+        try:
+            self.invalidate(entity, int(entity_id))
+        except ValueError:
+            self.invalidate(entity, None)
+
+    def _listen(self) -> None:
+        backoff = 1.0
+        while not self._stop.is_set():
+            connection = None
+            try:
+                connection = psycopg2.connect(config.database_url)
+                connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+                with connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {CHANNEL};")
+                self.clear()
+                with self._lock:
+                    self._listening = True
+                backoff = 1.0
+                logger.info(f"Entity cache listening on '{CHANNEL}'")
+
+                while not self._stop.is_set():
+                    if select.select([connection], [], [], 1.0) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        self._handle_notification(connection.notifies.pop(0).payload)
+            except Exception as e:
+                logger.warning(f"Entity cache listener error, cache bypassed: {e}")
+            finally:
+                with self._lock:
+                    self._listening = False
+                self.clear()
+                if connection is not None:
+                    connection.close()
+            self._stop.wait(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._listen, name="entity-cache-listener", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+def install_triggers() -> None:
+    """
+    Create the NOTIFY triggers (idempotent); the digest tables are created first.
+    Needs DDL rights and locks the tables, so it runs from scripts.install_entity_triggers.
+    """
+    engine = get_engine()
+    ensure_digest_tables(engine)
+    with engine.begin() as connection:
+        connection.exec_driver_sql(CREATE_NOTIFY_TRIGGERS)
+
+
+def missing_triggers() -> List[str]:
+    """NOTIFY triggers that are not installed; without them the cache is never invalidated"""
+    with get_engine().connect() as connection:
+        installed = set(
+            connection.execute(
+                text(
+                    "SELECT tgname FROM pg_trigger WHERE NOT tgisinternal AND tgname = ANY(:names)"
+                ),
+                {"names": list(TRIGGER_NAMES)},
+            ).scalars()
+        )
+    return [name for name in TRIGGER_NAMES if name not in installed]
+
+
+entity_cache = EntityCache(max_entries=config.ENTITY_CACHE_MAX_ENTRIES)
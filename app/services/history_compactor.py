@@ -0,0 +1,172 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Sequence
+
+from pydantic import BaseModel
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate: ~4 ASCII chars per token, 1 token per non-ASCII char (Japanese)"""
+    if not text:
+        return 0
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return non_ascii + (len(text) - non_ascii + 3) // 4
+
+
+def _shorten(text: str, max_chars: int) -> str:
+    text = " ".join(text.split())
+    if len(text) <= max_chars:
+        return text
+    return text[: max_chars - 1].rstrip() + "…"
+
+
+def _message_text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "\n".join(
+            part.get("text", "") if isinstance(part, dict) else str(part)
+            for part in content
+        )
+    return str(content or "")
+
+
+def _user_text(run: Any) -> str:
+    """First user message of a run that was not replayed from history"""
+    for message in getattr(run, "messages", None) or []:
+        if message.role == "user" and not getattr(message, "from_history", False):
+            return _message_text(message.content)
+    return ""
+
+
+def _answer_digest(content: Any, max_chars: int) -> str:
+    """Short digest of a run answer; keeps the routing decision and the start of the reply"""
+    if isinstance(content, BaseModel):
+        content = content.model_dump()
+    if isinstance(content, dict):
+        agents = ", ".join(content.get("agents_used") or [])
+        text = content.get("formatted_response") or content.get("content") or ""
+        prefix = f"[{agents}] " if agents else ""
+        return prefix + _shorten(str(text), max_chars)
+    return _shorten(_message_text(content), max_chars)
+
+
+@dataclass
+class Turn:
+    user: str
+    answer: str
+
+    def render(self) -> str:
+        return f"User: {self.user}\nAssistant: {self.answer}"
+
+
+@dataclass
+class SessionHistory:
+    """Compacted history of one session"""
+
+    processed_runs: int = 0
+    summary: List[str] = field(default_factory=list)
+    turns: List[Turn] = field(default_factory=list)
+
+
+class HistoryCompactor:
+    """
+    Keeps a rolling summary plus short digests of earlier runs per session.
+
+    Each call only digests runs that were added since the previous call. Once the
+    digests exceed the token budget the oldest turns are folded into one-line
+    summary entries, and the oldest summary entries are dropped, so the rendered
+    history never grows past `token_budget` regardless of session length.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = 1200,
+        digest_chars: int = 400,
+        user_chars: int = 300,
+        summary_chars: int = 120,
+        max_sessions: int = 1024,
+    ):
+        self.token_budget = token_budget
+        self.digest_chars = digest_chars
+        self.user_chars = user_chars
+        self.summary_chars = summary_chars
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, SessionHistory]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def compact(self, session_id: str, runs: Sequence[Any]) -> Optional[str]:
+        """Digest new runs of the session and return the rendered compact history"""
+        with self._lock:
+            history = self._sessions.get(session_id)
+            if history is None or history.processed_runs > len(runs):
+                # Unknown session or the stored runs were reset: rebuild from scratch
+                history = SessionHistory()
+            self._sessions[session_id] = history
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+            for run in runs[history.processed_runs :]:
+                user = _user_text(run)
+                if user:
+                    history.turns.append(
+                        Turn(
+                            user=_shorten(user, self.user_chars),
+                            answer=_answer_digest(
+                                getattr(run, "content", None), self.digest_chars
+                            ),
+                        )
+                    )
+            history.processed_runs = len(runs)
+
+            self._enforce_budget(history)
+            return self._render(history)
+
+    def reset(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def _tokens(self, history: SessionHistory) -> int:
+        return sum(estimate_tokens(line) for line in history.summary) + sum(
+            estimate_tokens(turn.render()) for turn in history.turns
+        )
+
+    def _enforce_budget(self, history: SessionHistory) -> None:
+        # Fold the oldest turns into the rolling summary, always keeping the latest turn verbatim
+        while len(history.turns) > 1 and self._tokens(history) > self.token_budget:
+            turn = history.turns.pop(0)
+            history.summary.append(
+                f"- {_shorten(turn.user, self.summary_chars)} -> "
+                f"{_shorten(turn.answer, self.summary_chars)}"
+            )
+        # Then drop the oldest summary lines
+        while history.summary and self._tokens(history) > self.token_budget:
+            history.summary.pop(0)
+        # A single oversized turn is shortened in place
+        if history.turns and self._tokens(history) > self.token_budget:
+            turn = history.turns[-1]
+            turn.user = _shorten(turn.user, self.summary_chars)
+            turn.answer = _shorten(turn.answer, self.summary_chars)
+
+    def _render(self, history: SessionHistory) -> Optional[str]:
+        if not history.summary and not history.turns:
+            return None
+        sections = []
+        if history.summary:
+            sections.append(
+                "<summary_of_earlier_turns>\n"
+                + "\n".join(history.summary)
+                + "\n</summary_of_earlier_turns>"
+            )
+        if history.turns:
+            sections.append(
+                "<recent_turns>\n"
+                + "\n\n".join(turn.render() for turn in history.turns)
+                + "\n</recent_turns>"
+            )
+        return (
+            "Conversation so far (compacted, prefer the current request if they conflict):\n"
+            + "\n\n".join(sections)
+        )
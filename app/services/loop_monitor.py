@@ -0,0 +1,68 @@
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+from app.config import config
+from app.services.metrics import EVENT_LOOP_LAG_SECONDS
+
+
+class EventLoopMonitor:
+    """
+    Measures event-loop lag: how much later than requested a periodic sleep wakes up.
+
+    Sync work on the loop (a blocking call in an async route, a long JSON encode)
+    shows up here before it shows up as request latency.
+    """
+
+    def __init__(self, interval: float, window: int = 600):
+        self.interval = interval
+        self._samples: deque = deque(maxlen=window)
+        self._task: Optional[asyncio.Task] = None
+        self.max_lag = 0.0
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - started - self.interval)
+            self._samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            EVENT_LOOP_LAG_SECONDS.observe(lag)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        samples = sorted(self._samples)
+
+        def percentile(fraction: float) -> float:
+            if not samples:
+                return 0.0
+            return round(
+                samples[min(len(samples) - 1, int(fraction * len(samples)))] * 1000, 2
+            )
+
+        return {
+            # Each uvicorn worker has its own loop; the pid tells them apart
+            "pid": os.getpid(),
+            "interval_ms": round(self.interval * 1000, 1),
+            "samples": len(samples),
+            "p50_ms": percentile(0.50),
+            "p99_ms": percentile(0.99),
+            "max_ms": round(self.max_lag * 1000, 2),
+        }
+
+
+loop_monitor = EventLoopMonitor(config.LOOP_LAG_INTERVAL_MS / 1000)
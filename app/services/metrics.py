@@ -0,0 +1,224 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from inspect import isgenerator
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+
+from app.services.tracing import set_span_attributes, span
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+REQUEST_SECONDS = Histogram(
+    "sales_assistant_request_seconds",
+    "HTTP request latency, until the response body is complete",
+    ["route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+QUEUE_SECONDS = Histogram(
+    "sales_assistant_queue_seconds",
+    "Time spent waiting for an admission slot",
+    ["priority"],
+    buckets=LATENCY_BUCKETS,
+)
+AGENT_RUN_SECONDS = Histogram(
+    "sales_assistant_agent_run_seconds",
+    "Run time of the orchestrator team and of each member delegation",
+    ["agent"],
+    buckets=LATENCY_BUCKETS,
+)
+TOOL_SECONDS = Histogram(
+    "sales_assistant_tool_seconds",
+    "Tool call time",
+    ["agent", "tool"],
+    buckets=LATENCY_BUCKETS,
+)
+MODEL_TTFT_SECONDS = Histogram(
+    "sales_assistant_model_ttft_seconds",
+    "Time until the model response starts arriving",
+    ["agent", "model"],
+    buckets=LATENCY_BUCKETS,
+)
+MODEL_CALL_SECONDS = Histogram(
+    "sales_assistant_model_call_seconds",
+    "Total model call time, including retries and hedges",
+    ["agent", "model"],
+    buckets=LATENCY_BUCKETS,
+)
+TOKENS = Counter(
+    "sales_assistant_tokens",
+    "Model tokens by kind (prompt, completion, cached)",
+    ["agent", "model", "kind"],
+)
+
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "sales_assistant_event_loop_lag_seconds",
+    "How late the event loop woke a periodic timer; high values mean blocking work on the loop",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+
+_current_agent: ContextVar[str] = ContextVar("metrics_agent", default="unknown")
+
+
+class _ModelCall:
+    __slots__ = ("started", "first_byte")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.first_byte: Optional[float] = None
+
+
+_current_call: ContextVar[Optional[_ModelCall]] = ContextVar(
+    "metrics_model_call", default=None
+)
+
+
+def current_agent() -> str:
+    """Agent that model calls made here are attributed to"""
+    return _current_agent.get()
+
+
+@contextmanager
+def agent_scope(agent_name: str) -> Iterator[None]:
+    """Attribute model calls made inside this block to `agent_name`"""
+    token = _current_agent.set(agent_name)
+    try:
+        yield
+    finally:
+        _current_agent.reset(token)
+
+
+@contextmanager
+def time_agent_run(agent_name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    with agent_scope(agent_name), span("agent.run", **{"agent.name": agent_name}):
+        try:
+            yield
+        finally:
+            AGENT_RUN_SECONDS.labels(agent_name).observe(time.perf_counter() - started)
+
+
+@contextmanager
+def time_model_call(model: str) -> Iterator[None]:
+    call = _current_call.get()
+    if call is not None:
+        # Nested (e.g. a hedged attempt): the outer call is already being timed
+        yield
+        return
+
+    call = _ModelCall()
+    agent = _current_agent.get()
+    token = _current_call.set(call)
+    try:
+        with span("model.call", **{"agent.name": agent, "model": model}):
+            try:
+                yield
+            finally:
+                if call.first_byte is not None:
+                    ttft = call.first_byte - call.started
+                    MODEL_TTFT_SECONDS.labels(agent, model).observe(ttft)
+                    set_span_attributes(ttft_ms=round(ttft * 1000, 1))
+    finally:
+        _current_call.reset(token)
+        MODEL_CALL_SECONDS.labels(agent, model).observe(
+            time.perf_counter() - call.started
+        )
+
+
+def mark_first_byte() -> None:
+    """httpx response hook: the first attempt's response headers have arrived"""
+    call = _current_call.get()
+    if call is not None and call.first_byte is None:
+        call.first_byte = time.perf_counter()
+
+
+def record_tokens(model: str, usage: Any) -> None:
+    """Count tokens from an OpenAI completion's usage block"""
+    if usage is None:
+        return
+    agent = _current_agent.get()
+    TOKENS.labels(agent, model, "prompt").inc(usage.prompt_tokens or 0)
+    TOKENS.labels(agent, model, "completion").inc(usage.completion_tokens or 0)
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None) if details is not None else None
+    if cached:
+        TOKENS.labels(agent, model, "cached").inc(cached)
+    set_span_attributes(
+        prompt_tokens=usage.prompt_tokens or 0,
+        completion_tokens=usage.completion_tokens or 0,
+        cached_tokens=cached or 0,
+    )
+
+
+def _timed_member_run(
+    team_name: str, member_name: str, member_run: Iterator[Any]
+) -> Iterator[Any]:
+    started = time.perf_counter()
+    try:
+        with span("tool.transfer_task_to_member", **{"agent.name": team_name}):
+            with time_agent_run(member_name):
+                yield from member_run
+    finally:
+        TOOL_SECONDS.labels(team_name, "transfer_task_to_member").observe(
+            time.perf_counter() - started
+        )
+
+
+def record_tool_metrics(
+    agent: Any, function_name: str, function_call: Callable, arguments: Dict[str, Any]
+) -> Any:
+    """Tool hook timing every tool call; member delegations also time the member's run"""
+    agent_name = getattr(agent, "name", None) or "unknown"
+    started = time.perf_counter()
+    if function_name == "transfer_task_to_member":
+        # Only creates the generator; _timed_member_run spans the delegation as it runs
+        result = function_call(**arguments)
+    else:
+        with span(f"tool.{function_name}", **{"agent.name": agent_name}):
+            result = function_call(**arguments)
+    if isgenerator(result):
+        # Delegations run lazily while the model consumes the generator
+        member = None
+        if hasattr(agent, "_find_member_by_id"):
+            member = agent._find_member_by_id(arguments.get("member_id", ""))
+        member_name = getattr(member[1], "name", None) if member else None
+        return _timed_member_run(agent_name, member_name or "unknown", result)
+    TOOL_SECONDS.labels(agent_name, function_name).observe(
+        time.perf_counter() - started
+    )
+    return result
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so streamed responses are timed until their last chunk"""
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Dict) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the scope; raw paths would explode cardinality
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUEST_SECONDS.labels(route, str(status)).observe(
+                time.perf_counter() - started
+            )
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    return generate_latest(), CONTENT_TYPE_LATEST
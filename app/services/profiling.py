@@ -0,0 +1,104 @@
+import hmac
+import logging
+import os
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from app.config import config
+from app.services.tracing import Span, Trace
+
+logger = logging.getLogger(__name__)
+
+
+def profiling_requested(header_value: Optional[str]) -> bool:
+    """X-Profile opts one request in if it carries PROFILING_TOKEN; no token, no profiling"""
+    if not config.PROFILING_ENABLED or not config.PROFILING_TOKEN or not header_value:
+        return False
+    return hmac.compare_digest(header_value.encode(), config.PROFILING_TOKEN.encode())
+
+
+def _fold(frame) -> Optional[str]:
+    if frame.f_globals.get("__name__") == "selectors":
+        # The event loop waiting for I/O is idle time, not work
+        return None
+    stack = []
+    while frame is not None:
+        stack.append(
+            f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_qualname}"
+        )
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+class SamplingProfiler:
+    """
+    Samples the Python stacks of the threads currently working on one trace.
+
+    Threads are known from the trace's open spans (route, team run, tools, model
+    calls), so concurrent requests do not end up in each other's profile. Output is
+    the folded-stack format read by flamegraph.pl, speedscope and inferno.
+    """
+
+    def __init__(self, trace: Trace, interval: float):
+        self.trace = trace
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.path: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"profiler-{trace.trace_id[:8]}", daemon=True
+        )
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self.trace._lock:
+                idents = [ident for ident in self.trace.threads if ident != own]
+            for ident in idents:
+                frame = frames.get(ident)
+                folded = _fold(frame) if frame is not None else None
+                if folded:
+                    self.samples[folded] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def dump(self) -> str:
+        os.makedirs(config.PROFILE_DIR, exist_ok=True)
+        path = os.path.join(config.PROFILE_DIR, f"{self.trace.trace_id}.folded")
+        with open(path, "w", encoding="utf-8") as profile_file:
+            for stack, count in self.samples.most_common():
+                profile_file.write(f"{stack} {count}\n")
+        return path
+
+
+@contextmanager
+def profile_request(root: Optional[Span]) -> Iterator[Optional[SamplingProfiler]]:
+    """Profile the request behind `root` if it opted in; the dump path is set on exit"""
+    if root is None or not root.trace.profiled:
+        yield None
+        return
+
+    profiler = SamplingProfiler(root.trace, config.PROFILE_INTERVAL_MS / 1000)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        try:
+            profiler.path = profiler.dump()
+            root.set_attribute("profile.file", profiler.path)
+            root.set_attribute("profile.samples", sum(profiler.samples.values()))
+            logger.info(
+                f"Profile for trace {root.trace.trace_id} written to {profiler.path}"
+            )
+        except OSError as e:
+            logger.warning(f"Could not write profile: {e}")
@@ -0,0 +1,144 @@
+import contextvars
+import logging
+import threading
+import unicodedata
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional, Set
+
+from app.config import config
+from app.services.deadlines import stage_timeout
+
+logger = logging.getLogger(__name__)
+
+
+def _bigrams(text: str) -> Set[str]:
+    # Character bigrams work for both spaced (English) and unspaced (Japanese) text
+    normalized = "".join(unicodedata.normalize("NFKC", text).casefold().split())
+    if len(normalized) < 2:
+        return {normalized} if normalized else set()
+    return {normalized[i : i + 2] for i in range(len(normalized) - 1)}
+
+
+def similarity(tool_query: str, raw_query: str) -> float:
+    """
+    Dice coefficient of the two queries' bigrams. Symmetric, so a short sub-query
+    ("mouse") of a broader raw query scores low instead of matching it completely.
+    """
+    tool_bigrams, raw_bigrams = _bigrams(tool_query), _bigrams(raw_query)
+    if not tool_bigrams or not raw_bigrams:
+        return 0.0
+    return 2 * len(tool_bigrams & raw_bigrams) / (len(tool_bigrams) + len(raw_bigrams))
+
+
+class SpeculativeSearch:
+    def __init__(self, query: str, future: Future):
+        self.query = query
+        self.future = future
+        self.consulted = False
+        self.taken = False
+        self.hit = False
+        self._lock = threading.Lock()
+
+
+class SpeculationStats:
+    def __init__(self):
+        self.started = 0
+        self.hits = 0
+        self.misses = 0
+        self.unused = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "started": self.started,
+            "hits": self.hits,
+            "misses": self.misses,
+            "unused": self.unused,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / self.started, 4) if self.started else 0.0,
+        }
+
+
+speculation_stats = SpeculationStats()
+
+_current: ContextVar[Optional[SpeculativeSearch]] = ContextVar(
+    "speculative_search", default=None
+)
+_executor = ThreadPoolExecutor(
+    max_workers=config.SPECULATION_WORKERS, thread_name_prefix="speculative-search"
+)
+
+
+@contextmanager
+def speculative_search(
+    query: str, search_fn: Callable[[str], str]
+) -> Iterator[Optional[SpeculativeSearch]]:
+    """Start `search_fn(query)` in the background for the duration of one request"""
+    if not config.SPECULATIVE_SEARCH:
+        yield None
+        return
+
+    speculation = SpeculativeSearch(
+        query, _executor.submit(contextvars.copy_context().run, search_fn, query)
+    )
+    speculation_stats.record("started")
+    token = _current.set(speculation)
+    try:
+        yield speculation
+    finally:
+        _current.reset(token)
+        if not speculation.consulted:
+            speculation_stats.record("unused")
+            speculation.future.cancel()
+
+
+def take_speculative_result(tool_query: str) -> Optional[str]:
+    """
+    Return the speculative result for this request if the tool query is close
+    enough to the raw query it was started with, otherwise None. The result is
+    handed out once; later searches in the request, from any member, run normally.
+    """
+    speculation = _current.get()
+    if speculation is None:
+        return None
+
+    # Members may search in parallel; only one of them gets the result
+    with speculation._lock:
+        if speculation.taken:
+            return None
+        first_consult = not speculation.consulted
+        speculation.consulted = True
+        if (
+            similarity(tool_query, speculation.query)
+            < config.SPECULATION_MIN_SIMILARITY
+        ):
+            if first_consult:
+                speculation_stats.record("misses")
+            return None
+        speculation.taken = True
+
+    try:
+        result = speculation.future.result(
+            timeout=stage_timeout(config.SPECULATION_WAIT_SECONDS)
+        )
+    except Exception as e:
+        logger.warning(f"Speculative product search failed: {e}")
+        if first_consult:
+            speculation_stats.record("errors")
+        return None
+
+    if result.startswith("Error searching products"):
+        if first_consult:
+            speculation_stats.record("errors")
+        return None
+    if first_consult:
+        speculation_stats.record("hits")
+    speculation.hit = True
+    return result
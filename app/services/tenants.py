@@ -0,0 +1,191 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from weaviate.classes.tenants import TenantActivityStatus
+
+from app.common.vector_database import get_weaviate_client
+from app.config import config
+from app.services.deadlines import stage_timeout
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = {TenantActivityStatus.ACTIVE, TenantActivityStatus.HOT}
+IDLE_STATUSES = ("inactive", "offloaded")
+
+_current: ContextVar[Optional[str]] = ContextVar("catalog_tenant", default=None)
+
+
+def current_tenant() -> str:
+    """Catalog tenant of the current request, DEFAULT_TENANT outside one"""
+    return _current.get() or config.DEFAULT_TENANT
+
+
+@contextmanager
+def tenant_scope(tenant: Optional[str]) -> Iterator[str]:
+    token = _current.set(tenant or config.DEFAULT_TENANT)
+    try:
+        yield current_tenant()
+    finally:
+        _current.reset(token)
+
+
+class UnknownTenant(Exception):
+    """The product collection has no catalog for the requested tenant"""
+
+
+class TenantCatalogs:
+    """
+    Tenant-scoped handles on the product collection, activating tenants on first use
+    and setting those idle for `idle_seconds` to `idle_status`.
+
+    Each worker only tracks the tenants it has served. A tenant another worker
+    still uses may be deactivated here; collections created by
+    scripts.weaviate_ingest_data enable auto tenant activation, so its next query
+    brings it back. A single-tenant collection only serves DEFAULT_TENANT.
+    """
+
+    def __init__(
+        self,
+        collection_name: str,
+        idle_seconds: float,
+        idle_status: str,
+        sweep_interval: float,
+    ):
+        if idle_status not in IDLE_STATUSES:
+            raise ValueError(
+                f"Unknown tenant idle status '{idle_status}' (inactive or offloaded)"
+            )
+        self.collection_name = collection_name
+        self.idle_seconds = idle_seconds
+        self.idle_status = idle_status
+        self.sweep_interval = sweep_interval
+        self._multi_tenant: Optional[bool] = None
+        self._active: Set[str] = set()
+        self._last_used: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.activations = 0
+        self.deactivations = 0
+
+    def collection(self, client, tenant: Optional[str] = None):
+        """The product collection for `tenant`, activated if it was inactive or offloaded"""
+        tenant = tenant or current_tenant()
+        collection = client.collections.get(self.collection_name)
+        if not self._is_multi_tenant(collection):
+            if tenant != config.DEFAULT_TENANT:
+                raise UnknownTenant(
+                    f"'{self.collection_name}' is not multi-tenant; only '{config.DEFAULT_TENANT}' is served"
+                )
+            return collection
+
+        with self._lock:
+            self._last_used[tenant] = time.monotonic()
+            active = tenant in self._active
+        if not active:
+            self._activate(collection, tenant)
+        return collection.with_tenant(tenant)
+
+    def _is_multi_tenant(self, collection) -> bool:
+        if self._multi_tenant is None:
+            self._multi_tenant = bool(
+                collection.config.get().multi_tenancy_config.enabled
+            )
+        return self._multi_tenant
+
+    def _activate(self, collection, tenant: str) -> None:
+        state = collection.tenants.get_by_name(tenant)
+        if state is None:
+            raise UnknownTenant(f"No product catalog for tenant '{tenant}'")
+        if state.activity_status not in ACTIVE_STATUSES:
+            started = time.monotonic()
+            collection.tenants.activate(tenant)
+            # Offloaded tenants are onloaded from cloud storage in the background
+            deadline = started + stage_timeout(config.TENANT_ACTIVATION_TIMEOUT_SECONDS)
+            while state is None or state.activity_status not in ACTIVE_STATUSES:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(
+                        f"Tenant '{tenant}' did not become active in time"
+                    )
+                time.sleep(0.2)
+                state = collection.tenants.get_by_name(tenant)
+            logger.info(
+                f"Activated catalog tenant '{tenant}' in {time.monotonic() - started:.2f}s"
+            )
+            with self._lock:
+                self.activations += 1
+        with self._lock:
+            self._active.add(tenant)
+
+    def sweep(self) -> List[str]:
+        """Deactivate (or offload) the tenants this worker has not used for `idle_seconds`"""
+        cutoff = time.monotonic() - self.idle_seconds
+        with self._lock:
+            idle = [
+                tenant
+                for tenant in self._active
+                if self._last_used.get(tenant, 0.0) < cutoff
+            ]
+        if not idle:
+            return []
+
+        tenants = get_weaviate_client().collections.get(self.collection_name).tenants
+        if self.idle_status == "offloaded":
+            tenants.offload(idle)
+        else:
+            tenants.deactivate(idle)
+
+        with self._lock:
+            for tenant in idle:
+                self._active.discard(tenant)
+            self.deactivations += len(idle)
+        logger.info(
+            f"Set {len(idle)} idle catalog tenants to {self.idle_status}: {', '.join(idle)}"
+        )
+        return idle
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.sweep_interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.warning(f"Idle tenant sweep failed: {e}")
+
+    def start(self) -> None:
+        if self._thread is not None or self.idle_seconds <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="tenant-sweeper", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "collection": self.collection_name,
+                "multi_tenant": self._multi_tenant,
+                "active_tenants": len(self._active),
+                "idle_seconds": self.idle_seconds,
+                "idle_status": self.idle_status,
+                "activations": self.activations,
+                "deactivations": self.deactivations,
+            }
+
+
+tenant_catalogs = TenantCatalogs(
+    config.PRODUCT_COLLECTION,
+    idle_seconds=config.TENANT_IDLE_SECONDS,
+    idle_status=config.TENANT_IDLE_STATUS,
+    sweep_interval=config.TENANT_SWEEP_SECONDS,
+)
@@ -0,0 +1,236 @@
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    __slots__ = (
+        "trace",
+        "span_id",
+        "parent_id",
+        "name",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "error",
+    )
+
+    def __init__(
+        self, trace: "Trace", name: str, parent_id: Optional[str], attributes: Dict
+    ):
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+
+class Trace:
+    """Spans of one request; exported as a single OTLP payload when the root span ends"""
+
+    def __init__(self, profiled: bool = False):
+        self.trace_id = os.urandom(16).hex()
+        self.spans: List[Span] = []
+        self.profiled = profiled
+        # Threads currently working inside this trace, for the per-request profiler
+        self.threads: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def _enter_thread(self) -> None:
+        ident = threading.get_ident()
+        with self._lock:
+            self.threads[ident] = self.threads.get(ident, 0) + 1
+
+    def _exit_thread(self) -> None:
+        ident = threading.get_ident()
+        with self._lock:
+            remaining = self.threads.get(ident, 1) - 1
+            if remaining:
+                self.threads[ident] = remaining
+            else:
+                self.threads.pop(ident, None)
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("trace_span", default=None)
+
+
+def current_trace_id() -> Optional[str]:
+    span = _current_span.get()
+    return span.trace.trace_id if span is not None else None
+
+
+def set_span_attributes(**attributes: Any) -> None:
+    span = _current_span.get()
+    if span is not None:
+        span.attributes.update(attributes)
+
+
+@contextmanager
+def _open(span: Span) -> Iterator[Span]:
+    token = _current_span.set(span)
+    span.trace._enter_thread()
+    try:
+        yield span
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        span.end_ns = time.time_ns()
+        span.trace._exit_thread()
+        span.trace.add(span)
+        _current_span.reset(token)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Child span of the current one; a no-op outside a traced request"""
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+    with _open(Span(parent.trace, name, parent.span_id, attributes)) as child:
+        yield child
+
+
+@contextmanager
+def start_trace(
+    name: str, profiled: bool = False, **attributes: Any
+) -> Iterator[Optional[Span]]:
+    """Root span of a request; exported on exit if tracing is enabled and the trace is sampled"""
+    sampled = (
+        config.TRACE_EXPORT != "none" and random.random() < config.TRACE_SAMPLE_RATE
+    )
+    if not sampled and not profiled:
+        yield None
+        return
+
+    trace = Trace(profiled=profiled)
+    try:
+        with _open(Span(trace, name, None, attributes)) as root:
+            yield root
+    finally:
+        if sampled:
+            exporter.submit(trace)
+
+
+def _attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+def to_otlp(trace: Trace) -> Dict[str, Any]:
+    """OTLP/JSON (ExportTraceServiceRequest) payload for one trace"""
+    spans = []
+    for item in trace.spans:
+        otlp_span = {
+            "traceId": trace.trace_id,
+            "spanId": item.span_id,
+            "name": item.name,
+            "kind": 1,
+            "startTimeUnixNano": str(item.start_ns),
+            "endTimeUnixNano": str(item.end_ns or item.start_ns),
+            "attributes": [_attribute(k, v) for k, v in item.attributes.items()],
+            "status": {"code": 2, "message": item.error} if item.error else {"code": 1},
+        }
+        if item.parent_id:
+            otlp_span["parentSpanId"] = item.parent_id
+        spans.append(otlp_span)
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        _attribute("service.name", config.TRACE_SERVICE_NAME)
+                    ]
+                },
+                "scopeSpans": [{"scope": {"name": __name__}, "spans": spans}],
+            }
+        ]
+    }
+
+
+class TraceExporter:
+    """Writes finished traces off the request path, as JSON lines or to an OTLP/HTTP collector"""
+
+    def __init__(self, max_pending: int = 1000):
+        self._queue: "queue.Queue[Trace]" = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.exported = 0
+        self.dropped = 0
+
+    def submit(self, trace: Trace) -> None:
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="trace-exporter", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        client = httpx.Client(timeout=5.0) if config.TRACE_EXPORT == "otlp" else None
+        while True:
+            payload = to_otlp(self._queue.get())
+            try:
+                if client is not None:
+                    client.post(
+                        config.TRACE_OTLP_ENDPOINT, json=payload
+                    ).raise_for_status()
+                else:
+                    os.makedirs(
+                        os.path.dirname(config.TRACE_FILE) or ".", exist_ok=True
+                    )
+                    with open(config.TRACE_FILE, "a", encoding="utf-8") as trace_file:
+                        trace_file.write(json.dumps(payload, ensure_ascii=False) + "\n")
+                self.exported += 1
+            except Exception as e:
+                self.dropped += 1
+                logger.warning(f"Could not export trace: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "export": config.TRACE_EXPORT,
+            "exported": self.exported,
+            "dropped": self.dropped,
+            "pending": self._queue.qsize(),
+        }
+
+
+exporter = TraceExporter()
@@ -0,0 +1,56 @@
+import logging
+from typing import Any, List
+
+from app.schemas.requests.query import ModelCallUsage, UsageReport
+
+logger = logging.getLogger(__name__)
+
+
+def _calls_from_metrics(name: str, metrics: Any) -> List[ModelCallUsage]:
+    """agno run metrics hold one list entry per model call"""
+    if not metrics:
+        return []
+    input_tokens = metrics.get("input_tokens") or []
+    output_tokens = metrics.get("output_tokens") or []
+    cached_tokens = metrics.get("cached_tokens") or []
+    calls = []
+    for index, prompt in enumerate(input_tokens):
+        calls.append(
+            ModelCallUsage(
+                agent_name=name,
+                input_tokens=prompt or 0,
+                output_tokens=output_tokens[index] if index < len(output_tokens) else 0,
+                cached_tokens=cached_tokens[index] if index < len(cached_tokens) else 0,
+            )
+        )
+    return calls
+
+
+def collect_usage(team_response: Any) -> UsageReport:
+    """Per-call token usage of a team run, including its member runs"""
+    calls = _calls_from_metrics(
+        getattr(team_response, "team_name", None) or "team",
+        getattr(team_response, "metrics", None),
+    )
+    for member_response in getattr(team_response, "member_responses", None) or []:
+        name = (
+            getattr(member_response, "agent_name", None)
+            or getattr(member_response, "team_name", None)
+            or "member"
+        )
+        calls.extend(
+            _calls_from_metrics(name, getattr(member_response, "metrics", None))
+        )
+
+    report = UsageReport(
+        calls=calls,
+        input_tokens=sum(call.input_tokens for call in calls),
+        output_tokens=sum(call.output_tokens for call in calls),
+        cached_tokens=sum(call.cached_tokens for call in calls),
+    )
+    for call in calls:
+        logger.info(
+            f"model call [{call.agent_name}] input={call.input_tokens} "
+            f"cached={call.cached_tokens} output={call.output_tokens}"
+        )
+    return report
@@ -0,0 +1,245 @@
+import logging
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from openai import APIStatusError
+from sqlalchemy import text
+
+from app.agents.registry import registry
+from app.agents.sales_assistants.custom_tools.search import search_products
+from app.common.database import get_engine
+from app.common.llm_models import get_openai_client
+from app.common.vector_database import embedder, get_weaviate_client
+from app.config import config
+from app.services.deadlines import (
+    Deadline,
+    check_deadline,
+    deadline_scope,
+    stage_timeout,
+)
+from app.services.entity_cache import entity_cache
+
+logger = logging.getLogger(__name__)
+
+STEPS = ("database", "openai", "caches", "retrieval")
+
+# Tools whose argument is worth warming, and the name of that argument
+HISTORY_TOOLS = {
+    "lookup_person": "name",
+    "lookup_organization": "name",
+    "search_knowledge_base": "query",
+}
+
+
+def _tool_calls(run: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Tool calls of a stored team run, the team's own and its members'"""
+    yield from run.get("tools") or []
+    for member in run.get("member_responses") or []:
+        if isinstance(member, dict):
+            yield from member.get("tools") or []
+
+
+def frequent_tool_arguments(
+    days: float, limit: int, sessions: int = 1000
+) -> Dict[str, List[str]]:
+    """The `limit` most frequent arguments of each HISTORY_TOOLS tool in recent team_sessions"""
+    since = int(time.time() - days * 86400)
+    query = text("""
+        SELECT memory
+        FROM team_sessions
+        WHERE created_at >= :since AND memory ? 'runs'
+        ORDER BY created_at DESC
+        LIMIT :sessions
+        """)
+    counts: Dict[str, Counter] = {tool: Counter() for tool in HISTORY_TOOLS}
+    with get_engine().connect() as connection:
+        for (memory,) in connection.execute(
+            query, {"since": since, "sessions": sessions}
+        ):
+            for run in (memory or {}).get("runs") or []:
+                if not isinstance(run, dict):
+                    continue
+                for call in _tool_calls(run):
+                    argument = HISTORY_TOOLS.get(call.get("tool_name"))
+                    value = (
+                        (call.get("tool_args") or {}).get(argument)
+                        if argument
+                        else None
+                    )
+                    if isinstance(value, str) and value.strip():
+                        counts[call["tool_name"]][value.strip()] += 1
+    return {
+        tool: [value for value, _ in counter.most_common(limit)]
+        for tool, counter in counts.items()
+    }
+
+
+class WarmUp:
+    """
+    Startup warm-up, run in the background once the app is up. /health reports the
+    worker as not ready until it has finished, so load balancers only route to warm
+    workers.
+
+    With AGENT_STARTUP=eager the pool of orchestrator Teams is built first. Then,
+    per `steps`: "database" opens and pings pooled Postgres connections, "openai"
+    opens keep-alive connections to the OpenAI API, "caches" fills the entity cache
+    with the most frequent lookups of recent team sessions and "retrieval" connects the
+    shared Weaviate client and runs one product search (the most frequent recent one,
+    or WARMUP_PROBE_QUERY). A failed step is logged and reported but does not keep
+    the worker out of rotation.
+    """
+
+    def __init__(
+        self, steps: List[str], timeout: float, top_queries: int, history_days: float
+    ):
+        unknown = [step for step in steps if step not in STEPS]
+        if unknown:
+            raise ValueError(
+                f"Unknown warm-up steps {unknown}; use any of {', '.join(STEPS)}"
+            )
+        self.steps = steps
+        self.timeout = timeout
+        self.top_queries = top_queries
+        self.history_days = history_days
+        self._timings: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+        self._history: Optional[Dict[str, List[str]]] = None
+        self._warmed: Dict[str, int] = {}
+        self._done = threading.Event()
+        self._deadline: Optional[Deadline] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set()
+
+    def _plan(self) -> List[Tuple[str, Callable[[], None]]]:
+        plan = [("agents", registry.warm)] if config.AGENT_STARTUP == "eager" else []
+        steps = {
+            "database": self._warm_database,
+            "openai": self._warm_openai,
+            "caches": self._warm_caches,
+            "retrieval": self._warm_retrieval,
+        }
+        return plan + [(step, steps[step]) for step in self.steps]
+
+    def run(self) -> None:
+        self._deadline = Deadline(self.timeout)
+        try:
+            with deadline_scope(self._deadline):
+                for name, step in self._plan():
+                    if self._deadline.expired:
+                        self._errors[name] = "skipped, warm-up timed out or stopped"
+                        continue
+                    started = time.perf_counter()
+                    try:
+                        step()
+                    except Exception as e:
+                        self._errors[name] = str(e)
+                        logger.warning(f"Warm-up step '{name}' failed: {e}")
+                    self._timings[name] = time.perf_counter() - started
+        finally:
+            self._done.set()
+            logger.info(
+                f"Warm-up finished in {sum(self._timings.values()):.2f}s: {self.stats()['steps_ms']}"
+            )
+
+    def _recent(self) -> Dict[str, List[str]]:
+        if self._history is None:
+            self._history = frequent_tool_arguments(self.history_days, self.top_queries)
+        return self._history
+
+    def _warm_database(self) -> None:
+        engine = get_engine()
+        connections = []
+        try:
+            # Held at once so the pool really opens that many connections
+            for _ in range(min(config.WARMUP_DB_CONNECTIONS, engine.pool.size())):
+                check_deadline("warm-up database")
+                connection = engine.connect()
+                connections.append(connection)
+                connection.execute(text("SELECT 1"))
+        finally:
+            for connection in connections:
+                connection.close()
+        self._warmed["db_connections"] = len(connections)
+
+    def _warm_openai(self) -> None:
+        client = get_openai_client()
+        count = config.WARMUP_OPENAI_CONNECTIONS
+
+        def connect(_) -> None:
+            try:
+                client.models.retrieve(embedder.id)
+            except APIStatusError:
+                pass  # Any answer means the connection is open
+
+        # Concurrent requests each take their own pooled connection (and TLS handshake)
+        with ThreadPoolExecutor(
+            max_workers=count, thread_name_prefix="warm-up-openai"
+        ) as pool:
+            list(pool.map(connect, range(count)))
+        self._warmed["openai_connections"] = count
+
+    def _warm_caches(self) -> None:
+        if not entity_cache.wait_listening(stage_timeout(10.0)):
+            raise RuntimeError("Entity cache is not listening, nothing would be cached")
+        history = self._recent()
+        for name in history["lookup_person"]:
+            check_deadline("warm-up caches")
+            entity_cache.find_persons(name)
+        for name in history["lookup_organization"]:
+            check_deadline("warm-up caches")
+            entity_cache.find_organizations(name)
+        self._warmed["entity_lookups"] = len(history["lookup_person"]) + len(
+            history["lookup_organization"]
+        )
+
+    def _warm_retrieval(self) -> None:
+        if config.PRODUCT_SEARCH_BACKEND == "weaviate":
+            # Searches share this client, so its HTTP and gRPC connections stay open
+            get_weaviate_client()
+        try:
+            queries = self._recent()["search_knowledge_base"]
+        except Exception as e:
+            logger.warning(f"No search history for warm-up, using the probe query: {e}")
+            queries = []
+        result = search_products(queries[0] if queries else config.WARMUP_PROBE_QUERY)
+        if result.startswith("Error searching products"):
+            raise RuntimeError(result)
+        self._warmed["searches"] = 1
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self.run, name="warm-up", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._deadline is not None:
+            self._deadline.cancel("Shutting down")
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "steps_ms": {
+                name: round(seconds * 1000, 1)
+                for name, seconds in self._timings.items()
+            },
+            "warmed": dict(self._warmed),
+            "errors": dict(self._errors),
+        }
+
+
+warmup = WarmUp(
+    [step.strip() for step in config.WARMUP_STEPS.split(",") if step.strip()],
+    timeout=config.WARMUP_TIMEOUT_SECONDS,
+    top_queries=config.WARMUP_TOP_QUERIES,
+    history_days=config.WARMUP_HISTORY_DAYS,
+)
@@ -0,0 +1,183 @@
+"""
+Seed a disposable database and build the local product index for load tests.
+
+    OPENAI_BASE_URL=http://127.0.0.1:8900/v1 python -m scripts.bench_fixtures \\
+        --organizations 200 --persons 1000 --index data/product_index
+
+Run against a throwaway Postgres (scripts.loadtest starts one with docker): rows named
+"Bench …" are replaced, other rows are left alone. Product embeddings come from
+whatever OPENAI_BASE_URL points at, normally scripts/openai_stub.py.
+"""
+
+import argparse
+import os
+import random
+
+from sqlalchemy import text
+
+from app.common.database import get_engine
+from app.common.local_vector_index import write_snapshot
+from app.common.vector_database import embedder
+from app.config import config
+from app.services.digests import refresh_digests
+from scripts.product_chunker import chunk_catalog
+
+PRODUCT_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "product_data", "example_products.txt"
+)
+
+CREATE_ENTITY_TABLES = """
+CREATE TABLE IF NOT EXISTS organizations (
+    id SERIAL PRIMARY KEY,
+    organization_name TEXT NOT NULL,
+    company_overview TEXT,
+    business_activities TEXT,
+    history TEXT,
+    group_companies TEXT,
+    major_business_partners TEXT,
+    sales_trends TEXT,
+    president_message TEXT,
+    interview_articles TEXT,
+    past_transactions TEXT
+);
+CREATE TABLE IF NOT EXISTS persons (
+    id SERIAL PRIMARY KEY,
+    person_name TEXT NOT NULL,
+    title TEXT,
+    career_history TEXT,
+    current_activities TEXT,
+    publications TEXT,
+    organization_id INTEGER REFERENCES organizations(id)
+);
+"""
+
+WORDS = (
+    "manufacturing logistics software retail energy consulting robotics sensors "
+    "export partnership subsidiary revenue growth acquisition platform research "
+    "customers supply quality automation regional market service digital"
+).split()
+
+
+def filler(rng: random.Random, sentences: int) -> str:
+    return " ".join(
+        " ".join(rng.choice(WORDS) for _ in range(12)).capitalize() + "."
+        for _ in range(sentences)
+    )
+
+
+def seed_entities(organizations: int, persons: int, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    with get_engine().begin() as connection:
+        for statement in CREATE_ENTITY_TABLES.split(";"):
+            if statement.strip():
+                connection.execute(text(statement))
+        connection.execute(text("DELETE FROM persons WHERE person_name LIKE 'Bench %'"))
+        connection.execute(
+            text("DELETE FROM organizations WHERE organization_name LIKE 'Bench %'")
+        )
+
+        organization_ids = []
+        for index in range(organizations):
+            organization_ids.append(
+                connection.execute(
+                    text("""
+                        INSERT INTO organizations (
+                            organization_name, company_overview, business_activities, history,
+                            group_companies, major_business_partners, sales_trends,
+                            president_message, interview_articles, past_transactions
+                        ) VALUES (
+                            :name, :overview, :activities, :history, :group_companies,
+                            :partners, :sales, :message, :interviews, :transactions
+                        ) RETURNING id
+                        """),
+                    {
+                        "name": f"Bench Org {index}",
+                        "overview": filler(rng, 6),
+                        "activities": filler(rng, 4),
+                        "history": filler(rng, 5),
+                        "group_companies": filler(rng, 2),
+                        "partners": filler(rng, 2),
+                        "sales": filler(rng, 3),
+                        "message": filler(rng, 4),
+                        "interviews": filler(rng, 6),
+                        "transactions": filler(rng, 3),
+                    },
+                ).scalar_one()
+            )
+
+        for index in range(persons):
+            connection.execute(
+                text("""
+                    INSERT INTO persons (
+                        person_name, title, career_history, current_activities,
+                        publications, organization_id
+                    ) VALUES (:name, :title, :career, :activities, :publications, :organization_id)
+                    """),
+                {
+                    "name": f"Bench Person {index}",
+                    "title": rng.choice(
+                        ["CEO", "CTO", "Director", "Manager", "Engineer"]
+                    ),
+                    "career": filler(rng, 4),
+                    "activities": filler(rng, 2),
+                    "publications": filler(rng, 1),
+                    "organization_id": (
+                        rng.choice(organization_ids) if organization_ids else None
+                    ),
+                },
+            )
+
+
+def parse_products(copies: int = 1) -> list:
+    """Section chunks of the catalog as index records (without vectors), as ingest produces them"""
+    with open(PRODUCT_FILE, "r", encoding="utf-8") as f:
+        chunks = chunk_catalog(f.read())
+
+    records = []
+    for copy in range(copies):
+        for chunk in chunks:
+            record = dict(chunk)
+            if copy:
+                record["source"] = f"{chunk['source']} #{copy}"
+            records.append(record)
+    return records
+
+
+def build_index(path: str, copies: int = 1, batch_size: int = 64) -> int:
+    records = parse_products(copies)
+    for start in range(0, len(records), batch_size):
+        batch = records[start : start + batch_size]
+        response = embedder.response(text=[record["content"] for record in batch])
+        for item in response.data:
+            batch[item.index]["vector"] = item.embedding
+    write_snapshot(path, records)
+    return len(records)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--organizations", type=int, default=200)
+    parser.add_argument("--persons", type=int, default=1000)
+    parser.add_argument("--index", default=config.LOCAL_INDEX_PATH)
+    parser.add_argument(
+        "--product-copies",
+        type=int,
+        default=1,
+        help="Repeat the catalog to grow the index",
+    )
+    parser.add_argument("--skip-db", action="store_true")
+    args = parser.parse_args()
+
+    if not config.OPENAI_BASE_URL:
+        print("⚠️  OPENAI_BASE_URL is not set; this would embed with the real API")
+        raise SystemExit(1)
+
+    if not args.skip_db:
+        seed_entities(args.organizations, args.persons)
+        refreshed = refresh_digests()
+        print(
+            f"✅ Seeded {args.organizations} organizations and {args.persons} persons "
+            f"({refreshed['organizations']} + {refreshed['persons']} digests)"
+        )
+    count = build_index(args.index, copies=args.product_copies)
+    print(f"✅ Published a snapshot of {count} product chunks in {args.index}")
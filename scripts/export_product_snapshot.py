@@ -0,0 +1,77 @@
+"""
+Export the product collection (vectors and properties) into a local search snapshot.
+
+    python -m scripts.export_product_snapshot
+    python -m scripts.export_product_snapshot --tenant team_a
+
+Running API workers with PRODUCT_SEARCH_BACKEND=local pick up the new epoch within
+LOCAL_INDEX_RELOAD_SECONDS. weaviate_ingest_data.py calls this after every ingest.
+"""
+
+import argparse
+from typing import Optional
+
+from weaviate.client import WeaviateClient
+
+from app.common.local_vector_index import snapshot_directory, write_snapshot
+from app.common.product_attributes import ATTRIBUTE_NAMES
+from app.config import config
+
+PROPERTIES = [
+    "content",
+    "source",
+    "section",
+    "product_id",
+    "website",
+    "pdf_urls",
+    "image_urls",
+    "youtube_urls",
+] + ATTRIBUTE_NAMES
+
+
+def export_snapshot(
+    client: WeaviateClient,
+    collection_name: str,
+    directory: str,
+    tenant: Optional[str] = None,
+) -> int:
+    collection = client.collections.get(collection_name)
+    if tenant:
+        collection = collection.with_tenant(tenant)
+    records = []
+    for obj in collection.iterator(include_vector=True, return_properties=PROPERTIES):
+        vector = (
+            obj.vector.get("default") if isinstance(obj.vector, dict) else obj.vector
+        )
+        if not vector:
+            continue
+        record = {
+            name: obj.properties.get(name) or ""
+            for name in PROPERTIES
+            if name not in ATTRIBUTE_NAMES
+        }
+        # Missing specs stay None, so they are not mistaken for a 0 value
+        record.update({name: obj.properties.get(name) for name in ATTRIBUTE_NAMES})
+        record["vector"] = vector
+        records.append(record)
+    write_snapshot(directory, records)
+    return len(records)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--collection", default=config.PRODUCT_COLLECTION)
+    parser.add_argument("--tenant", help="Tenant of a multi-tenant collection")
+    parser.add_argument(
+        "--output",
+        help="Snapshot directory (default: the tenant's under LOCAL_INDEX_PATH)",
+    )
+    args = parser.parse_args()
+    output = args.output or snapshot_directory(args.tenant)
+
+    client = config.weaviate_client
+    try:
+        count = export_snapshot(client, args.collection, output, tenant=args.tenant)
+        print(f"✅ Exported {count} chunks from '{args.collection}' to {output}")
+    finally:
+        client.close()
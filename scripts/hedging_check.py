@@ -0,0 +1,62 @@
+"""
+Compare model-call latency with and without hedging, against scripts/openai_stub.py.
+
+    OPENAI_BASE_URL=http://127.0.0.1:8900/v1 python -m scripts.hedging_check --calls 200
+"""
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from agno.models.message import Message
+
+from app.common.hedging import llm_calls
+from app.common.llm_models import get_gpt4o_mini_model
+from app.config import config
+
+
+def percentile(samples: list, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run(calls: int, concurrency: int) -> dict:
+    model = get_gpt4o_mini_model()
+    latencies, errors = [], 0
+
+    def one(index: int) -> None:
+        nonlocal errors
+        started = time.monotonic()
+        try:
+            model.invoke([Message(role="user", content=f"ping {index}")])
+            latencies.append(time.monotonic() - started)
+        except Exception:
+            errors += 1
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, range(calls)))
+    return {
+        "ok": len(latencies),
+        "errors": errors,
+        "p50": round(percentile(latencies, 0.50), 3) if latencies else None,
+        "p99": round(percentile(latencies, 0.99), 3) if latencies else None,
+        "max": round(max(latencies), 3) if latencies else None,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    if not config.OPENAI_BASE_URL:
+        print("⚠️  OPENAI_BASE_URL is not set; this would call the real API")
+        raise SystemExit(1)
+
+    config.LLM_HEDGING = False
+    print(f"🐢 Without hedging: {run(args.calls, args.concurrency)}")
+    config.LLM_HEDGING = True
+    print(f"🐇 With hedging:    {run(args.calls, args.concurrency)}")
+    print(json.dumps(llm_calls.stats(), indent=2))
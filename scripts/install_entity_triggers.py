@@ -0,0 +1,9 @@
+from app.services.entity_cache import TRIGGER_NAMES, install_triggers
+
+# One-off migration (re-run after restoring the tables); needs DDL rights on persons,
+# organizations and the digest tables, which it creates if missing
+if __name__ == "__main__":
+    install_triggers()
+    print(
+        f"✅ Installed {len(TRIGGER_NAMES)} entity change triggers and the digest tables"
+    )
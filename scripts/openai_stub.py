@@ -0,0 +1,259 @@
+"""
+OpenAI-compatible stub with injected latency and errors, for exercising retries and hedging.
+
+    python -m scripts.openai_stub --port 8900 --slow-rate 0.05 --slow-delay 6 --error-rate 0.02
+    OPENAI_BASE_URL=http://127.0.0.1:8900/v1 python -m scripts.hedging_check
+
+With --scripted, chat completions drive the agents through a realistic tool-calling
+flow instead of echoing: the coordinator delegates to a member, the member calls its
+search or lookup tool, and once tool results are in, the reply is a minimal JSON
+document matching the requested response schema. Used by scripts.loadtest.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+app = FastAPI(title="OpenAI stub")
+settings = argparse.Namespace(
+    base_delay=0.2,
+    jitter=0.1,
+    distribution="uniform",
+    slow_rate=0.05,
+    slow_delay=6.0,
+    error_rate=0.0,
+    dimensions=1536,
+    scripted=False,
+)
+
+
+def sample_delay() -> float:
+    if settings.distribution == "fixed":
+        return settings.base_delay
+    if settings.distribution == "lognormal":
+        # Median base_delay; jitter is the sigma of the underlying normal
+        return settings.base_delay * math.exp(random.gauss(0, settings.jitter))
+    return settings.base_delay + random.uniform(0, settings.jitter)
+
+
+async def inject_latency() -> JSONResponse | None:
+    delay = sample_delay()
+    if random.random() < settings.slow_rate:
+        delay += settings.slow_delay
+    await asyncio.sleep(delay)
+    if random.random() < settings.error_rate:
+        status = random.choice([429, 500, 503])
+        return JSONResponse(
+            status_code=status,
+            content={"error": {"message": f"Injected {status}", "type": "stub_error"}},
+        )
+    return None
+
+
+def message_text(message: dict) -> str:
+    content = message.get("content") or ""
+    if isinstance(content, list):
+        content = " ".join(part.get("text", "") for part in content)
+    return str(content)
+
+
+def schema_instance(schema: dict, defs: dict, text: str) -> object:
+    """Smallest document satisfying a (strict) JSON schema, with strings echoing `text`"""
+    if "$ref" in schema:
+        return schema_instance(defs[schema["$ref"].split("/")[-1]], defs, text)
+    for key in ("anyOf", "oneOf", "allOf"):
+        if key in schema:
+            options = [option for option in schema[key] if option.get("type") != "null"]
+            return schema_instance((options or schema[key])[0], defs, text)
+    if "enum" in schema:
+        return schema["enum"][0]
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        kind = next((item for item in kind if item != "null"), "null")
+    if kind == "object":
+        return {
+            name: schema_instance(prop, defs, text)
+            for name, prop in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        return [schema_instance(schema.get("items", {}), defs, text)]
+    if kind in ("integer", "number"):
+        return 0
+    if kind == "boolean":
+        return False
+    if kind == "null":
+        return None
+    return text
+
+
+def final_content(body: dict, text: str) -> str:
+    response_format = body.get("response_format") or {}
+    if response_format.get("type") == "json_schema":
+        schema = response_format.get("json_schema", {}).get("schema", {})
+        return json.dumps(
+            schema_instance(schema, schema.get("$defs", {}), text), ensure_ascii=False
+        )
+    if response_format.get("type") == "json_object":
+        return "{}"
+    return text
+
+
+def quoted_subject(text: str) -> str:
+    # Load-test prompts quote the entity or product they ask about
+    match = re.findall(r'"([^"]+)"', text)
+    return match[-1] if match else text[:100]
+
+
+def scripted_tool_call(body: dict, task: str) -> dict | None:
+    """The tool call an agent would make next, or None once it has tool results"""
+    messages = body.get("messages", [])
+    if not messages or messages[-1].get("role") == "tool":
+        return None
+    tools = {
+        tool["function"]["name"]: tool["function"] for tool in body.get("tools") or []
+    }
+    lowered = task.lower()
+    wants_sql = any(
+        word in lowered for word in ("company", "organization", "person", "who is")
+    )
+    subject = quoted_subject(task)
+
+    if "transfer_task_to_member" in tools:
+        name = "transfer_task_to_member"
+        arguments = {
+            "member_id": "sql-agent" if wants_sql else "product-agent",
+            "task_description": task,
+            "expected_output": "A complete answer to the user's question",
+        }
+    elif wants_sql and "person" in lowered and "lookup_person" in tools:
+        name, arguments = "lookup_person", {"name": subject}
+    elif wants_sql and "lookup_organization" in tools:
+        name, arguments = "lookup_organization", {"name": subject}
+    elif "search_knowledge_base" in tools:
+        name, arguments = "search_knowledge_base", {"query": subject}
+    else:
+        return None
+    return {
+        "id": f"call_{uuid.uuid4().hex[:24]}",
+        "type": "function",
+        "function": {
+            "name": name,
+            "arguments": json.dumps(arguments, ensure_ascii=False),
+        },
+    }
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    error = await inject_latency()
+    if error is not None:
+        return error
+
+    messages = body.get("messages") or [{}]
+    user_messages = [m for m in messages if m.get("role") == "user"]
+    task = message_text(user_messages[-1] if user_messages else messages[-1])
+    tool_call = scripted_tool_call(body, task) if settings.scripted else None
+    if tool_call is not None:
+        message = {"role": "assistant", "content": None, "tool_calls": [tool_call]}
+        finish_reason, completion = "tool_calls", tool_call["function"]["arguments"]
+    else:
+        if settings.scripted:
+            content = final_content(body, f"stub answer: {quoted_subject(task)}")
+        else:
+            content = f"stub reply to: {message_text(messages[-1])[:200]}"
+            response_format = body.get("response_format") or {}
+            if response_format.get("type") in ("json_object", "json_schema"):
+                content = "{}"
+        message = {"role": "assistant", "content": content}
+        finish_reason, completion = "stop", content
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub"),
+        "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+        "usage": {
+            "prompt_tokens": len(str(messages)) // 4,
+            "completion_tokens": len(completion) // 4,
+            "total_tokens": (len(str(messages)) + len(completion)) // 4,
+        },
+    }
+
+
+def fake_embedding(text: str, dimensions: int) -> list:
+    # Deterministic unit vector, so identical texts embed identically
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+    rng = random.Random(seed)
+    vector = [rng.gauss(0, 1) for _ in range(dimensions)]
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+
+@app.post("/v1/embeddings")
+async def embeddings(request: Request):
+    body = await request.json()
+    error = await inject_latency()
+    if error is not None:
+        return error
+
+    inputs = body.get("input", [])
+    if isinstance(inputs, str):
+        inputs = [inputs]
+    return {
+        "object": "list",
+        "model": body.get("model", "stub"),
+        "data": [
+            {
+                "object": "embedding",
+                "index": index,
+                # Shortened text-embedding-3 embeddings are requested with `dimensions`
+                "embedding": fake_embedding(
+                    str(text), body.get("dimensions") or settings.dimensions
+                ),
+            }
+            for index, text in enumerate(inputs)
+        ],
+        "usage": {"prompt_tokens": 0, "total_tokens": 0},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--base-delay", type=float, default=settings.base_delay)
+    parser.add_argument("--jitter", type=float, default=settings.jitter)
+    parser.add_argument(
+        "--distribution",
+        choices=["fixed", "uniform", "lognormal"],
+        default=settings.distribution,
+        help="uniform: base + U(0, jitter); lognormal: median base, sigma jitter",
+    )
+    parser.add_argument("--slow-rate", type=float, default=settings.slow_rate)
+    parser.add_argument("--slow-delay", type=float, default=settings.slow_delay)
+    parser.add_argument("--error-rate", type=float, default=settings.error_rate)
+    parser.add_argument("--dimensions", type=int, default=settings.dimensions)
+    parser.add_argument(
+        "--scripted", action="store_true", help="Answer with tool calls"
+    )
+    args = parser.parse_args()
+    for key in vars(settings):
+        setattr(settings, key, getattr(args, key))
+
+    print(
+        f"🧪 OpenAI stub on http://{args.host}:{args.port}/v1 "
+        f"({settings.distribution} latency, slow {settings.slow_rate:.0%} +{settings.slow_delay}s, "
+        f"errors {settings.error_rate:.0%}{', scripted' if settings.scripted else ''})"
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
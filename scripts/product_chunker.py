@@ -0,0 +1,197 @@
+"""
+Section-aware chunking of the product catalog.
+
+A catalog entry is a "Title:" line followed by headed sections (Description,
+Features, Feature Explanations, ...) and link lists (Website, PDF Links, YouTube
+Links, Image Links). Each text section becomes one chunk prefixed with the product
+title; sections shorter than MIN_SECTION_CHARS are merged into the next one and
+longer than MAX_SECTION_CHARS are split at line boundaries, without overlap. Links
+are returned as properties and never embedded, as are the typed attributes
+(category, feature names, numeric specs) from app.common.product_attributes.
+
+    python -m scripts.product_chunker scripts/product_data/example_products.txt
+"""
+
+import argparse
+import re
+from typing import Dict, List, Optional
+
+from app.common.product_attributes import extract_attributes
+
+MIN_SECTION_CHARS = 300
+MAX_SECTION_CHARS = 1500
+
+# Link list heading -> chunk property (newline-separated URLs, as search reads them)
+LINK_HEADINGS = {
+    "website": "website",
+    "pdf links": "pdf_urls",
+    "youtube links": "youtube_urls",
+    "image links": "image_urls",
+}
+LINK_PROPERTIES = list(dict.fromkeys(LINK_HEADINGS.values()))
+
+HEADING = re.compile(r"^([A-Z][A-Za-z ]{1,40}):\s*(.*)$")
+URL = re.compile(r"https?://\S+")
+
+
+def _link_property(url: str) -> str:
+    """Property for a URL found outside a link list"""
+    if "youtube" in url:
+        return "youtube_urls"
+    if url.lower().endswith(".pdf"):
+        return "pdf_urls"
+    if url.lower().endswith((".jpg", ".jpeg", ".png", ".gif", ".webp")):
+        return "image_urls"
+    return "website"
+
+
+def parse_product(text: str, product_id: str) -> Dict:
+    """Title, ordered (heading, body) text sections and links of one catalog entry"""
+    product = {
+        "id": product_id,
+        "title": "",
+        "sections": [],
+        "links": {name: [] for name in LINK_PROPERTIES},
+    }
+    heading: Optional[str] = None
+    body: List[str] = []
+
+    def close_section() -> None:
+        if heading and heading.lower() not in LINK_HEADINGS and "\n".join(body).strip():
+            product["sections"].append((heading, "\n".join(body).strip()))
+
+    for line in text.strip().split("\n"):
+        line = line.strip()
+        match = HEADING.match(line)
+        if match and not URL.match(line):
+            close_section()
+            heading, line = match.group(1).strip(), match.group(2).strip()
+            body = []
+            if heading.lower() == "title":
+                product["title"] = line
+                heading = None
+                continue
+
+        urls = URL.findall(line)
+        if urls:
+            # Link lines are kept out of the embedded text wherever they appear
+            for url in urls:
+                target = LINK_HEADINGS.get((heading or "").lower()) or _link_property(
+                    url
+                )
+                if url not in product["links"][target]:
+                    product["links"][target].append(url)
+            line = URL.sub("", line).strip("- ").strip()
+        if line and line.lower() != "none":
+            body.append(line)
+    close_section()
+    return product
+
+
+def _split(text: str, limit: int) -> List[str]:
+    """Split an oversized section at line (then sentence) boundaries"""
+    pieces: List[str] = []
+    current = ""
+    for unit in (part for line in text.split("\n") for part in _sentences(line, limit)):
+        if current and len(current) + len(unit) + 1 > limit:
+            pieces.append(current)
+            current = unit
+        else:
+            current = f"{current}\n{unit}" if current else unit
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def _sentences(line: str, limit: int) -> List[str]:
+    if len(line) <= limit:
+        return [line]
+    return [sentence for sentence in re.split(r"(?<=[.!?])\s+", line) if sentence]
+
+
+def section_texts(
+    product: Dict,
+    min_chars: int = MIN_SECTION_CHARS,
+    max_chars: int = MAX_SECTION_CHARS,
+) -> List[Dict[str, str]]:
+    """Chunk texts of one product: {"section": heading(s), "content": title-prefixed text}"""
+    merged: List[List] = []
+    for heading, body in product["sections"]:
+        text = f"{heading}: {body}" if "\n" not in body else f"{heading}:\n{body}"
+        if merged and len(merged[-1][1]) < min_chars:
+            merged[-1][0].append(heading)
+            merged[-1][1] += "\n" + text
+        else:
+            merged.append([[heading], text])
+    # A short final section joins the one before it
+    if len(merged) > 1 and len(merged[-1][1]) < min_chars:
+        headings, text = merged.pop()
+        merged[-1][0].extend(headings)
+        merged[-1][1] += "\n" + text
+
+    chunks = []
+    for headings, text in merged:
+        for piece in _split(text, max_chars):
+            chunks.append(
+                {
+                    "section": ", ".join(headings),
+                    "content": (
+                        f"Title: {product['title']}\n{piece}"
+                        if product["title"]
+                        else piece
+                    ),
+                }
+            )
+    return chunks
+
+
+def chunk_catalog(
+    content: str, min_chars: int = MIN_SECTION_CHARS, max_chars: int = MAX_SECTION_CHARS
+) -> List[Dict]:
+    """Chunk properties for every product in a catalog file's text"""
+    chunks = []
+    for index, entry in enumerate(
+        part for part in content.split("---") if part.strip()
+    ):
+        product = parse_product(entry, product_id=f"{index + 1}")
+        texts = section_texts(product, min_chars, max_chars)
+        attributes = extract_attributes(product["title"], product["sections"])
+        for chunk_index, text in enumerate(texts):
+            chunks.append(
+                {
+                    "content": text["content"],
+                    "source": product["title"],
+                    "section": text["section"],
+                    "product_id": product["id"],
+                    "chunk_index": chunk_index,
+                    "total_chunks": len(texts),
+                    **{
+                        name: "\n".join(urls) for name, urls in product["links"].items()
+                    },
+                    **attributes,
+                }
+            )
+    return chunks
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("path")
+    parser.add_argument("--min-chars", type=int, default=MIN_SECTION_CHARS)
+    parser.add_argument("--max-chars", type=int, default=MAX_SECTION_CHARS)
+    args = parser.parse_args()
+
+    with open(args.path, "r", encoding="utf-8") as f:
+        content = f.read()
+    chunks = chunk_catalog(content, args.min_chars, args.max_chars)
+    for chunk in chunks:
+        print(
+            f"--- {chunk['source']} [{chunk['section']}] {len(chunk['content'])} chars"
+        )
+        print(chunk["content"])
+    embedded = sum(len(chunk["content"]) for chunk in chunks)
+    print(
+        f"\n📦 {len(chunks)} chunks, {embedded} embedded chars ({embedded / max(1, len(content)):.0%} of the catalog)"
+    )
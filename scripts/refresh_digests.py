@@ -0,0 +1,9 @@
+from app.services.digests import refresh_digests
+
+# Run after data loads (or from cron); only rows whose content changed are re-summarized
+if __name__ == "__main__":
+    refreshed = refresh_digests()
+    print(
+        f"✅ Refreshed {refreshed['organizations']} organization digests "
+        f"and {refreshed['persons']} person digests"
+    )
@@ -0,0 +1,369 @@
+"""
+Replay real traffic from team_sessions against a running instance and compare builds.
+
+    # 1. Extract anonymized request sequences (needs DB_* settings)
+    python -m scripts.replay extract --days 7 --output logs/replay/sessions.jsonl
+
+    # 2. Replay against each build, 20x faster than real time
+    python -m scripts.replay run --base-url http://old:8000 --speedup 20 \\
+        --input logs/replay/sessions.jsonl --output logs/replay/old.jsonl
+    python -m scripts.replay run --base-url http://new:8000 --speedup 20 \\
+        --input logs/replay/sessions.jsonl --output logs/replay/new.jsonl
+
+    # 3. Compare latency and routing; exits 1 on a regression
+    python -m scripts.replay diff logs/replay/old.jsonl logs/replay/new.jsonl
+
+Per-session order is kept: a request is sent at its (compressed) recorded offset, but
+never before the previous request of the same session has been answered.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import re
+import secrets
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+PHONE = re.compile(r"\+?\d[\d\-\s()]{7,}\d")
+URL = re.compile(r"https?://\S+")
+
+
+def pseudonym(value: str, salt: str, prefix: str) -> str:
+    digest = hmac.new(salt.encode(), value.encode(), hashlib.sha256).hexdigest()
+    return f"{prefix}-{digest[:12]}"
+
+
+def scrub(text: str) -> str:
+    """Drop contact details; entity and product names stay, they drive routing"""
+    text = EMAIL.sub("<email>", text)
+    text = URL.sub("<url>", text)
+    return PHONE.sub("<phone>", text)
+
+
+def _user_text(run: Dict[str, Any]) -> str:
+    for message in run.get("messages") or []:
+        if message.get("role") == "user" and not message.get("from_history"):
+            content = message.get("content")
+            if isinstance(content, list):
+                content = " ".join(
+                    part.get("text", "") for part in content if isinstance(part, dict)
+                )
+            return str(content or "")
+    return ""
+
+
+def _recorded_routing(run: Dict[str, Any]) -> List[str]:
+    """Members the orchestrator actually delegated to in the recorded run"""
+    members = [
+        (tool.get("tool_args") or {}).get("member_id")
+        for tool in run.get("tools") or []
+        if tool.get("tool_name") == "transfer_task_to_member"
+    ]
+    if not any(members):
+        members = [
+            member.get("agent_name") for member in run.get("member_responses") or []
+        ]
+    if not any(members):
+        content = run.get("content")
+        members = content.get("agents_used", []) if isinstance(content, dict) else []
+    return sorted({member for member in members if member})
+
+
+def extract(args: argparse.Namespace) -> None:
+    # Imported here so `run` and `diff` work without database settings
+    from sqlalchemy import text
+
+    from app.common.database import get_engine
+
+    salt = args.salt or secrets.token_hex(16)
+    since = int(time.time() - args.days * 86400)
+    query = text(f"""
+        SELECT session_id, user_id, memory
+        FROM {args.table}
+        WHERE created_at >= :since AND memory ? 'runs'
+        ORDER BY created_at
+        LIMIT :limit
+        """)
+    sessions, requests = 0, 0
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with (
+        get_engine().connect() as connection,
+        open(args.output, "w", encoding="utf-8") as output,
+    ):
+        for session_id, user_id, memory in connection.execute(
+            query, {"since": since, "limit": args.limit}
+        ):
+            runs = [
+                run
+                for run in (memory or {}).get("runs") or []
+                if isinstance(run, dict) and run.get("created_at") and _user_text(run)
+            ]
+            runs.sort(key=lambda run: run["created_at"])
+            if not runs:
+                continue
+            started = runs[0]["created_at"]
+            output.write(
+                json.dumps(
+                    {
+                        "session": pseudonym(session_id, salt, "s"),
+                        "user": pseudonym(user_id or "anonymous", salt, "u"),
+                        "start": started,
+                        "requests": [
+                            {
+                                "offset": run["created_at"] - started,
+                                "query": scrub(_user_text(run)),
+                                "routing": _recorded_routing(run),
+                            }
+                            for run in runs
+                        ],
+                    },
+                    ensure_ascii=False,
+                )
+                + "\n"
+            )
+            sessions += 1
+            requests += len(runs)
+    print(f"✅ Extracted {requests} requests from {sessions} sessions to {args.output}")
+
+
+def _routing(body: Dict[str, Any]) -> List[str]:
+    """Members that made model calls, falling back to the orchestrator's own report"""
+    calls = (body.get("usage") or {}).get("calls") or []
+    members = {call.get("agent_name") for call in calls} - {
+        None,
+        "team",
+        "orchestrator_agent",
+    }
+    if not members:
+        members = set(
+            (body.get("orchestrator_response") or {}).get("agents_used") or []
+        )
+    return sorted(members)
+
+
+async def replay_session(
+    client: httpx.AsyncClient,
+    session: Dict[str, Any],
+    clock_start: float,
+    session_offset: float,
+    args: argparse.Namespace,
+    results: List[Dict[str, Any]],
+) -> None:
+    # A fresh session id per replay run keeps history from earlier replays out
+    session_id = f"replay-{args.label}-{session['session']}"
+    previous = 0.0
+    for index, request in enumerate(session["requests"]):
+        gap = min(request["offset"] - previous, args.max_gap)
+        previous = request["offset"]
+        session_offset += gap / args.speedup
+        delay = clock_start + session_offset - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        started = time.monotonic()
+        result = {
+            "session": session["session"],
+            "index": index,
+            "recorded_routing": request.get("routing", []),
+        }
+        try:
+            response = await client.post(
+                "/query",
+                json={
+                    "query": request["query"],
+                    "user_id": session["user"],
+                    "session_id": session_id,
+                },
+            )
+            result["status"] = response.status_code
+            if response.status_code == 200:
+                body = response.json()
+                result["routing"] = _routing(body)
+                result["partial"] = body.get("partial", False)
+        except httpx.HTTPError as e:
+            result["status"] = type(e).__name__
+        result["latency_ms"] = round((time.monotonic() - started) * 1000, 1)
+        results.append(result)
+
+
+async def run_replay(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    with open(args.input, "r", encoding="utf-8") as f:
+        sessions = [json.loads(line) for line in f if line.strip()]
+    sessions.sort(key=lambda session: session["start"])
+    if args.sessions:
+        sessions = sessions[: args.sessions]
+
+    # Sessions start at their recorded offsets too, with idle gaps capped the same way
+    offsets, offset = [], 0.0
+    for index, session in enumerate(sessions):
+        if index:
+            offset += min(session["start"] - sessions[index - 1]["start"], args.max_gap)
+        offsets.append(offset / args.speedup)
+
+    results: List[Dict[str, Any]] = []
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=args.timeout
+    ) as client:
+        clock_start = time.monotonic()
+        await asyncio.gather(
+            *(
+                replay_session(client, session, clock_start, offset, args, results)
+                for session, offset in zip(sessions, offsets)
+            )
+        )
+    return results
+
+
+def run(args: argparse.Namespace) -> None:
+    results = asyncio.run(run_replay(args))
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as output:
+        for result in sorted(
+            results, key=lambda item: (item["session"], item["index"])
+        ):
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+    print(
+        f"✅ Replayed {len(results)} requests against {args.base_url}: {summarize(results)}"
+    )
+
+
+def percentile(samples: List[float], fraction: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    latencies = [result["latency_ms"] for result in results if result["status"] == 200]
+    # How often routing matches what production did when the session was recorded
+    comparable = [
+        r for r in results if r.get("routing") is not None and r.get("recorded_routing")
+    ]
+    matches = sum(1 for r in comparable if r["routing"] == r["recorded_routing"])
+    return {
+        "requests": len(results),
+        "statuses": dict(Counter(str(result["status"]) for result in results)),
+        "partial": sum(1 for result in results if result.get("partial")),
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+        "matches_recorded_routing": (
+            round(matches / len(comparable), 3) if comparable else None
+        ),
+    }
+
+
+def _load(path: str) -> Dict[tuple, Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        return {
+            (result["session"], result["index"]): result
+            for result in (json.loads(line) for line in f if line.strip())
+        }
+
+
+def diff(args: argparse.Namespace) -> None:
+    baseline, candidate = _load(args.baseline), _load(args.candidate)
+    before = summarize(list(baseline.values()))
+    after = summarize(list(candidate.values()))
+    print(f"📊 baseline:  {before}")
+    print(f"📊 candidate: {after}")
+
+    regressions = []
+    for key in ("p50_ms", "p95_ms", "p99_ms"):
+        if before[key] and after[key]:
+            change = after[key] / before[key] - 1
+            print(f"   {key}: {before[key]} → {after[key]} ({change:+.1%})")
+            if key == "p95_ms" and change > args.max_p95_regression:
+                regressions.append(f"p95 latency up {change:.1%}")
+
+    def error_rate(summary: Dict[str, Any]) -> float:
+        ok = summary["statuses"].get("200", 0)
+        return 1 - ok / summary["requests"] if summary["requests"] else 0.0
+
+    if error_rate(after) > error_rate(before) + args.max_error_increase:
+        regressions.append(
+            f"error rate {error_rate(before):.1%} → {error_rate(after):.1%}"
+        )
+
+    both = [
+        (baseline[key], candidate[key])
+        for key in baseline.keys() & candidate.keys()
+        if "routing" in baseline[key] and "routing" in candidate[key]
+    ]
+    changed = [(old, new) for old, new in both if old["routing"] != new["routing"]]
+    transitions = Counter(
+        (" + ".join(old["routing"]) or "none", " + ".join(new["routing"]) or "none")
+        for old, new in changed
+    )
+    if both:
+        agreement = 1 - len(changed) / len(both)
+        print(f"🧭 Routing agreement: {agreement:.1%} over {len(both)} requests")
+        for (old, new), count in transitions.most_common(10):
+            print(f"   {count:>4}× {old} → {new}")
+        if agreement < args.min_routing_agreement:
+            regressions.append(f"routing agreement {agreement:.1%}")
+
+    if regressions:
+        print(f"❌ Regressions: {'; '.join(regressions)}")
+        raise SystemExit(1)
+    print("✅ No regressions")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    extract_parser = commands.add_parser(
+        "extract", help="Build a replay file from team_sessions"
+    )
+    extract_parser.add_argument("--output", default="logs/replay/sessions.jsonl")
+    extract_parser.add_argument("--days", type=float, default=7)
+    extract_parser.add_argument(
+        "--limit", type=int, default=1000, help="Maximum sessions"
+    )
+    extract_parser.add_argument("--table", default="team_sessions")
+    extract_parser.add_argument(
+        "--salt", help="Keeps pseudonyms stable across extractions"
+    )
+    extract_parser.set_defaults(handler=extract)
+
+    run_parser = commands.add_parser(
+        "run", help="Replay a file against a running instance"
+    )
+    run_parser.add_argument("--base-url", required=True)
+    run_parser.add_argument("--input", default="logs/replay/sessions.jsonl")
+    run_parser.add_argument("--output", required=True)
+    run_parser.add_argument(
+        "--speedup", type=float, default=1.0, help="Time compression factor"
+    )
+    run_parser.add_argument(
+        "--max-gap", type=float, default=300.0, help="Cap on recorded idle gaps (s)"
+    )
+    run_parser.add_argument(
+        "--sessions", type=int, help="Replay only the first N sessions"
+    )
+    run_parser.add_argument("--timeout", type=float, default=120.0)
+    run_parser.add_argument("--label", default=time.strftime("%Y%m%d%H%M%S"))
+    run_parser.set_defaults(handler=run)
+
+    diff_parser = commands.add_parser("diff", help="Compare two replay results")
+    diff_parser.add_argument("baseline")
+    diff_parser.add_argument("candidate")
+    diff_parser.add_argument("--max-p95-regression", type=float, default=0.2)
+    diff_parser.add_argument("--max-error-increase", type=float, default=0.02)
+    diff_parser.add_argument("--min-routing-agreement", type=float, default=0.9)
+    diff_parser.set_defaults(handler=diff)
+
+    args = parser.parse_args()
+    args.handler(args)
@@ -0,0 +1,613 @@
+"""
+Retrieval benchmark: synthetic catalogs, query latency, QPS and recall@k per search method.
+
+    python -m scripts.retrieval_bench --sizes 1000,10000,100000 --concurrency 1,4,16
+    python -m scripts.retrieval_bench --sizes 1000 --embeddings openai   # also near_text
+
+    # Compression / HNSW settings against the uncompressed baseline
+    python -m scripts.retrieval_bench --sizes 100000 --dimensions 1536 --methods near_vector \
+        --settings baseline,dims=768,dims=512,pq,bq,sq,dims=512+sq,ef=64,m=16+efc=64
+
+Settings are "+"-joined tokens: dims=N (shortened embeddings, i.e. truncated and
+renormalized), pq / bq / sq quantization, ef=N, efc=N (efConstruction), m=N
+(maxConnections). Each gets its own collection; recall is always measured against the
+exact top-k of the full, uncompressed vectors.
+
+Catalogs are generated from the sections in product_data/example_products.txt: each
+synthetic product is a template section renamed into a product "series", and chunks
+of one series share a vector neighbourhood. With --embeddings synthetic (default) the
+vectors are generated locally, so 10^6 chunks ingest without embedding calls; near_text
+needs real embeddings and only runs with --embeddings openai (OPENAI_BASE_URL may point
+at scripts/openai_stub.py, whose embeddings are deterministic).
+
+Ground truth is exact cosine top-k over all stored vectors. Each run appends one JSON
+line per (size, method) to --output, so results can be tracked across commits.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import httpx
+import numpy as np
+import weaviate.classes.config as wc
+
+from app.common.vector_database import (
+    PQ_DIMENSIONS_PER_SEGMENT,
+    embedder,
+    product_vector_index_config,
+    product_vectorizer_config,
+)
+from app.config import config
+
+PRODUCT_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "product_data", "example_products.txt"
+)
+METHODS = ("near_vector", "hybrid", "bm25", "near_text")
+SERIES_SIZE = 20  # chunks per synthetic product series
+ADJECTIVES = "Nova Apex Terra Zen Flux Orbit Prime Vivid Echo Pulse Aero Luma".split()
+
+
+def load_templates() -> List[Dict[str, str]]:
+    with open(PRODUCT_FILE, "r", encoding="utf-8") as f:
+        sections = [
+            section.strip() for section in f.read().split("---") if section.strip()
+        ]
+    templates = []
+    for section in sections:
+        lines = section.split("\n")
+        title = next(
+            (line[7:] for line in lines if line.startswith("Title: ")), "Product"
+        )
+        body = "\n".join(line for line in lines if not line.startswith("Title: "))
+        templates.append({"title": title, "body": body})
+    return templates
+
+
+def series_name(templates: List[Dict[str, str]], series: int) -> str:
+    template = templates[series % len(templates)]
+    return f"{ADJECTIVES[series % len(ADJECTIVES)]} {template['title']} S{series}"
+
+
+def chunk_text(
+    templates: List[Dict[str, str]], series: int, index: int, seed: int
+) -> str:
+    # Seeded per chunk, so every collection built from a catalog holds identical texts
+    rng = random.Random(seed * 1_000_003 + index)
+    template = templates[series % len(templates)]
+    lines = template["body"].split("\n")
+    # Variants differ in which lines they keep, so BM25 scores are not all ties
+    kept = [line for line in lines if rng.random() < 0.7] or lines
+    return f"Title: {series_name(templates, series)} (variant {index})\n" + "\n".join(
+        kept
+    )
+
+
+class Catalog:
+    """Synthetic chunks, their vectors, and the per-series centres queries are drawn from"""
+
+    def __init__(self, size: int, dimensions: int, seed: int):
+        self.size = size
+        self.seed = seed
+        self.templates = load_templates()
+        self.series_count = max(1, size // SERIES_SIZE)
+        self.np_rng = np.random.default_rng(seed)
+        # Queries draw from their own generators, so they do not depend on what was ingested
+        self.query_rng = random.Random(seed + 1)
+        self.query_np_rng = np.random.default_rng(seed + 1)
+        self.centres = self._normalize(
+            self.np_rng.standard_normal((self.series_count, dimensions))
+        )
+        self.series = np.arange(size) % self.series_count
+        self.vectors: Optional[np.ndarray] = None
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        matrix = matrix.astype(np.float32)
+        return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+    def synthetic_vectors(self, noise: float) -> np.ndarray:
+        jitter = self.np_rng.standard_normal((self.size, self.centres.shape[1]))
+        # Scaled so `noise` is the expected jitter length relative to the unit centre
+        jitter /= np.sqrt(self.centres.shape[1])
+        self.vectors = self._normalize(self.centres[self.series] + noise * jitter)
+        return self.vectors
+
+    def texts(self, start: int, end: int) -> List[str]:
+        return [
+            chunk_text(self.templates, int(self.series[index]), index, self.seed)
+            for index in range(start, end)
+        ]
+
+    def embed(self, batch_size: int) -> np.ndarray:
+        vectors = []
+        for start in range(0, self.size, batch_size):
+            response = embedder.response(
+                text=self.texts(start, min(self.size, start + batch_size))
+            )
+            vectors.extend(
+                item.embedding for item in sorted(response.data, key=lambda d: d.index)
+            )
+        self.vectors = self._normalize(np.asarray(vectors))
+        return self.vectors
+
+
+class Setting:
+    """One collection layout to benchmark, e.g. baseline, dims=512+pq or m=16+efc=64"""
+
+    KEYS = {
+        "dims": "dimensions",
+        "ef": "ef",
+        "efc": "ef_construction",
+        "m": "max_connections",
+    }
+
+    def __init__(self, spec: str):
+        self.spec = spec
+        self.dimensions: Optional[int] = None
+        self.quantization = "none"
+        self.ef: Optional[int] = None
+        self.ef_construction: Optional[int] = None
+        self.max_connections: Optional[int] = None
+        for token in spec.split("+"):
+            key, _, value = token.partition("=")
+            if token in ("pq", "bq", "sq"):
+                self.quantization = token
+            elif key in self.KEYS and value.lstrip("-").isdigit():
+                setattr(self, self.KEYS[key], int(value))
+            elif token != "baseline":
+                raise ValueError(f"Unknown setting '{token}' in '{spec}'")
+
+    @property
+    def is_baseline(self) -> bool:
+        return self.spec == "baseline"
+
+    def collection_name(self, prefix: str, size: int) -> str:
+        suffix = (
+            "" if self.is_baseline else "_" + re.sub(r"[^A-Za-z0-9]+", "_", self.spec)
+        )
+        return f"{prefix}_{size}{suffix}"
+
+    def project(self, vectors: np.ndarray) -> np.ndarray:
+        """Shortened embeddings: the first `dimensions` components, renormalized"""
+        if not self.dimensions or self.dimensions >= vectors.shape[1]:
+            return vectors
+        return Catalog._normalize(vectors[:, : self.dimensions])
+
+    def index_config(self, dimensions: int, size: int):
+        return product_vector_index_config(
+            dimensions=dimensions,
+            quantization=self.quantization,
+            ef=self.ef,
+            ef_construction=self.ef_construction,
+            max_connections=self.max_connections,
+            # Compress as soon as the whole catalog is in, not at the production threshold
+            training_limit=min(size, config.QUANTIZATION_TRAINING_LIMIT),
+        )
+
+    def estimated_memory(self, count: int, dimensions: int) -> Dict[str, int]:
+        """In-memory vector cache plus HNSW layer-0 links (2 x maxConnections 8-byte ids per node)"""
+        per_vector = {
+            "none": dimensions * 4,
+            "sq": dimensions,
+            "bq": math.ceil(dimensions / 8),
+            "pq": max(1, dimensions // PQ_DIMENSIONS_PER_SEGMENT),
+        }[self.quantization]
+        max_connections = self.max_connections or config.HNSW_MAX_CONNECTIONS
+        return {
+            "vector_bytes": count * per_vector,
+            "graph_bytes": count * 2 * max_connections * 8,
+        }
+
+
+def ensure_collection(
+    client, name: str, catalog: Catalog, setting: Setting, args: argparse.Namespace
+) -> bool:
+    """Create and fill the collection for one setting; False if an existing one was reused"""
+    if client.collections.exists(name):
+        existing = (
+            client.collections.get(name)
+            .aggregate.over_all(total_count=True)
+            .total_count
+        )
+        if args.reuse and existing == catalog.size:
+            print(f"♻️  Reusing '{name}' ({existing} chunks)")
+            return False
+        client.collections.delete(name)
+
+    vectors = setting.project(catalog.vectors)
+    if args.embeddings == "openai":
+        vectorizer = product_vectorizer_config(
+            dimensions=vectors.shape[1], base_url=config.OPENAI_BASE_URL
+        )
+    else:
+        vectorizer = wc.Configure.Vectorizer.none()
+    client.collections.create(
+        name=name,
+        vectorizer_config=vectorizer,
+        vector_index_config=setting.index_config(vectors.shape[1], catalog.size),
+        properties=[
+            wc.Property(name="content", data_type=wc.DataType.TEXT),
+            wc.Property(name="source", data_type=wc.DataType.TEXT),
+        ],
+    )
+    collection = client.collections.get(name)
+
+    started = time.monotonic()
+    with collection.batch.fixed_size(batch_size=args.batch_size) as batch:
+        for start in range(0, catalog.size, args.batch_size):
+            end = min(catalog.size, start + args.batch_size)
+            chunk_vectors = vectors[start:end].tolist()
+            for offset, text in enumerate(catalog.texts(start, end)):
+                batch.add_object(
+                    properties={
+                        "content": text,
+                        "source": series_name(
+                            catalog.templates, int(catalog.series[start + offset])
+                        ),
+                    },
+                    vector=chunk_vectors[offset],
+                    uuid=_uuid(start + offset),
+                )
+    failed = len(collection.batch.failed_objects)
+    wait_until_indexed(collection)
+    print(
+        f"📦 Ingested {catalog.size - failed}/{catalog.size} chunks into '{name}' "
+        f"({setting.spec}) in {time.monotonic() - started:.1f}s"
+    )
+    return True
+
+
+def wait_until_indexed(collection, timeout: float = 300.0) -> None:
+    # Quantizers train and compress in the background once the training limit is reached
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if all(
+            shard.status == "READY" and not shard.vector_queue_size
+            for shard in collection.config.get_shards()
+        ):
+            return
+        time.sleep(1.0)
+    print(f"⚠️  '{collection.name}' still indexing after {timeout:.0f}s")
+
+
+def weaviate_heap_bytes(metrics_url: Optional[str]) -> Optional[int]:
+    """Go heap in use, from Weaviate's Prometheus endpoint (PROMETHEUS_MONITORING_ENABLED)"""
+    if not metrics_url:
+        return None
+    try:
+        for line in httpx.get(metrics_url, timeout=5.0).text.splitlines():
+            if line.startswith("go_memstats_heap_inuse_bytes "):
+                return int(float(line.split()[1]))
+    except httpx.HTTPError:
+        pass
+    return None
+
+
+def _uuid(index: int) -> str:
+    # Stable ids map search hits back to catalog rows for recall
+    return f"00000000-0000-4000-8000-{index:012d}"
+
+
+def _index_of(uuid) -> int:
+    return int(str(uuid).rsplit("-", 1)[1])
+
+
+def make_queries(
+    catalog: Catalog, count: int, noise: float, embeddings: str
+) -> List[Dict]:
+    """Query texts and full-size unit vectors, each aimed at one random series"""
+    queries = []
+    for _ in range(count):
+        series = catalog.query_rng.randrange(catalog.series_count)
+        text = f"{series_name(catalog.templates, series)} features"
+        queries.append({"series": series, "text": text})
+    if embeddings == "openai":
+        response = embedder.response(text=[query["text"] for query in queries])
+        vectors = [
+            item.embedding for item in sorted(response.data, key=lambda d: d.index)
+        ]
+    else:
+        centres = catalog.centres[[query["series"] for query in queries]]
+        jitter = catalog.query_np_rng.standard_normal(centres.shape) / np.sqrt(
+            centres.shape[1]
+        )
+        vectors = centres + noise * jitter
+    vectors = Catalog._normalize(np.asarray(vectors))
+    for query, vector in zip(queries, vectors):
+        query["vector"] = vector
+    return queries
+
+
+def ground_truth(
+    vectors: np.ndarray, queries: List[Dict], k: int, block: int = 100_000
+) -> List[set]:
+    """Exact cosine top-k, scanning the catalog in blocks to bound memory"""
+    matrix = np.stack([query["vector"] for query in queries])
+    best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+    best_ids = np.zeros((len(queries), 0), dtype=np.int64)
+    for start in range(0, len(vectors), block):
+        scores = matrix @ vectors[start : start + block].T
+        ids = np.broadcast_to(np.arange(start, start + scores.shape[1]), scores.shape)
+        scores = np.concatenate([best_scores, scores], axis=1)
+        ids = np.concatenate([best_ids, ids], axis=1)
+        top = np.argpartition(-scores, min(k, scores.shape[1] - 1), axis=1)[:, :k]
+        best_scores = np.take_along_axis(scores, top, axis=1)
+        best_ids = np.take_along_axis(ids, top, axis=1)
+    return [set(row.tolist()) for row in best_ids]
+
+
+def searcher(
+    collection, method: str, k: int, alpha: float
+) -> Callable[[Dict], List[int]]:
+    def run(query: Dict) -> List[int]:
+        if method == "near_vector":
+            response = collection.query.near_vector(
+                near_vector=query["vector"].tolist(), limit=k
+            )
+        elif method == "near_text":
+            response = collection.query.near_text(query=query["text"], limit=k)
+        elif method == "bm25":
+            response = collection.query.bm25(query=query["text"], limit=k)
+        else:
+            response = collection.query.hybrid(
+                query=query["text"],
+                vector=query["vector"].tolist(),
+                alpha=alpha,
+                limit=k,
+            )
+        return [_index_of(obj.uuid) for obj in response.objects]
+
+    return run
+
+
+def percentiles(latencies: List[float]) -> Dict[str, float]:
+    ordered = sorted(latencies)
+
+    def at(fraction: float) -> float:
+        return round(
+            ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000, 2
+        )
+
+    return {
+        "p50_ms": at(0.50),
+        "p95_ms": at(0.95),
+        "p99_ms": at(0.99),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2),
+    }
+
+
+def measure_qps(
+    name: str, method: str, queries: List[Dict], concurrency: int, args
+) -> float:
+    """Queries per second with `concurrency` threads, each with its own client"""
+    stop_at = time.monotonic() + args.duration
+    completed = 0
+    lock = threading.Lock()
+
+    def worker(offset: int) -> None:
+        nonlocal completed
+        client = config.weaviate_client
+        try:
+            run = searcher(client.collections.get(name), method, args.k, args.alpha)
+            position = offset
+            while time.monotonic() < stop_at:
+                run(queries[position % len(queries)])
+                position += concurrency
+                with lock:
+                    completed += 1
+        finally:
+            client.close()
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, range(concurrency)))
+    return round(completed / (time.monotonic() - started), 1)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmark_setting(
+    client,
+    catalog: Catalog,
+    setting: Setting,
+    queries: List[Dict],
+    truth: List[set],
+    args,
+) -> List[Dict]:
+    name = setting.collection_name(args.collection_prefix, catalog.size)
+    heap_before = weaviate_heap_bytes(args.weaviate_metrics_url)
+    fresh = ensure_collection(client, name, catalog, setting, args)
+    heap_after = weaviate_heap_bytes(args.weaviate_metrics_url)
+    collection = client.collections.get(name)
+
+    projected = setting.project(np.stack([query["vector"] for query in queries]))
+    queries = [{**query, "vector": vector} for query, vector in zip(queries, projected)]
+    dimensions = projected.shape[1]
+    version = client.get_meta().get("version")
+
+    methods = [
+        m
+        for m in args.methods.split(",")
+        if m != "near_text" or args.embeddings == "openai"
+    ]
+    records = []
+    for method in methods:
+        run = searcher(collection, method, args.k, args.alpha)
+        for query in queries[: args.warmup]:
+            run(query)
+
+        latencies, hits = [], 0
+        for query, expected in zip(queries, truth):
+            started = time.perf_counter()
+            found = run(query)
+            latencies.append(time.perf_counter() - started)
+            hits += len(expected.intersection(found))
+
+        record = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": git_commit(),
+            "weaviate_version": version,
+            "collection": name,
+            "setting": setting.spec,
+            "size": catalog.size,
+            "dimensions": dimensions,
+            "quantization": setting.quantization,
+            "embeddings": args.embeddings,
+            "method": method,
+            "k": args.k,
+            "queries": len(queries),
+            f"recall_at_{args.k}": round(hits / (len(queries) * args.k), 4),
+            **percentiles(latencies),
+            "qps": {
+                str(level): measure_qps(name, method, queries, level, args)
+                for level in args.concurrency_levels
+            },
+            "estimated_memory": setting.estimated_memory(catalog.size, dimensions),
+            "heap_delta_bytes": (
+                heap_after - heap_before
+                if fresh and heap_before is not None and heap_after is not None
+                else None
+            ),
+        }
+        records.append(record)
+        print(
+            f"⏱️  {catalog.size:>8} {setting.spec:<14} {method:<11} "
+            f"recall@{args.k}={record[f'recall_at_{args.k}']:.3f} "
+            f"p50={record['p50_ms']}ms p95={record['p95_ms']}ms p99={record['p99_ms']}ms "
+            f"qps={record['qps']}"
+        )
+    if args.drop:
+        client.collections.delete(name)
+    return records
+
+
+def print_comparison(records: List[Dict], k: int) -> None:
+    """Each setting relative to the uncompressed baseline, per method"""
+    baselines = {r["method"]: r for r in records if r["setting"] == "baseline"}
+    for record in records:
+        baseline = baselines.get(record["method"])
+        if baseline is None or record is baseline:
+            continue
+        memory = sum(record["estimated_memory"].values()) / sum(
+            baseline["estimated_memory"].values()
+        )
+        print(
+            f"📉 {record['setting']:<14} {record['method']:<11} "
+            f"recall {record[f'recall_at_{k}'] - baseline[f'recall_at_{k}']:+.3f}  "
+            f"p95 x{record['p95_ms'] / baseline['p95_ms']:.2f}  memory x{memory:.2f}"
+        )
+
+
+def benchmark_size(
+    size: int, settings: List[Setting], args: argparse.Namespace
+) -> List[Dict]:
+    catalog = Catalog(
+        size, args.dimensions if args.embeddings == "synthetic" else 1536, args.seed
+    )
+    if args.embeddings == "synthetic":
+        catalog.synthetic_vectors(args.noise)
+    else:
+        catalog.embed(args.batch_size)
+    queries = make_queries(catalog, args.queries, args.noise, args.embeddings)
+    # Exact neighbours of the full vectors: every setting is scored against the same truth
+    truth = ground_truth(catalog.vectors, queries, args.k)
+
+    client = config.weaviate_client
+    try:
+        records = []
+        for setting in settings:
+            records.extend(
+                benchmark_setting(client, catalog, setting, queries, truth, args)
+            )
+        if len(settings) > 1:
+            print_comparison(records, args.k)
+        return records
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--sizes", default="1000,10000", help="Comma-separated chunk counts"
+    )
+    parser.add_argument("--methods", default=",".join(METHODS))
+    parser.add_argument(
+        "--embeddings", choices=["synthetic", "openai"], default="synthetic"
+    )
+    parser.add_argument(
+        "--dimensions", type=int, default=256, help="Synthetic vector size"
+    )
+    parser.add_argument(
+        "--noise",
+        type=float,
+        default=0.6,
+        help="Spread of chunks around their series centre",
+    )
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument(
+        "--alpha", type=float, default=0.75, help="Hybrid vector weight"
+    )
+    parser.add_argument("--concurrency", default="1,4,16")
+    parser.add_argument(
+        "--duration", type=float, default=5.0, help="Seconds per QPS measurement"
+    )
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--collection-prefix", default="RetrievalBench")
+    parser.add_argument(
+        "--settings", default="baseline", help="Comma-separated collection layouts"
+    )
+    parser.add_argument(
+        "--reuse",
+        action="store_true",
+        help="Keep an existing collection of the same size",
+    )
+    parser.add_argument(
+        "--drop",
+        action="store_true",
+        help="Delete each collection after benchmarking it",
+    )
+    parser.add_argument(
+        "--weaviate-metrics-url",
+        help="e.g. http://localhost:2112/metrics, for heap deltas",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="logs/retrieval_bench.jsonl")
+    args = parser.parse_args()
+    args.concurrency_levels = [int(level) for level in args.concurrency.split(",")]
+    settings = [Setting(spec) for spec in args.settings.split(",")]
+    if not any(setting.is_baseline for setting in settings):
+        settings.insert(0, Setting("baseline"))
+
+    results = []
+    for size in (int(size) for size in args.sizes.split(",")):
+        results.extend(benchmark_size(size, settings, args))
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "a", encoding="utf-8") as output:
+        for record in results:
+            output.write(json.dumps(record) + "\n")
+    print(f"✅ Appended {len(results)} results to {args.output}")
@@ -59,13 +59,13 @@ def debug_weaviate_setup():
                 f"Score: {obj.metadata.score if hasattr(obj.metadata, 'score') else 'N/A'}"
             )
 
-            # Check metadata
-            metadata = obj.properties.get("metadata", {})
-            if metadata:
-                if metadata.get("website"):
-                    print(f"Website: {metadata['website']}")
-                if metadata.get("pdf_links"):
-                    print(f"PDF Links: {metadata['pdf_links']}")
+            # Links are stored as properties next to the chunk text
+            if obj.properties.get("section"):
+                print(f"Section: {obj.properties['section']}")
+            if obj.properties.get("website"):
+                print(f"Website: {obj.properties['website']}")
+            if obj.properties.get("pdf_urls"):
+                print(f"PDF Links: {obj.properties['pdf_urls']}")
 
         return True
 
@@ -1,11 +1,63 @@
+"""
+Ingest a product catalog into Weaviate and publish its local search snapshot.
+
+    python -m scripts.weaviate_ingest_data                                  # single-tenant collection
+    python -m scripts.weaviate_ingest_data --tenant team_a --products team_a.txt
+
+Without --tenant the collection is recreated. With --tenant the collection is
+multi-tenant: only that tenant's catalog is replaced and other teams are untouched.
+
+Progress is checkpointed to --state every --checkpoint-every chunks. Rerunning the same
+command after a crash resumes after the last checkpoint instead of rebuilding, and
+first retries the objects that still failed last time. --restart forces a rebuild.
+"""
+
+import argparse
+import hashlib
+import json
 import os
+import time
+from collections import Counter
+from typing import Dict, List
+
 import weaviate
 import weaviate.classes.config as wc
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from weaviate.util import generate_uuid5
 from app.config import config
+from app.common.local_vector_index import snapshot_directory
+from app.common.product_attributes import attribute_properties
+from app.common.vector_database import (
+    product_vector_index_config,
+    product_vectorizer_config,
+)
+from scripts.export_product_snapshot import export_snapshot
+from scripts.product_chunker import LINK_PROPERTIES, chunk_catalog
+
+# Only chunk text is embedded; titles are already in it and links never are
+PRODUCT_PROPERTIES = (
+    [
+        wc.Property(name="content", data_type=wc.DataType.TEXT),
+        wc.Property(name="source", data_type=wc.DataType.TEXT, skip_vectorization=True),
+        wc.Property(
+            name="section", data_type=wc.DataType.TEXT, skip_vectorization=True
+        ),
+        wc.Property(
+            name="product_id", data_type=wc.DataType.TEXT, skip_vectorization=True
+        ),
+        wc.Property(name="chunk_index", data_type=wc.DataType.INT),
+        wc.Property(name="total_chunks", data_type=wc.DataType.INT),
+    ]
+    + [
+        wc.Property(name=name, data_type=wc.DataType.TEXT, skip_vectorization=True)
+        for name in LINK_PROPERTIES
+    ]
+    + attribute_properties()
+)
 
 
-def create_proper_schema(client, collection_name="Product_collection"):
+def create_proper_schema(
+    client, collection_name=config.PRODUCT_COLLECTION, multi_tenant=False
+):
     """Create a proper schema for the product collection"""
     try:
         # Delete existing collection if it exists
@@ -15,15 +67,203 @@ def create_proper_schema(client, collection_name="Product_collection"):
 
         client.collections.create(
             name=collection_name,
-            vectorizer_config=wc.Configure.Vectorizer.text2vec_openai(),
+            vectorizer_config=product_vectorizer_config(),
+            vector_index_config=product_vector_index_config(),
+            properties=PRODUCT_PROPERTIES,
+            # Idle tenants are deactivated by the API and reactivated on their next query
+            multi_tenancy_config=(
+                wc.Configure.multi_tenancy(enabled=True, auto_tenant_activation=True)
+                if multi_tenant
+                else None
+            ),
+        )
+        print(
+            f"✅ Created new {'multi-tenant ' if multi_tenant else ''}collection '{collection_name}' "
+            f"with proper schema ({config.EMBEDDING_DIMENSIONS} dims, quantization {config.VECTOR_QUANTIZATION})"
         )
-        print(f"✅ Created new collection '{collection_name}' with proper schema")
         return True
     except Exception as e:
         print(f"❌ Error creating schema: {e}")
         return False
 
 
+def replace_tenant(client, collection_name, tenant):
+    """Empty one tenant's catalog, creating the multi-tenant collection on first use"""
+    if not client.collections.exists(collection_name):
+        if not create_proper_schema(client, collection_name, multi_tenant=True):
+            return False
+    collection = client.collections.get(collection_name)
+    if not collection.config.get().multi_tenancy_config.enabled:
+        print(
+            f"❌ '{collection_name}' is single-tenant; ingest without --tenant or use another --collection"
+        )
+        return False
+    if collection.tenants.exists(tenant):
+        collection.tenants.remove([tenant])
+        print(f"🗑️  Removed the existing catalog of tenant '{tenant}'")
+    collection.tenants.create([tenant])
+    return True
+
+
+def chunk_products(path):
+    """Section chunks of a catalog file, each with a deterministic uuid"""
+    with open(path, "r", encoding="utf-8") as f:
+        properties = chunk_catalog(f.read())
+
+    chunks = []
+    for chunk in properties:
+        # Stable ids make re-inserting a chunk after a crash or retry an overwrite
+        chunks.append(
+            {
+                "uuid": generate_uuid5(
+                    f"{chunk['product_id']}:{chunk['chunk_index']}:{chunk['content']}"
+                ),
+                "product": chunk["source"],
+                "properties": chunk,
+            }
+        )
+        if chunk["chunk_index"] == chunk["total_chunks"] - 1:
+            print(f"📦 Processed {chunk['source']} into {chunk['total_chunks']} chunks")
+    return chunks
+
+
+def error_kind(message):
+    """Coarse category of a batch error message for the end-of-run report"""
+    text = message.lower()
+    if "429" in text or "rate limit" in text or "rate_limit" in text:
+        return "rate_limit"
+    if "timeout" in text or "timed out" in text or "deadline exceeded" in text:
+        return "timeout"
+    if "vectoriz" in text or "openai" in text or "embedding" in text:
+        return "vectorizer"
+    if "connection" in text or "unavailable" in text:
+        return "connection"
+    return "other"
+
+
+class IngestState:
+    """Ingest progress, checkpointed to a JSON file so a rerun can resume"""
+
+    def __init__(self, path, fingerprint):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.committed = 0  # chunks before this index have been sent and checked
+        self.last_product = None
+        self.failed: Dict[str, str] = {}  # chunk uuid -> last error message
+        self.resumed = False
+
+    @classmethod
+    def load(cls, path, fingerprint, restart=False):
+        state = cls(path, fingerprint)
+        if restart or not os.path.exists(path):
+            return state
+        with open(path, "r") as f:
+            saved = json.load(f)
+        # A finished run, or one over different chunks, starts from scratch
+        if saved.get("complete") or saved.get("fingerprint") != fingerprint:
+            return state
+        state.committed = saved["committed"]
+        state.last_product = saved.get("last_product")
+        state.failed = saved.get("failed", {})
+        state.resumed = True
+        return state
+
+    def save(self, complete=False):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path + ".tmp", "w") as f:
+            json.dump(
+                {
+                    "fingerprint": self.fingerprint,
+                    "committed": self.committed,
+                    "last_product": self.last_product,
+                    "failed": self.failed,
+                    "complete": complete,
+                    "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                },
+                f,
+                indent=2,
+            )
+        os.replace(self.path + ".tmp", self.path)
+
+
+def insert_chunks(collection, chunks, batch_size, requests_per_minute=None):
+    """Send chunks in one batch context; returns {uuid: error} for the rejected objects"""
+    if requests_per_minute:
+        batcher = collection.batch.rate_limit(requests_per_minute=requests_per_minute)
+    else:
+        batcher = collection.batch.fixed_size(batch_size=batch_size)
+    with batcher as batch:
+        for chunk in chunks:
+            batch.add_object(properties=chunk["properties"], uuid=chunk["uuid"])
+    return {
+        str(error.object_.uuid): error.message
+        for error in collection.batch.failed_objects
+    }
+
+
+def insert_with_retry(collection, chunks, args, errors: Counter) -> Dict[str, str]:
+    """Insert chunks, retrying failed objects with exponential backoff; returns what still failed"""
+    failed = insert_chunks(
+        collection, chunks, args.batch_size, args.requests_per_minute
+    )
+    for attempt in range(args.max_retries):
+        if not failed:
+            break
+        errors.update(error_kind(message) for message in failed.values())
+        delay = args.backoff * 2**attempt
+        print(
+            f"🔁 Retrying {len(failed)} failed objects in {delay:.1f}s (attempt {attempt + 1}/{args.max_retries})"
+        )
+        time.sleep(delay)
+        retry = [chunk for chunk in chunks if chunk["uuid"] in failed]
+        failed = insert_chunks(
+            collection, retry, args.batch_size, args.requests_per_minute
+        )
+    errors.update(error_kind(message) for message in failed.values())
+    return failed
+
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+parser = argparse.ArgumentParser(
+    description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+)
+parser.add_argument("--collection", default=config.PRODUCT_COLLECTION)
+parser.add_argument(
+    "--tenant", help="Sales team catalog to replace in a multi-tenant collection"
+)
+parser.add_argument(
+    "--products",
+    default=os.path.join(script_dir, "product_data", "example_products.txt"),
+)
+parser.add_argument(
+    "--state",
+    help="Checkpoint file (default: data/ingest_state/<collection>[-<tenant>].json)",
+)
+parser.add_argument(
+    "--restart", action="store_true", help="Ignore the checkpoint and rebuild"
+)
+parser.add_argument(
+    "--checkpoint-every", type=int, default=200, help="Chunks per checkpoint"
+)
+parser.add_argument("--batch-size", type=int, default=100)
+parser.add_argument(
+    "--requests-per-minute", type=int, help="Pace batches for the embeddings rate limit"
+)
+parser.add_argument("--max-retries", type=int, default=5)
+parser.add_argument(
+    "--backoff",
+    type=float,
+    default=2.0,
+    help="First retry delay in seconds, doubled per retry",
+)
+args = parser.parse_args()
+state_path = args.state or os.path.join(
+    "data",
+    "ingest_state",
+    f"{args.collection}{'-' + args.tenant if args.tenant else ''}.json",
+)
+
+
 # Connect to Weaviate
 client = weaviate.connect_to_custom(
     http_host=config.WEAVIATE_HTTP_HOST,
@@ -36,96 +276,90 @@ client = weaviate.connect_to_custom(
 )
 
 try:
-    collection_name = "Product_collection"
-
-    # Create proper schema first
-    if not create_proper_schema(client, collection_name):
-        raise Exception("Failed to create schema")
-
-    # Read and parse products
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    file_path = os.path.join(script_dir, "product_data", "example_products.txt")
-    with open(file_path, "r") as f:
-        content = f.read()
-
-    products = []
-    for i, section in enumerate(content.split("---")):
-        if not section.strip():
-            continue
-
-        lines = section.strip().split("\n")
-        product = {
-            "id": f"{i + 1}",
-            "title": "",
-            "text": section.strip(),
-            "website": "",
-            "pdf_links": [],
-            "youtube_links": [],
-            "image_links": [],
-        }
-
-        for line in lines:
-            if line.startswith("Title: "):
-                product["title"] = line.replace("Title: ", "")
-            elif "https://" in line and "youtube" in line:
-                product["youtube_links"].append(line.strip("- ").strip())
-            elif "https://" in line and ".pdf" in line:
-                product["pdf_links"].append(line.strip("- ").strip())
-            elif "https://" in line and any(
-                ext in line for ext in [".jpg", ".png", ".gif"]
-            ):
-                product["image_links"].append(line.strip("- ").strip())
-            elif (
-                "https://" in line
-                and line.strip("- ").strip()
-                not in product["pdf_links"]
-                + product["youtube_links"]
-                + product["image_links"]
-            ):
-                product["website"] = line.strip("- ").strip()
-
-        products.append(product)
-
-    # Chunk the text
-    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=300)
-    chunks = []
-
-    for product in products:
-        text_chunks = splitter.split_text(product["text"])
-
-        for idx, chunk_text in enumerate(text_chunks):
-            # Prepare metadata with all links
-            metadata = {
-                "product_id": product["id"],
-                "title": product["title"],
-                "chunk_index": idx,
-                "total_chunks": len(text_chunks),
-                "website": product["website"],
-                "pdf_links": product["pdf_links"],
-                "youtube_links": product["youtube_links"],
-                "image_links": product["image_links"],
-            }
+    collection_name = args.collection
+    chunks = chunk_products(args.products)
+    products = {chunk["properties"]["product_id"] for chunk in chunks}
+    embedded = sum(len(chunk["properties"]["content"]) for chunk in chunks)
+    print(
+        f"📦 {len(chunks)} chunks from {len(products)} products, {embedded} characters to embed"
+    )
 
-            chunks.append(
-                {
-                    "content": chunk_text,
-                    "source": product["title"],
-                    "metadata": metadata,
-                }
-            )
+    fingerprint = hashlib.sha256(
+        "\n".join(
+            [collection_name, args.tenant or ""] + [chunk["uuid"] for chunk in chunks]
+        ).encode()
+    ).hexdigest()
+    state = IngestState.load(state_path, fingerprint, restart=args.restart)
 
-        print(f"📦 Processed {product['title']} into {len(text_chunks)} chunks")
+    if state.resumed:
+        print(
+            f"⏩ Resuming after chunk {state.committed}/{len(chunks)} ({state.last_product}), "
+            f"{len(state.failed)} objects to retry"
+        )
+    else:
+        # Create proper schema first
+        if args.tenant:
+            if not replace_tenant(client, collection_name, args.tenant):
+                raise Exception("Failed to prepare tenant")
+        elif not create_proper_schema(client, collection_name):
+            raise Exception("Failed to create schema")
+        state.save()
 
     # Get collection and insert chunks
     collection = client.collections.get(collection_name)
+    if args.tenant:
+        collection = collection.with_tenant(args.tenant)
 
-    with collection.batch.dynamic() as batch:
-        for chunk in chunks:
-            batch.add_object(properties=chunk)
+    started = time.monotonic()
+    errors: Counter = Counter()
+    sent = 0
 
+    # Objects that still failed on the previous run go first
+    if state.failed:
+        retry = [chunk for chunk in chunks if chunk["uuid"] in state.failed]
+        state.failed = insert_with_retry(collection, retry, args, errors)
+        sent += len(retry)
+        state.save()
+
+    for start in range(state.committed, len(chunks), args.checkpoint_every):
+        window = chunks[start : start + args.checkpoint_every]
+        state.failed.update(insert_with_retry(collection, window, args, errors))
+        sent += len(window)
+        state.committed = start + len(window)
+        state.last_product = window[-1]["product"]
+        state.save()
+        print(
+            f"💾 Checkpoint {state.committed}/{len(chunks)} chunks ({state.last_product})"
+        )
+
+    state.save(complete=not state.failed)
+    elapsed = time.monotonic() - started
+    target = f"'{collection_name}'" + (
+        f" (tenant '{args.tenant}')" if args.tenant else ""
+    )
     print(
-        f"✅ Successfully ingested {len(chunks)} chunks from {len(products)} products into '{collection_name}'"
+        f"✅ Ingested {sent - len(state.failed)} chunks from {len(products)} products into {target} "
+        f"in {elapsed:.1f}s ({(sent - len(state.failed)) / elapsed if elapsed else 0.0:.1f} chunks/s)"
     )
+    if errors:
+        print(
+            "📊 Failed attempts by kind: "
+            + ", ".join(f"{kind}={count}" for kind, count in errors.most_common())
+        )
+
+    if state.failed:
+        remaining = Counter(error_kind(message) for message in state.failed.values())
+        print(
+            f"❌ {len(state.failed)} chunks still failed after {args.max_retries} retries "
+            f"({', '.join(f'{kind}={count}' for kind, count in remaining.most_common())}); "
+            f"rerun to retry them, progress is kept in {state_path}"
+        )
+        raise SystemExit(1)
+
+    # New ingest epoch for workers searching the local snapshot
+    directory = snapshot_directory(args.tenant)
+    exported = export_snapshot(client, collection_name, directory, tenant=args.tenant)
+    print(f"✅ Published a local search snapshot of {exported} chunks to {directory}")
 
 finally:
     client.close()
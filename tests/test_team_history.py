@@ -0,0 +1,76 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from agno.memory.v2.memory import Memory
+from agno.models.message import Message
+from agno.models.openai import OpenAIChat
+from agno.run.team import TeamRunResponse
+from agno.storage.sqlite import SqliteStorage
+
+from app.common.team import OrchestratorTeam
+from app.services.history_compactor import HistoryCompactor
+
+SESSION_ID = "session-1"
+
+
+class TeamHistoryTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        # Shared like the registry's team-storage and team-history
+        self.storage = SqliteStorage(
+            table_name="team_sessions",
+            db_file=str(Path(directory.name) / "teams.db"),
+            mode="team",
+        )
+        self.compactor = HistoryCompactor()
+
+    def _team(self) -> OrchestratorTeam:
+        model = OpenAIChat(id="gpt-4o-mini", api_key="test")
+        team = OrchestratorTeam(
+            name="Orchestrator",
+            mode="coordinate",
+            model=model,
+            members=[],
+            memory=Memory(model=model),
+            storage=self.storage,
+            history_compactor=self.compactor,
+        )
+        # Team.run assigns a random team_id before reading the session
+        team._set_team_id()
+        return team
+
+    def test_history_survives_another_team_instance(self):
+        first = self._team()
+        first.read_from_storage(SESSION_ID)
+        first.memory.add_run(
+            SESSION_ID,
+            TeamRunResponse(
+                team_id=first.team_id,
+                session_id=SESSION_ID,
+                content="Acme Corp is a logistics company.",
+                messages=[Message(role="user", content="Who is Acme Corp?")],
+            ),
+        )
+        first.write_to_storage(SESSION_ID)
+
+        # Another pooled Team, or the same app after a restart, gets its own team_id
+        second = self._team()
+        self.assertNotEqual(first.team_id, second.team_id)
+        second.read_from_storage(SESSION_ID)
+        run_messages = second.get_run_messages(
+            session_id=SESSION_ID, message="And their CEO?"
+        )
+
+        history = [message for message in run_messages.messages if message.from_history]
+        self.assertEqual(len(history), 1)
+        self.assertIn("Who is Acme Corp?", history[0].content)
+        self.assertIn("Acme Corp is a logistics company.", history[0].content)
+        # History sits right before the current user message
+        position = run_messages.messages.index(run_messages.user_message)
+        self.assertIs(run_messages.messages[position - 1], history[0])
+
+
+if __name__ == "__main__":
+    unittest.main()